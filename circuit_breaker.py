@@ -0,0 +1,135 @@
+"""
+Circuit Breakers for OM AI plugins
+Stops a failing plugin backend from adding its full timeout to every request
+"""
+
+import threading
+import time
+from typing import Dict
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for one plugin"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            name (str): Plugin name, used in stats
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds to fail fast before probing again
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.total_calls = 0
+        self.total_failures = 0
+        self.rejected_calls = 0
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Decide whether a call may go through to the plugin
+
+        Returns:
+            bool: False while open, or while a half-open probe is running
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.rejected_calls += 1
+                    return False
+                self.state = self.HALF_OPEN
+
+            if self.state == self.HALF_OPEN:
+                # Only one request at a time probes for recovery
+                if self.probe_in_flight:
+                    self.rejected_calls += 1
+                    return False
+                self.probe_in_flight = True
+
+            self.total_calls += 1
+            return True
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self.consecutive_failures = 0
+            self.probe_in_flight = False
+            self.state = self.CLOSED
+            self.opened_at = None
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit once the threshold is hit"""
+        with self._lock:
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self.probe_in_flight = False
+
+    def record_skipped(self):
+        """An allowed call that never reached the plugin: frees the probe, counts nothing"""
+        with self._lock:
+            self.total_calls -= 1
+            self.probe_in_flight = False
+
+    def retry_after(self) -> float:
+        """Seconds until the next recovery probe is allowed"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def get_stats(self) -> Dict:
+        """Current state and counters"""
+        retry_after = self.retry_after()
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "total_calls": self.total_calls,
+                "total_failures": self.total_failures,
+                "rejected_calls": self.rejected_calls,
+                "times_opened": self.times_opened,
+                "retry_after_seconds": round(retry_after, 1)
+            }
+
+
+# Breaker settings per plugin; others use the CircuitBreaker defaults
+BREAKER_SETTINGS = {
+    "search_info": {"failure_threshold": 3, "reset_timeout": 20.0},
+    "network_manager": {"failure_threshold": 3, "reset_timeout": 30.0},
+    "database_manager": {"failure_threshold": 5, "reset_timeout": 10.0},
+}
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the shared breaker for a plugin, creating it on first use"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, **BREAKER_SETTINGS.get(name, {}))
+                _breakers[name] = breaker
+    return breaker
+
+
+def get_breaker_stats() -> Dict[str, Dict]:
+    """State and counters of every plugin breaker created so far"""
+    return {name: breaker.get_stats() for name, breaker in sorted(_breakers.items())}
@@ -2,10 +2,32 @@
 Enhanced Command Handler with Google Search Integration
 """
 
+import contextvars
+import json
 import os
+import queue
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import partial, wraps
 from pathlib import Path
 
+from .circuit_breaker import get_breaker, get_breaker_stats
+from .conversation_buffer import conversation_buffer
+from .plugin_pool import PluginBusyError, get_plugin_pool, get_pool_stats
+from .request_hedging import get_hedge_policy, get_hedging_stats, run_hedged
+from .intent_engine import reload_intents
+from .intent_router import intent_router
+from .knowledge_ingest import knowledge_topic
+from .routing_profile import get_routing_profile
+from .daily_summaries import daily_summaries
+from .expense_aggregates import expense_aggregates, supports_period
+from .deadline import DEADLINE_PARAM, get_deadline, reset_current_deadline, set_current_deadline
+from .time_parser import normalize_time, parse_duration_minutes
+from .user_context_cache import user_context_cache
+
 # Add plugins directory to path
 current_dir = Path(__file__).parent
 plugins_dir = current_dir / "plugins"
@@ -22,6 +44,8 @@ except ImportError as e:
     # Create fallback modules
 
     class FallbackModule:
+        is_fallback = True
+
         def __getattr__(self, name):
             return lambda *args, **kwargs: f"Function {name} not available"
 
@@ -166,10 +190,345 @@ except ImportError as e:
         *args): return "Notification callback not available"
 
 
+# Exceptions plugin functions raised during the current dispatch; only these
+# (and timeouts) count against a plugin's breaker, not bad params or local helpers
+_plugin_errors = contextvars.ContextVar("plugin_errors", default=None)
+
+
+def _plugin_function(function):
+    """Wrap a plugin entry point so the exceptions it raises are noted in _plugin_errors"""
+    @wraps(function)
+    def call(*args, **kwargs):
+        try:
+            return function(*args, **kwargs)
+        except Exception as e:
+            errors = _plugin_errors.get()
+            if errors is not None:
+                errors.append(e)
+            raise
+    return call
+
+
+class _PluginModule:
+    """Plugin module (or object) whose callables are wrapped with _plugin_function"""
+
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        value = getattr(self._module, name)
+        return _plugin_function(value) if callable(value) else value
+
+
+search_info, system_control, mouse_keyboard, screen_tools, file_ops, conversation, ai_tools = (
+    _PluginModule(module) for module in (search_info, system_control, mouse_keyboard,
+                                         screen_tools, file_ops, conversation, ai_tools))
+if om_db is not None:
+    om_db = _PluginModule(om_db)
+for _name in ("check_internet", "ping_website", "get_network_info", "get_network_speed",
+              "diagnose_network", "connect_wifi", "show_wifi_networks",
+              "get_livekit_status", "get_livekit_room_info", "get_livekit_network_stats",
+              "connect_livekit_room", "disconnect_livekit_room",
+              "save_conversation_to_db", "get_user_conversation_history",
+              "add_to_knowledge_base", "search_knowledge_base",
+              "add_personal_task", "get_daily_tasks", "complete_task", "add_habit",
+              "log_habit_completion", "add_journal_entry", "log_health_data", "add_expense",
+              "get_expense_summary", "control_smart_device", "add_smart_device",
+              "log_learning_session", "add_contact_reminder", "get_contact_reminders",
+              "get_daily_summary",
+              "remember_conversation", "recall_memory", "get_user_context",
+              "schedule_task_from_conversation", "get_personalized_response",
+              "get_pending_reminders", "complete_scheduled_task", "get_memory_stats",
+              "start_scheduler", "stop_scheduler", "schedule_task", "get_scheduled_tasks",
+              "complete_scheduled_task_scheduler", "snooze_task", "get_task_history",
+              "get_scheduler_stats", "register_notification_callback"):
+    globals()[_name] = _plugin_function(globals()[_name])
+
+# Plugin that serves each intent; intents not listed are answered locally
+PLUGIN_INTENTS = {
+    "search_info": ("google_search", "openai_explain", "detailed_search", "image_search",
+                    "video_search", "lucky_search", "open_website", "get_weather"),
+    "system_control": ("open_app",),
+    "screen_tools": ("take_screenshot",),
+    "file_ops": ("open_file",),
+    "conversation": ("motivate", "chat_ai", "greeting", "how_are_you", "thank_you",
+                     "show_capabilities"),
+    "network_manager": ("check_internet", "ping_website", "network_info", "network_speed",
+                        "diagnose_network", "connect_wifi", "show_wifi"),
+    "livekit_network_manager": ("livekit_status", "livekit_room_info", "livekit_stats"),
+    "database_manager": ("get_conversation_history", "get_database_stats", "add_knowledge",
+                         "search_knowledge"),
+    "daily_life_manager": ("add_task", "get_tasks", "complete_task", "add_habit", "log_habit",
+                           "add_journal", "log_health", "add_expense", "expense_summary",
+                           "control_device", "add_device", "log_learning", "add_contact",
+                           "contact_reminders", "daily_summary"),
+    "advanced_memory_system": ("remember_this", "recall_memory", "get_context",
+                               "schedule_from_conversation", "get_reminders", "memory_stats"),
+    "task_scheduler_system": ("start_scheduler", "stop_scheduler", "schedule_advanced_task",
+                              "get_scheduled_tasks", "complete_scheduled_task", "snooze_task",
+                              "task_history", "scheduler_stats"),
+}
+
+INTENT_PLUGINS = {intent: plugin
+                  for plugin, intents in PLUGIN_INTENTS.items() for intent in intents}
+
+# Longest a single plugin call may take, in seconds, even without a deadline
+DEFAULT_PLUGIN_TIMEOUT = 10.0
+PLUGIN_TIMEOUTS = {
+    "search_info": 8.0,
+    "conversation": 20.0,
+    "network_manager": 30.0,
+    "database_manager": 3.0,
+    "daily_life_manager": 3.0,
+    "advanced_memory_system": 3.0,
+    "task_scheduler_system": 3.0,
+}
+
+# Param with the user's words; handle_command records them with the turn
+UTTERANCE_PARAM = "utterance"
+
+# Earlier turns sent to the conversation plugin along with a chat message
+CHAT_CONTEXT_TURNS = 3
+
+
+def _run_deadline(budget, request_deadline):
+    """Deadline of a plugin call, counted from when it starts running"""
+    deadline = time.monotonic() + budget
+    return deadline if request_deadline is None else min(deadline, request_deadline)
+
+
+def _dispatch_with_deadline(intent, params, budget, request_deadline=None, plugin_errors=None):
+    """
+    _dispatch_command under a deadline; a reply to a call during which a
+    plugin function raised comes back as _PluginFailure. Those exceptions
+    are also added to ``plugin_errors``
+    """
+    token = set_current_deadline(_run_deadline(budget, request_deadline))
+    errors = []
+    errors_token = _plugin_errors.set(errors)
+    try:
+        result = _dispatch_command(intent, params)
+    finally:
+        _plugin_errors.reset(errors_token)
+        reset_current_deadline(token)
+        if plugin_errors is not None:
+            plugin_errors.extend(errors)
+    return _PluginFailure(result) if errors and isinstance(result, str) else result
+
+
+def _alternate_with_deadline(alternate, params, budget, request_deadline=None):
+    token = set_current_deadline(_run_deadline(budget, request_deadline))
+    try:
+        return alternate(params)
+    finally:
+        reset_current_deadline(token)
+
+
+def _timeout_response(intent, plugin):
+    return f"⏱️ {plugin} took too long to answer '{intent}'. Please try again in a moment."
+
+
+def _busy_response(intent, plugin):
+    return f"⏱️ {plugin} is busy and could not take '{intent}'. Please try again in a moment."
+
+
+def _circuit_open_response(intent, plugin, breaker):
+    return (f"⚡ {plugin} is temporarily unavailable, so '{intent}' was skipped. "
+            f"Retrying in about {breaker.retry_after():.0f}s.")
+
+
+class _PluginFailure(str):
+    """Error reply to a call during which a plugin function raised"""
+
+
+def _is_failed_result(result):
+    """Replies the plugin's breaker counts as failures (see _plugin_function)"""
+    return isinstance(result, _PluginFailure)
+
+
+def _is_error_reply(result):
+    """Any '❌ Error ...' reply; a hedged attempt giving one does not beat a pending one"""
+    return _is_failed_result(result) or (isinstance(result, str) and result.startswith("❌ Error"))
+
+
+def _is_stored_result(result):
+    """Daily life writes that reached storage; the fallback stubs answer with plain strings"""
+    return not isinstance(result, str) and not (
+        isinstance(result, dict) and result.get("success") is False)
+
+
+def _record_daily_write(params, kind, result, **payload):
+    """Fold a stored daily life write into the user's daily summary (and the expense buckets)"""
+    if not _is_stored_result(result):
+        return
+    try:
+        if kind == "add_expense":
+            expense_aggregates.record(payload["amount"], payload["category"])
+        daily_summaries.record(params.get("user_id", "default_user"), kind, payload,
+                               seed=get_daily_summary)
+    except Exception as e:
+        print(f"⚠️ Could not update daily summary for {kind}: {e}")
+
+
+def _record_turn(intent, params, result):
+    """Keep the turn in conversation_buffer for the next turn's context"""
+    user_id = params.get("user_id")
+    if user_id is None:
+        # Anonymous callers must not share one session's turns
+        return
+    query = params.get(UTTERANCE_PARAM) or params.get("message") or params.get("query") or ""
+    conversation_buffer.record(user_id, query, intent, result)
+
+
+def _with_recent_turns(message, user_id):
+    """A chat message preceded by the session's last turns, so the reply can follow on"""
+    if user_id is None:
+        return message
+    context = conversation_buffer.get_context(user_id, CHAT_CONTEXT_TURNS)
+    if not context["recent_turns"]:
+        return message
+    turns = "\n".join(f"User: {turn['query']}\nAssistant: {turn['response']}"
+                      for turn in context["recent_turns"])
+    return f"Earlier in this conversation:\n{turns}\n\nUser: {message}"
+
+
+class _PluginCall:
+    """Deadline, breaker and thread checks for one call to a plugin"""
+
+    def __init__(self, intent, plugin, params):
+        self.intent = intent
+        self.plugin = plugin
+        self.plugin_budget = PLUGIN_TIMEOUTS.get(plugin, DEFAULT_PLUGIN_TIMEOUT)
+        self.request_deadline = get_deadline(params)
+        self.breaker = get_breaker(plugin)
+        self.pool = get_plugin_pool(plugin)
+
+    def remaining(self):
+        """Seconds the plugin may take from now: its slice, capped by the request deadline"""
+        if self.request_deadline is None:
+            return self.plugin_budget
+        return min(self.plugin_budget, self.request_deadline - time.monotonic())
+
+    def admit(self):
+        """
+        Check the deadline, the breaker and for a free thread
+
+        Returns:
+            str: Degraded response if the call cannot go ahead, else None
+        """
+        if self.remaining() <= 0:
+            return _timeout_response(self.intent, self.plugin)
+        if not self.breaker.allow_request():
+            return _circuit_open_response(self.intent, self.plugin, self.breaker)
+        if not self.pool.wait_for_thread(self.remaining()):
+            self.breaker.record_skipped()
+            return _busy_response(self.intent, self.plugin)
+        if self.remaining() <= 0:
+            self.breaker.record_skipped()
+            return _timeout_response(self.intent, self.plugin)
+        return None
+
+
 def handle_command(intent, params):
     """
     Handle various commands including enhanced Google search
 
+    Plugin calls are bounded by the request deadline (``params["deadline"]``
+    as time.monotonic(), or ``params["timeout"]`` in seconds) and by the
+    plugin's own slice in PLUGIN_TIMEOUTS. A call that runs past its slice
+    is abandoned and a degraded response is returned; plugins can read what
+    is left with deadline.remaining_budget().
+
+    Every plugin runs on its own bounded thread pool (plugin_pool), so calls
+    left hanging by one backend cannot starve the others. The slice starts
+    when a thread picks the call up; a call that finds no free thread
+    before the deadline gets a busy response and is not counted against
+    the plugin's breaker.
+
+    Each plugin sits behind a circuit breaker: after repeated failures or
+    timeouts its intents fail fast for a cool-down window, then a single
+    request probes whether the backend has recovered. Only exceptions
+    raised by the plugin's own functions count as failures; error replies
+    caused by bad params or local helpers do not.
+
+    Intents with hedging enabled (request_hedging.enable_hedging) send a
+    second attempt when the first is slower than their latency percentile.
+
+    Every turn with a ``params["user_id"]`` is recorded in conversation_buffer
+    with the user's words from ``params["utterance"]`` (or the message or
+    query), so the next turn's context never needs a storage read. Turns
+    without a user id are not buffered.
+
+    Args:
+        intent (str): Command intent
+        params (dict): Command parameters
+
+    Returns:
+        str: Command result
+    """
+    result = _guarded_command(intent, params)
+    _record_turn(intent, params, result)
+    return result
+
+
+def _guarded_command(intent, params):
+    """handle_command without the turn recording"""
+    plugin = INTENT_PLUGINS.get(intent)
+    if plugin is None:
+        return _dispatch_command(intent, params)
+
+    call = _PluginCall(intent, plugin, params)
+    rejection = call.admit()
+    if rejection:
+        return rejection
+    breaker, pool = call.breaker, call.pool
+    budget, request_deadline = call.remaining(), call.request_deadline
+
+    policy = get_hedge_policy(intent)
+    future = None
+    plugin_errors = []
+    try:
+        if policy:
+            primary = partial(_dispatch_with_deadline, intent, params, budget, request_deadline,
+                              plugin_errors)
+            alternate = primary
+            if policy.alternate:
+                alternate = partial(_alternate_with_deadline, policy.alternate, params,
+                                    budget, request_deadline)
+            result = run_hedged(policy, primary, alternate, pool, budget, _is_error_reply)
+        else:
+            future = pool.submit(_dispatch_with_deadline, intent, params, budget, request_deadline,
+                                 plugin_errors)
+            result = future.result(timeout=budget)
+    except PluginBusyError:
+        # Another request took the free thread first
+        breaker.record_skipped()
+        return _busy_response(intent, plugin)
+    except FutureTimeoutError:
+        if future:
+            future.cancel()
+        breaker.record_failure()
+        print(f"⚠️ {plugin} call for {intent} abandoned after {budget:.1f}s")
+        return _timeout_response(intent, plugin)
+    except Exception:
+        # Raised by dispatch code rather than the plugin: not the backend's fault
+        if plugin_errors:
+            breaker.record_failure()
+        else:
+            breaker.record_skipped()
+        raise
+
+    if _is_failed_result(result):
+        breaker.record_failure()
+        return str(result)
+    breaker.record_success()
+    return result
+
+
+def _dispatch_command(intent, params):
+    """
+    Route a command to the plugin function that serves it
+
     Args:
         intent (str): Command intent
         params (dict): Command parameters
@@ -230,7 +589,7 @@ def handle_command(intent, params):
         return conversation.motivate()
 
     elif intent == "chat_ai":
-        message = params.get("message", "")
+        message = _with_recent_turns(params.get("message", ""), params.get("user_id"))
         return conversation.chat_response(message)
 
     elif intent == "greeting":
@@ -325,7 +684,10 @@ Ready to help with divine wisdom! आपकी क्या service कर स
     # Database Commands
     elif intent == "get_conversation_history":
         try:
-            history = get_user_conversation_history(limit=5)
+            # This process's recent turns first; storage only for a cold session
+            user_id = params.get("user_id")
+            history = (conversation_buffer.recent_turns(user_id, 5) if user_id is not None else []) \
+                or get_user_conversation_history(limit=5)
             if history:
                 result = "📚 **Recent Conversation History:**\n\n"
                 for i, conv in enumerate(history, 1):
@@ -356,11 +718,8 @@ Ready to help with divine wisdom! आपकी क्या service कर स
             content = params.get("content", "")
             if content:
                 # Simple parsing - first sentence as topic, rest as content
-                sentences = content.split('.')
-                topic = sentences[0].strip() if sentences else content[:50]
-                full_content = content
-
-                add_to_knowledge_base(topic, full_content, "user_added")
+                topic = knowledge_topic(content)
+                add_to_knowledge_base(topic, content, "user_added")
                 return f"✅ Knowledge added to database: {topic}"
             else:
                 return "❌ Please provide content to add to knowledge base."
@@ -395,9 +754,11 @@ Ready to help with divine wisdom! आपकी क्या service कर स
             description = params.get("description", "")
             priority = params.get("priority", "medium")
             category = params.get("category", "general")
-            due_date = params.get("due_date", None)
+            due_date = normalize_time(params.get("due_date", None))
             result = add_personal_task(
                 title, description, priority, category, due_date)
+            _record_daily_write(params, "add_task", result, title=title, priority=priority,
+                                category=category)
             return f"✅ **Task Added Successfully!**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error adding task: {e}"
@@ -414,6 +775,7 @@ Ready to help with divine wisdom! आपकी क्या service कर स
         try:
             task_id = params.get("task_id", 0)
             result = complete_task(task_id)
+            _record_daily_write(params, "complete_task", result, task_id=task_id)
             return f"🎉 **Task Completed!**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error completing task: {e}"
@@ -432,6 +794,7 @@ Ready to help with divine wisdom! आपकी क्या service कर स
         try:
             habit_name = params.get("habit_name", "")
             result = log_habit_completion(habit_name)
+            _record_daily_write(params, "log_habit", result, habit_name=habit_name)
             return f"🔥 **Habit Logged!**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error logging habit: {e}"
@@ -445,6 +808,8 @@ Ready to help with divine wisdom! आपकी क्या service कर स
             tomorrow_goals = params.get("tomorrow_goals", "")
             result = add_journal_entry(
                 mood_rating, gratitude, highlights, challenges, tomorrow_goals)
+            _record_daily_write(params, "add_journal", result, mood_rating=mood_rating,
+                                highlights=highlights)
             return f"📝 **Journal Entry Added!**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error adding journal entry: {e}"
@@ -462,6 +827,7 @@ Ready to help with divine wisdom! आपकी क्या service कर स
                 'energy_level': params.get('energy_level')
             }
             result = log_health_data(**health_data)
+            _record_daily_write(params, "log_health", result, **health_data)
             return f"💪 **Health Data Logged!**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error logging health data: {e}"
@@ -475,6 +841,7 @@ Ready to help with divine wisdom! आपकी क्या service कर स
             is_recurring = params.get("is_recurring", False)
             result = add_expense(amount, category, description,
                                  payment_method, is_recurring)
+            _record_daily_write(params, "add_expense", result, amount=amount, category=category)
             return f"💰 **Expense Added!**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error adding expense: {e}"
@@ -482,7 +849,13 @@ Ready to help with divine wisdom! आपकी क्या service कर स
     elif intent == "expense_summary":
         try:
             period = params.get("period", "month")
-            result = get_expense_summary(period)
+            # Composed from running buckets once they hold the full history and the
+            # plugin's layout is known; unknown periods are the plugin's to judge
+            result = expense_aggregates.plugin_reply(period)
+            if result is None:
+                result = get_expense_summary(period)
+                if supports_period(period) and expense_aggregates.is_seeded():
+                    expense_aggregates.learn(period, result)
             return f"📊 **Expense Summary**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error getting expense summary: {e}"
@@ -516,6 +889,8 @@ Ready to help with divine wisdom! आपकी क्या service कर स
             notes = params.get("notes", "")
             result = log_learning_session(
                 skill_name, source, time_spent, progress, notes)
+            _record_daily_write(params, "log_learning", result, skill_name=skill_name,
+                                time_spent=time_spent)
             return f"📚 **Learning Session Logged!**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error logging learning: {e}"
@@ -542,7 +917,10 @@ Ready to help with divine wisdom! आपकी क्या service कर स
     elif intent == "daily_summary":
         try:
             date = params.get("date", None)
-            result = get_daily_summary(date)
+            # Snapshot re-read from the plugin and folded by the write intents
+            result = daily_summaries.get(params.get("user_id", "default_user"), date)
+            if result is None:
+                result = get_daily_summary(date)
             return f"📊 **Daily Summary**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error getting daily summary: {e}"
@@ -557,6 +935,7 @@ Ready to help with divine wisdom! आपकी क्या service कर स
             user_id = params.get("user_id", "default_user")
             result = remember_conversation(
                 user_input, ai_response, intent_type, context, user_id)
+            user_context_cache.invalidate(user_id)
             return f"🧠 **Memory Stored Successfully!**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error storing memory: {e}"
@@ -575,7 +954,9 @@ Ready to help with divine wisdom! आपकी क्या service कर स
     elif intent == "get_context":
         try:
             user_id = params.get("user_id", "default_user")
-            result = get_user_context(user_id)
+            result = user_context_cache.get(user_id, "context", partial(get_user_context, user_id))
+            if isinstance(result, dict) and "user_id" in params:
+                result = dict(result, recent_turns=conversation_buffer.recent_turns(user_id, 5))
             return f"👤 **User Context**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error getting user context: {e}"
@@ -584,12 +965,13 @@ Ready to help with divine wisdom! आपकी क्या service कर स
         try:
             task_title = params.get("task_title", "")
             task_description = params.get("task_description", "")
-            scheduled_time = params.get("scheduled_time", "")
+            scheduled_time = normalize_time(params.get("scheduled_time", ""))
             conversation_context = params.get("conversation_context", "")
             user_id = params.get("user_id", "default_user")
             priority = params.get("priority", 3)
             result = schedule_task_from_conversation(
                 task_title, task_description, scheduled_time, conversation_context, user_id, priority)
+            user_context_cache.invalidate(user_id)
             return f"📅 **Task Scheduled from Conversation!**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error scheduling task from conversation: {e}"
@@ -597,7 +979,7 @@ Ready to help with divine wisdom! आपकी क्या service कर स
     elif intent == "get_reminders":
         try:
             user_id = params.get("user_id", "default_user")
-            result = get_pending_reminders(user_id)
+            result = user_context_cache.get(user_id, "reminders", partial(get_pending_reminders, user_id))
             return f"🔔 **Pending Reminders**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error getting reminders: {e}"
@@ -605,7 +987,7 @@ Ready to help with divine wisdom! आपकी क्या service कर स
     elif intent == "memory_stats":
         try:
             user_id = params.get("user_id", "default_user")
-            result = get_memory_stats(user_id)
+            result = user_context_cache.get(user_id, "memory_stats", partial(get_memory_stats, user_id))
             return f"📊 **Memory System Statistics**\n\n{json.dumps(result, indent=2)}"
         except Exception as e:
             return f"❌ Error getting memory stats: {e}"
@@ -629,7 +1011,7 @@ Ready to help with divine wisdom! आपकी क्या service कर स
         try:
             task_name = params.get("task_name", "")
             task_description = params.get("task_description", "")
-            scheduled_time = params.get("scheduled_time", "")
+            scheduled_time = normalize_time(params.get("scheduled_time", ""))
             task_type = params.get("task_type", "reminder")
             priority = params.get("priority", 3)
             auto_execute = params.get("auto_execute", False)
@@ -668,7 +1050,7 @@ Ready to help with divine wisdom! आपकी क्या service कर स
     elif intent == "snooze_task":
         try:
             task_id = params.get("task_id", 0)
-            snooze_minutes = params.get("snooze_minutes", 15)
+            snooze_minutes = parse_duration_minutes(params.get("snooze_minutes", 15))
             user_id = params.get("user_id", "default_user")
             result = snooze_task(task_id, snooze_minutes, user_id)
             return f"😴 **Task Snoozed!**\n\n{json.dumps(result, indent=2)}"
@@ -690,6 +1072,28 @@ Ready to help with divine wisdom! आपकी क्या service कर स
         except Exception as e:
             return f"❌ Error getting scheduler stats: {e}"
 
+    elif intent == "breaker_stats":
+        stats = {"breakers": get_breaker_stats(), "thread_pools": get_pool_stats()}
+        return f"🛡️ **Plugin Circuit Breakers**\n\n{json.dumps(stats, indent=2)}"
+
+    elif intent == "hedging_stats":
+        return f"🔀 **Request Hedging**\n\n{json.dumps(get_hedging_stats(), indent=2)}"
+
+    elif intent == "reload_intents":
+        report = reload_intents().result()
+        if not report["reloaded"]:
+            return "❌ Error reloading intents:\n" + "\n".join(report["errors"])
+        return f"🔄 **Intents Reloaded**\n\n{json.dumps(report, indent=2)}"
+
+    elif intent == "router_stats":
+        stats = dict(intent_router.get_stats(), profile=get_routing_profile().get_stats())
+        return f"🧭 **Intent Router**\n\n{json.dumps(stats, indent=2)}"
+
+    elif intent == "context_cache_stats":
+        stats = {"user_context": user_context_cache.get_stats(),
+                 "conversation_buffer": conversation_buffer.get_stats()}
+        return f"👤 **User Context Cache**\n\n{json.dumps(stats, indent=2)}"
+
     else:
         return f"""Command '{intent}' not recognized. 
 
@@ -716,6 +1120,263 @@ Ready to help with divine wisdom! आपकी क्या service कर स
 google_search, detailed_search, image_search, video_search, lucky_search, open_website, get_weather, open_app, take_screenshot, open_file, motivate, chat_ai, check_internet, ping_website, network_info, network_speed, diagnose_network, connect_wifi, show_wifi, livekit_status, livekit_room_info, livekit_stats, connect_room, disconnect_room, get_conversation_history, get_database_stats, add_knowledge, search_knowledge"""
 
 
+# Compound commands
+# Workers shared by all compound utterances
+COMPOUND_MAX_WORKERS = 4
+_compound_executor = None
+
+
+def _command_resource_key(intent, params):
+    """Commands sharing a key touch the same resource and must run in order"""
+    if intent == "control_device":
+        return intent, params.get("device_name", "")
+    return intent, None
+
+
+def _run_command_group(commands, indexes, results):
+    """Run dependent commands one after another, in spoken order"""
+    for index in indexes:
+        intent, params = commands[index]
+        try:
+            results[index] = handle_command(intent, params)
+        except Exception as e:
+            results[index] = f"❌ Error running {intent}: {e}"
+
+
+def handle_commands(commands, deadline=None):
+    """
+    Handle several commands from one utterance
+
+    Independent commands run concurrently; commands acting on the same
+    resource (e.g. two actions on one device) keep their spoken order.
+
+    Args:
+        commands (list): (intent, params) tuples, e.g. from
+            nlp_processor.process_compound_command
+        deadline (float): Optional time.monotonic() deadline shared by all commands
+
+    Returns:
+        list: Command results in the same order as ``commands``
+    """
+    global _compound_executor
+
+    if deadline is not None:
+        for _, params in commands:
+            params.setdefault(DEADLINE_PARAM, deadline)
+
+    results = [None] * len(commands)
+    if len(commands) <= 1:
+        _run_command_group(commands, range(len(commands)), results)
+        return results
+
+    groups = {}
+    for index, (intent, params) in enumerate(commands):
+        groups.setdefault(_command_resource_key(intent, params), []).append(index)
+
+    if _compound_executor is None:
+        _compound_executor = ThreadPoolExecutor(
+            max_workers=COMPOUND_MAX_WORKERS, thread_name_prefix="om-compound")
+
+    futures = [_compound_executor.submit(_run_command_group, commands, indexes, results)
+               for indexes in groups.values()]
+    for future in futures:
+        future.result()
+
+    return results
+
+
+# Streaming responses
+# A sentence ends at a Hindi danda (।), English . ! ? or a line break
+SENTENCE_END_PATTERN = re.compile(r'[।.!?]+["\')\]]*(?=\s|$)|\n+')
+
+# Shortest chunk worth sending to TTS on its own
+MIN_CHUNK_CHARS = 20
+
+# Intents whose plugin may offer a chunked generator:
+# intent -> (plugin module, stream function name, param name)
+STREAMING_INTENTS = {
+    "chat_ai": (conversation, "chat_response_stream", "message"),
+    "openai_explain": (search_info, "openai_explain_stream", "query"),
+}
+
+
+def split_sentences(text, min_chars=MIN_CHUNK_CHARS):
+    """
+    Split text into sentence-sized chunks for TTS
+
+    Args:
+        text (str): Text to split
+        min_chars (int): Short sentences are merged until this length
+
+    Yields:
+        str: Sentence-sized chunks
+    """
+    pending = ""
+    start = 0
+    for match in SENTENCE_END_PATTERN.finditer(text):
+        pending += text[start:match.end()]
+        start = match.end()
+        if len(pending.strip()) >= min_chars:
+            yield pending.strip()
+            pending = ""
+
+    pending += text[start:]
+    if pending.strip():
+        yield pending.strip()
+
+
+def _rechunk_stream(pieces, min_chars=MIN_CHUNK_CHARS):
+    """Re-buffer arbitrary text deltas from a plugin into sentence chunks"""
+    buffer = ""
+    for piece in pieces:
+        if not piece:
+            continue
+        buffer += piece
+
+        # Emit everything up to the last complete sentence boundary
+        last_end = 0
+        for match in SENTENCE_END_PATTERN.finditer(buffer):
+            if match.end() < len(buffer) or buffer.endswith("\n"):
+                last_end = match.end()
+        if last_end and len(buffer[:last_end].strip()) >= min_chars:
+            yield from split_sentences(buffer[:last_end], min_chars)
+            buffer = buffer[last_end:]
+
+    if buffer.strip():
+        yield from split_sentences(buffer, min_chars)
+
+
+def _get_stream_function(module, function_name):
+    """Return a plugin's streaming function, or None if it has none"""
+    if getattr(module, "is_fallback", False):
+        return None
+    return getattr(module, function_name, None)
+
+
+_STREAM_END = object()
+
+
+def _produce_stream(stream_function, argument, pieces, stop, budget, request_deadline):
+    """Pull a plugin's stream on a plugin thread, handing pieces to the caller"""
+    token = set_current_deadline(_run_deadline(budget, request_deadline))
+    try:
+        result = stream_function(argument)
+        if isinstance(result, str):
+            result = [result]
+        for piece in result:
+            if stop.is_set():
+                return
+            pieces.put(piece)
+        pieces.put(_STREAM_END)
+    except Exception as e:
+        pieces.put(e)
+    finally:
+        reset_current_deadline(token)
+
+
+def _guarded_stream(call, stream_function, argument):
+    """
+    Yield a plugin's stream pieces under the same guards as handle_command
+
+    Each piece must arrive within the plugin's slice (capped by the request
+    deadline); a stalled stream is abandoned and counted as a failure.
+
+    Raises:
+        PluginBusyError: The plugin has no free thread
+        concurrent.futures.TimeoutError: The plugin stalled
+    """
+    pieces = queue.Queue()
+    stop = threading.Event()
+    call.pool.submit(_produce_stream, stream_function, argument, pieces, stop,
+                     call.remaining(), call.request_deadline)
+    outcome_recorded = False
+    try:
+        while True:
+            try:
+                piece = pieces.get(timeout=max(0.0, call.remaining()))
+            except queue.Empty:
+                outcome_recorded = True
+                call.breaker.record_failure()
+                print(f"⚠️ {call.plugin} stream for {call.intent} abandoned after a stall")
+                raise FutureTimeoutError()
+            if piece is _STREAM_END:
+                outcome_recorded = True
+                call.breaker.record_success()
+                return
+            if isinstance(piece, Exception):
+                outcome_recorded = True
+                call.breaker.record_failure()
+                raise piece
+            yield piece
+    finally:
+        stop.set()
+        if not outcome_recorded:
+            # The caller stopped reading early
+            call.breaker.record_skipped()
+
+
+def stream_command(intent, params):
+    """
+    Handle a command and yield its reply as sentence-sized chunks
+
+    Lets TTS start speaking as soon as the first sentence exists instead of
+    waiting for the whole reply. Chunked output from the conversation and
+    search plugins is passed through where supported; any other reply is
+    split locally on Hindi and English sentence boundaries.
+
+    Plugin streams get the same deadline, circuit breaker and thread pool
+    guards as handle_command, so a stalled plugin ends the stream with the
+    timeout response instead of hanging it.
+
+    Args:
+        intent (str): Command intent
+        params (dict): Command parameters
+
+    Yields:
+        str: Sentence-sized pieces of the reply
+    """
+    if intent in STREAMING_INTENTS:
+        module, function_name, param_name = STREAMING_INTENTS[intent]
+        stream_function = _get_stream_function(module, function_name)
+        if stream_function:
+            call = _PluginCall(intent, INTENT_PLUGINS[intent], params)
+            rejection = call.admit()
+            if rejection:
+                _record_turn(intent, params, rejection)
+                yield rejection
+                return
+            argument = params.get(param_name, "")
+            if intent == "chat_ai":
+                argument = _with_recent_turns(argument, params.get("user_id"))
+            # Chunks sent so far; recorded as the turn's response however the stream ends
+            sent = []
+            try:
+                for chunk in _rechunk_stream(_guarded_stream(call, stream_function, argument)):
+                    sent.append(chunk)
+                    yield chunk
+                return
+            except PluginBusyError:
+                call.breaker.record_skipped()
+                sent.append(_busy_response(intent, call.plugin))
+                yield sent[-1]
+                return
+            except FutureTimeoutError:
+                sent.append(_timeout_response(intent, call.plugin))
+                yield sent[-1]
+                return
+            except Exception as e:
+                if sent:
+                    sent.append(f"❌ Error while streaming response: {e}")
+                    yield sent[-1]
+                    return
+                print(f"⚠️ Streaming not available for {intent}: {e}")
+            finally:
+                if sent:
+                    _record_turn(intent, params, " ".join(sent))
+
+    yield from split_sentences(handle_command(intent, params))
+
+
 # Command mapping for voice recognition
 VOICE_COMMANDS = {
     # Search commands
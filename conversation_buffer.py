@@ -0,0 +1,258 @@
+"""
+Conversation Buffer for OM AI
+Fixed-capacity ring buffer of each session's recent turns, filled on the
+request path so the next turn's context never needs a storage read
+
+Turns are stored compactly as (timestamp, query, intent, response digest)
+tuples. Full turns are handed to a background thread that writes them with
+the database manager's save_conversation_to_db in batches; a full write
+queue drops turns (counted in the stats) instead of blocking a request.
+Turn fields are passed to save_conversation_to_db by its parameter names.
+"""
+
+import atexit
+import inspect
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+TURNS_PER_SESSION = 20
+MAX_SESSIONS = 1000
+
+# Characters of a response kept in the buffer; the database gets all of it
+DIGEST_CHARS = 160
+MAX_QUERY_CHARS = 500
+
+MAX_PENDING_WRITES = 1000
+FLUSH_BATCH = 50
+FLUSH_INTERVAL = 1.0
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Parameter names save_conversation_to_db may use for each turn field
+TURN_FIELD_NAMES = {
+    "query": ("query", "user_query", "user_input", "user_message", "message", "text"),
+    "response": ("response", "ai_response", "assistant_response", "bot_response", "reply"),
+    "intent": ("intent", "intent_type", "command", "command_type"),
+    "session_id": ("session_id", "session", "user_id", "conversation_id"),
+}
+TURN_FIELDS = tuple(TURN_FIELD_NAMES)
+
+
+def response_digest(response) -> str:
+    """First DIGEST_CHARS characters of a response on one line"""
+    text = WHITESPACE_PATTERN.sub(' ', str(response or '')).strip()
+    return text if len(text) <= DIGEST_CHARS else text[:DIGEST_CHARS - 1] + "…"
+
+
+def turn_arguments(function: Callable) -> Optional[Dict[str, str]]:
+    """
+    Map a writer's parameters to turn fields
+
+    Args:
+        function (Callable): save_conversation_to_db or a stand-in
+
+    Returns:
+        Optional[Dict[str, str]]: {parameter name: turn field}, or None when
+        the writer only takes ``*args`` (the fields are then passed in
+        TURN_FIELDS order)
+
+    Raises:
+        TypeError: A required parameter is not a known turn field, or a
+            field name is positional-only
+    """
+    parameters = inspect.signature(function).parameters.values()
+    named = [p for p in parameters if p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)]
+    if not named and any(p.kind == p.VAR_POSITIONAL for p in parameters):
+        return None
+
+    mapping = {}
+    for parameter in named:
+        field = next((field for field, names in TURN_FIELD_NAMES.items()
+                      if parameter.name in names and field not in mapping.values()), None)
+        if field is None:
+            if parameter.default is parameter.empty:
+                raise TypeError(f"{getattr(function, '__name__', function)} needs '{parameter.name}', "
+                                f"which is not a conversation turn field")
+            continue
+        if parameter.kind == parameter.POSITIONAL_ONLY:
+            raise TypeError(f"{getattr(function, '__name__', function)} takes '{parameter.name}' "
+                            f"positionally only")
+        mapping[parameter.name] = field
+    return mapping
+
+
+_writer_arguments = {}
+
+
+def _save_to_database(query: str, response: str, intent: str, session_id: str):
+    # Imported on first flush; command_handler pulls in every plugin
+    from .command_handler import save_conversation_to_db
+    if save_conversation_to_db not in _writer_arguments:
+        _writer_arguments[save_conversation_to_db] = turn_arguments(save_conversation_to_db)
+    mapping = _writer_arguments[save_conversation_to_db]
+    turn = {"query": query, "response": response, "intent": intent, "session_id": session_id}
+    if mapping is None:
+        save_conversation_to_db(*(turn[field] for field in TURN_FIELDS))
+    else:
+        save_conversation_to_db(**{name: turn[field] for name, field in mapping.items()})
+
+
+class ConversationBuffer:
+    """Per-session ring buffers of recent turns with asynchronous persistence"""
+
+    def __init__(self, turns_per_session: int = TURNS_PER_SESSION, max_sessions: int = MAX_SESSIONS,
+                 writer: Optional[Callable] = _save_to_database):
+        """
+        Args:
+            turns_per_session (int): Turns kept per session; older ones fall out
+            max_sessions (int): Sessions kept before the least recently active is dropped
+            writer (Callable): writer(query, response, intent, session_id)
+                persists one turn; None keeps turns in memory only
+        """
+        self.turns_per_session = turns_per_session
+        self.max_sessions = max_sessions
+        self.writer = writer
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self._sessions = OrderedDict()
+        self._pending = queue.Queue(maxsize=MAX_PENDING_WRITES)
+        self._flusher = None
+        self._lock = threading.Lock()
+
+    def record(self, session_id: str, query: str, intent: str, response) -> None:
+        """
+        Add a turn to the session's buffer and queue it for the database
+
+        Args:
+            session_id (str): Session or user the turn belongs to
+            query (str): User utterance
+            intent (str): Routed intent
+            response: Command result (stored as a digest)
+        """
+        query = str(query)[:MAX_QUERY_CHARS]
+        turn = (time.time(), query, intent, response_digest(response))
+        with self._lock:
+            turns = self._sessions.get(session_id)
+            if turns is None:
+                turns = self._sessions[session_id] = deque(maxlen=self.turns_per_session)
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            turns.append(turn)
+
+        if self.writer is None:
+            return
+        try:
+            self._pending.put_nowait((query, str(response), intent, session_id))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        self._ensure_flusher()
+
+    def recent_turns(self, session_id: str, limit: int = None) -> List[Dict]:
+        """
+        The session's most recent turns, oldest first
+
+        Returns:
+            List[Dict]: "query", "intent", "response" (digest) and
+            "timestamp" (ISO format), as get_user_conversation_history
+            returns them
+        """
+        with self._lock:
+            turns = list(self._sessions.get(session_id, ()))
+        if limit is not None:
+            turns = turns[-limit:] if limit > 0 else []
+        return [{"query": query, "intent": intent, "response": digest,
+                 "timestamp": datetime.fromtimestamp(stamp).isoformat(timespec="seconds")}
+                for stamp, query, intent, digest in turns]
+
+    def get_context(self, session_id: str, limit: int = 5) -> Dict:
+        """Context for prompt building: the last turns and the last intent"""
+        turns = self.recent_turns(session_id, limit)
+        return {"recent_turns": turns, "last_intent": turns[-1]["intent"] if turns else None}
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            # A forked worker inherits the object but not the parent's thread
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True,
+                                                 name="om-conversation-flush")
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            try:
+                batch = [self._pending.get(timeout=FLUSH_INTERVAL)]
+            except queue.Empty:
+                continue
+            while len(batch) < FLUSH_BATCH:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: List[tuple]):
+        written = failed = 0
+        for query, response, intent, session_id in batch:
+            try:
+                self.writer(query, response, intent, session_id)
+                written += 1
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ Could not save conversation turn: {e}")
+            finally:
+                self._pending.task_done()
+        with self._lock:
+            self.flushed += written
+            self.failed += failed
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Write every queued turn now (e.g. at shutdown)
+
+        Returns:
+            bool: True if the queue was drained within ``timeout``
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            batch = []
+            while len(batch) < FLUSH_BATCH:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return True
+            self._write(batch)
+        return self._pending.empty()
+
+    def get_stats(self) -> Dict:
+        """Sessions and turns held, approximate size and write counters"""
+        with self._lock:
+            turns = [turn for session in self._sessions.values() for turn in session]
+            return {
+                "sessions": len(self._sessions),
+                "turns": len(turns),
+                "text_chars": sum(len(query) + len(digest) + len(intent)
+                                  for _, query, intent, digest in turns),
+                "pending_writes": self._pending.qsize(),
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "failed": self.failed
+            }
+
+
+# Create global instance
+conversation_buffer = ConversationBuffer()
+atexit.register(conversation_buffer.flush)
@@ -0,0 +1,429 @@
+"""
+Daily Summaries for OM AI
+Per-user, per-day summary snapshots kept current by the daily life write
+intents, so reading a day's summary is one primary-key lookup
+
+Each successful add_task, complete_task, log_habit, add_journal,
+log_health, add_expense and log_learning appends a small event to the
+day's log and folds it into the snapshot in the same transaction. After
+each write the snapshot also re-reads get_daily_summary (which already
+includes that write), so reads return the plugin's current summary with
+the folded counts under "recorded_today" instead of replacing it or
+going stale. ``rebuild`` refolds snapshots from that log and
+reseeds them from the plugin's storage to repair them (or after the fold
+changes); days without a snapshot fall back to get_daily_summary.
+
+Snapshots live in memory unless OM_DAILY_SUMMARIES names a file.
+
+    python -m <package>.daily_summaries show --user u42 --date 2024-05-01
+    python -m <package>.daily_summaries rebuild [--user u42] [--date 2024-05-01]
+    python -m <package>.daily_summaries prune --days 30
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+# SQLite file for snapshots and events (OM_DAILY_SUMMARIES; unset keeps
+# them in memory for this process only)
+DEFAULT_SUMMARIES_PATH = os.environ.get("OM_DAILY_SUMMARIES") or None
+
+SUMMARY_EVENTS = ("add_task", "complete_task", "log_habit", "add_journal",
+                  "log_health", "add_expense", "log_learning")
+
+# Names listed per section; counters keep counting past it
+MAX_LISTED_ITEMS = 20
+EVENT_RETENTION_DAYS = 30
+
+HEALTH_FIELDS = ("weight", "steps", "water_intake", "sleep_hours", "exercise_minutes",
+                 "calories", "mood_score", "energy_level")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS daily_summaries (
+    user_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (user_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily_summary_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_daily_summary_events_day ON daily_summary_events(user_id, day);
+"""
+
+
+def summary_day(value=None) -> str:
+    """ISO day for a date, datetime or ISO string (default: today)"""
+    if value is None or value == "today":
+        return date.today().isoformat()
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return date.fromisoformat(str(value).strip()[:10]).isoformat()
+
+
+def empty_summary(day: str) -> Dict:
+    return {
+        "date": day,
+        "plugin": None,
+        "plugin_read_at": 0.0,
+        "tasks": {"added": 0, "completed": 0, "added_titles": [], "completed_ids": []},
+        "habits": {"logged": 0, "names": []},
+        "journal": {"entries": 0, "mood_rating": None, "highlights": None},
+        "health": {},
+        "expenses": {"total": 0.0, "count": 0, "by_category": {}},
+        "learning": {"sessions": 0, "minutes": 0, "skills": []},
+    }
+
+
+def seed_summary(seed: Callable, day: str) -> Optional[Dict]:
+    """
+    The plugin's own summary for a day, or None if it has none to give
+
+    Args:
+        seed (Callable): get_daily_summary, called with the ISO day
+        day (str): ISO day
+    """
+    try:
+        result = seed(day)
+    except Exception as e:
+        print(f"⚠️ Could not seed daily summary for {day}: {e}")
+        return None
+    # The fallback stubs answer with plain strings
+    if not isinstance(result, dict) or result.get("success") is False:
+        return None
+    return result
+
+
+def set_plugin_summary(summary: Dict, plugin: Optional[Dict], read_at: float) -> Dict:
+    """
+    Store the plugin's summary in a snapshot unless a newer read is already there
+
+    Args:
+        summary (Dict): Snapshot to update (in place)
+        plugin (Dict): seed_summary() result; None leaves the snapshot as is
+        read_at (float): time.time() taken before the plugin was called, so
+            concurrent writes keep the read that saw the most
+    """
+    if plugin is not None and read_at >= summary.get("plugin_read_at", 0.0):
+        summary["plugin"] = plugin
+        summary["plugin_read_at"] = read_at
+    return summary
+
+
+def merged_summary(summary: Dict) -> Dict:
+    """
+    A stored snapshot as callers see it: the plugin's summary with the
+    folded counts under "recorded_today", or the counts alone if unseeded
+    """
+    summary = dict(summary)
+    summary.pop("plugin_read_at", None)
+    plugin = summary.pop("plugin", None)
+    if plugin is None:
+        return summary
+    return dict(plugin, recorded_today=summary)
+
+
+def _append_listed(items: list, value, unique: bool = False):
+    if value in (None, "") or len(items) >= MAX_LISTED_ITEMS:
+        return
+    if unique and value in items:
+        return
+    items.append(value)
+
+
+def _number(value, default=0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def apply_event(summary: Dict, kind: str, payload: Dict) -> Dict:
+    """
+    Fold one write into a day's summary (in place)
+
+    Args:
+        summary (Dict): Snapshot from empty_summary() or a previous fold
+        kind (str): One of SUMMARY_EVENTS
+        payload (Dict): The write's parameters
+
+    Returns:
+        Dict: The updated summary
+    """
+    if kind == "add_task":
+        summary["tasks"]["added"] += 1
+        _append_listed(summary["tasks"]["added_titles"], payload.get("title"))
+    elif kind == "complete_task":
+        summary["tasks"]["completed"] += 1
+        _append_listed(summary["tasks"]["completed_ids"], payload.get("task_id"))
+    elif kind == "log_habit":
+        summary["habits"]["logged"] += 1
+        _append_listed(summary["habits"]["names"], payload.get("habit_name"), unique=True)
+    elif kind == "add_journal":
+        journal = summary["journal"]
+        journal["entries"] += 1
+        journal["mood_rating"] = payload.get("mood_rating", journal["mood_rating"])
+        journal["highlights"] = payload.get("highlights") or journal["highlights"]
+    elif kind == "log_health":
+        # Latest reading per field
+        summary["health"].update({field: payload[field] for field in HEALTH_FIELDS
+                                  if payload.get(field) is not None})
+    elif kind == "add_expense":
+        expenses = summary["expenses"]
+        amount = _number(payload.get("amount"))
+        category = str(payload.get("category") or "other")
+        expenses["total"] = round(expenses["total"] + amount, 2)
+        expenses["count"] += 1
+        by_category = expenses["by_category"]
+        by_category[category] = round(by_category.get(category, 0.0) + amount, 2)
+    elif kind == "log_learning":
+        learning = summary["learning"]
+        learning["sessions"] += 1
+        learning["minutes"] += _number(payload.get("time_spent"))
+        _append_listed(learning["skills"], payload.get("skill_name"), unique=True)
+    else:
+        raise ValueError(f"Unknown daily summary event: {kind}")
+    return summary
+
+
+class DailySummaries:
+    """Snapshot per (user, day) plus the event log it is folded from, in SQLite"""
+
+    def __init__(self, path=DEFAULT_SUMMARIES_PATH):
+        """
+        Args:
+            path: SQLite file; empty or ":memory:" keeps everything in this process
+        """
+        self.path = str(path) if path else ":memory:"
+        self.recorded = 0
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A forked worker must not reuse the parent's connection
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False,
+                                               isolation_level=None)
+            self._connection.executescript(SCHEMA_SQL)
+            self._pid = os.getpid()
+        return self._connection
+
+    def _snapshot(self, connection: sqlite3.Connection, user_id: str, day: str) -> Optional[Dict]:
+        row = connection.execute(
+            "SELECT summary FROM daily_summaries WHERE user_id = ? AND day = ?",
+            (user_id, day)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def record(self, user_id: str, kind: str, payload: Dict, when=None,
+               seed: Callable = None) -> None:
+        """
+        Log a write and fold it into the user's snapshot for that day
+
+        Args:
+            user_id (str): User the write belongs to
+            kind (str): One of SUMMARY_EVENTS
+            payload (Dict): The write's parameters (JSON-serializable)
+            when: Day of the write (default: today)
+            seed (Callable): get_daily_summary, re-read after the write so the
+                snapshot holds what the plugin stores now
+        """
+        day = summary_day(when)
+        payload = {key: value for key, value in payload.items() if value is not None}
+        plugin, read_at = None, time.time()
+        if seed is not None:
+            # Outside the lock and transaction: the plugin may be slow
+            plugin = seed_summary(seed, day)
+        with self._lock:
+            connection = self._connect()
+            # IMMEDIATE: workers in other processes fold into the same row
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                summary = self._snapshot(connection, user_id, day) or empty_summary(day)
+                set_plugin_summary(summary, plugin, read_at)
+                apply_event(summary, kind, payload)
+                connection.execute(
+                    "INSERT INTO daily_summary_events (user_id, day, kind, payload) VALUES (?, ?, ?, ?)",
+                    (user_id, day, kind, json.dumps(payload, ensure_ascii=False, default=str)))
+                self._store(connection, user_id, day, summary)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            self.recorded += 1
+
+    @staticmethod
+    def _store(connection: sqlite3.Connection, user_id: str, day: str, summary: Dict):
+        connection.execute(
+            "INSERT OR REPLACE INTO daily_summaries (user_id, day, summary, updated_at) VALUES (?, ?, ?, ?)",
+            (user_id, day, json.dumps(summary, ensure_ascii=False, default=str),
+             datetime.now().isoformat(timespec="seconds")))
+
+    def get(self, user_id: str, day=None) -> Optional[Dict]:
+        """
+        The user's summary for a day, or None if nothing was recorded
+
+        Seeded snapshots are the plugin's summary with the counts folded
+        since under "recorded_today"; see merged_summary
+
+        Args:
+            user_id (str): User
+            day: Date or ISO string (default: today); anything else is a miss
+        """
+        try:
+            day = summary_day(day)
+        except ValueError:
+            return None
+        with self._lock:
+            summary = self._snapshot(self._connect(), user_id, day)
+            if summary is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return merged_summary(summary)
+
+    def for_day(self, day=None) -> Iterator[Tuple[str, Dict]]:
+        """(user_id, summary) for every user with a snapshot that day, e.g. for the morning push"""
+        day = summary_day(day)
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT user_id, summary FROM daily_summaries WHERE day = ? ORDER BY user_id",
+                (day,)).fetchall()
+        for user_id, summary in rows:
+            yield user_id, merged_summary(json.loads(summary))
+
+    def rebuild(self, user_id: str = None, day=None, seed: Callable = None) -> Dict:
+        """
+        Refold snapshots from the event log, reseeding each from the plugin
+
+        Args:
+            user_id (str): Only this user (default: all)
+            day: Only this day (default: every day still in the log)
+            seed (Callable): get_daily_summary; without it (or when it fails)
+                rebuilt snapshots keep the plugin summary they were seeded with
+
+        Returns:
+            Dict: Snapshots rebuilt, events replayed and days reseeded
+        """
+        clauses, params = [], []
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if day is not None:
+            clauses.append("day = ?")
+            params.append(summary_day(day))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        # Plugin calls happen before the transaction; the plugin is per day, not per user
+        plugins, read_at = {}, time.time()
+        if seed is not None:
+            with self._lock:
+                days = [row[0] for row in self._connect().execute(
+                    f"SELECT DISTINCT day FROM daily_summary_events {where}", params)]
+            plugins = {event_day: seed_summary(seed, event_day) for event_day in days}
+
+        summaries = {}
+        events = 0
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for event_user, event_day, kind, payload in connection.execute(
+                        f"SELECT user_id, day, kind, payload FROM daily_summary_events {where} ORDER BY id",
+                        params).fetchall():
+                    key = (event_user, event_day)
+                    if key not in summaries:
+                        # Keep the old read when the plugin has nothing newer to give
+                        old = self._snapshot(connection, event_user, event_day) or {}
+                        summary = empty_summary(event_day)
+                        set_plugin_summary(summary, old.get("plugin"), old.get("plugin_read_at", 0.0))
+                        summaries[key] = set_plugin_summary(summary, plugins.get(event_day), read_at)
+                    apply_event(summaries[key], kind, json.loads(payload))
+                    events += 1
+                for (event_user, event_day), summary in summaries.items():
+                    self._store(connection, event_user, event_day, summary)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return {"summaries": len(summaries), "events": events,
+                "reseeded": sum(plugin is not None for plugin in plugins.values())}
+
+    def prune(self, days: int = EVENT_RETENTION_DAYS) -> int:
+        """
+        Drop logged events older than ``days``; their snapshots stay but can
+        no longer be rebuilt
+
+        Returns:
+            int: Events deleted
+        """
+        cutoff = (date.today() - timedelta(days=days)).isoformat()
+        with self._lock:
+            cursor = self._connect().execute(
+                "DELETE FROM daily_summary_events WHERE day < ?", (cutoff,))
+        return cursor.rowcount
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            connection = self._connect()
+            snapshots, users = connection.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT user_id) FROM daily_summaries").fetchone()
+            events = connection.execute("SELECT COUNT(*) FROM daily_summary_events").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "snapshots": snapshots,
+                "users": users,
+                "events": events,
+                "recorded": self.recorded,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+# Create global instance
+daily_summaries = DailySummaries()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and repair OM AI daily summaries")
+    parser.add_argument("action", choices=("show", "rebuild", "prune", "stats"))
+    parser.add_argument("--user", help="User id (show defaults to default_user)")
+    parser.add_argument("--date", help="Day as YYYY-MM-DD (show defaults to today)")
+    parser.add_argument("--days", type=int, default=EVENT_RETENTION_DAYS,
+                        help="Days of events prune keeps")
+    args = parser.parse_args(argv)
+
+    if args.action == "show":
+        print(json.dumps(daily_summaries.get(args.user or "default_user", args.date), indent=2))
+    elif args.action == "rebuild":
+        if daily_summaries.path == ":memory:":
+            parser.error("rebuild needs OM_DAILY_SUMMARIES set to the snapshot file")
+        # Deferred: command_handler imports this module
+        from .command_handler import get_daily_summary
+        report = daily_summaries.rebuild(args.user, args.date, seed=get_daily_summary)
+        print(f"✅ Rebuilt {report['summaries']} summaries from {report['events']} events "
+              f"({report['reseeded']} days reseeded from the plugin)")
+    elif args.action == "prune":
+        print(f"✅ Pruned {daily_summaries.prune(args.days)} events")
+    else:
+        print(json.dumps(daily_summaries.get_stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Data Export for OM AI
+Streams the tables of the SQLite databases (conversations, memories, tasks,
+...) as JSONL, one {"database": <file name>, "dataset": <table>,
+"record": {...}} object per line
+
+The plugins keep their data in several .db files; by default every .db
+file next to the database manager's is exported, each record naming the
+file it came from. Tables are the ones the databases actually have
+(sqlite_master); asking for one none of them has is an error rather than
+an empty export.
+
+Tables are read with keyset pagination (``WHERE key > ? ORDER BY key
+LIMIT ?``), so memory stays constant however large a user's history is,
+and each page is an index range scan instead of an OFFSET skip. The key
+is the rowid, or the primary key of WITHOUT ROWID tables.
+
+    python -m <package>.data_export export.jsonl.gz --user u42
+
+When writing to stdout ("-"), plugin import messages printed by the package
+itself may precede the first record; skip lines that are not JSON objects.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import ExitStack, closing
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .knowledge_ingest import get_database_path
+
+DEFAULT_PAGE_SIZE = 500
+
+USER_COLUMN = "user_id"
+
+# Name the rowid is selected under; SQLite would report an alias column's name
+ROWID_ALIAS = "_export_rowid"
+
+
+def database_paths() -> List[str]:
+    """
+    Every plugin database: the database manager's file (or OM_DATABASE_PATH)
+    and the other .db files in the same directory
+    """
+    path = get_database_path()
+    if not path:
+        return []
+    path = Path(path)
+    siblings = sorted(str(other) for other in path.parent.glob("*.db") if other != path)
+    return [str(path)] + siblings
+
+
+def list_tables(connection: sqlite3.Connection) -> List[str]:
+    """User tables of the database, from sqlite_master (SQLite's own are left out)"""
+    return [name for (name,) in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' "
+        "ORDER BY name")]
+
+
+def _columns(connection: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')]
+
+
+def page_key(connection: sqlite3.Connection, table: str) -> List[str]:
+    """
+    Columns the export pages on: ``rowid`` (an ``id INTEGER PRIMARY KEY`` is
+    the same column), or the primary key columns of a WITHOUT ROWID table
+    """
+    try:
+        connection.execute(f'SELECT rowid FROM "{table}" LIMIT 0')
+        return ["rowid"]
+    except sqlite3.OperationalError:
+        # WITHOUT ROWID tables always declare a primary key
+        info = connection.execute(f'PRAGMA table_info("{table}")')
+        return [name for _, name in sorted((row[5], row[1]) for row in info if row[5])]
+
+
+def export_rows(connection: sqlite3.Connection, table: str, user_id: str = None,
+                page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict]:
+    """
+    Yield every row of a table as a dict, one page at a time
+
+    Pages are keyed on the rowid, or the primary key of a WITHOUT ROWID
+    table (see page_key), so rows inserted during the export do not shift
+    or repeat earlier pages.
+
+    Args:
+        connection: Open SQLite connection
+        table (str): Table to read
+        user_id (str): Only this user's rows (the table needs a user_id column)
+        page_size (int): Rows fetched per query
+
+    Yields:
+        Dict: Column -> value
+    """
+    columns = _columns(connection, table)
+    key = page_key(connection, table)
+    selected = ", ".join(f'"{column}"' for column in columns)
+    if key == ["rowid"]:
+        selected = f'rowid AS "{ROWID_ALIAS}", ' + selected
+    key_columns = ", ".join(column if column == "rowid" else f'"{column}"' for column in key)
+    user_filter, params = "", []
+    if user_id is not None:
+        user_filter, params = f' AND "{USER_COLUMN}" = ?', [user_id]
+    order = f" ORDER BY {key_columns} LIMIT ?"
+    first_page = f'SELECT {selected} FROM "{table}" WHERE 1{user_filter}{order}'
+    # Row value comparison continues after the last key, whatever its type
+    next_page = (f'SELECT {selected} FROM "{table}" WHERE ({key_columns}) > '
+                 f'({", ".join("?" * len(key))}){user_filter}{order}')
+
+    last_key = None
+    while True:
+        if last_key is None:
+            cursor = connection.execute(first_page, params + [page_size])
+        else:
+            cursor = connection.execute(next_page, last_key + params + [page_size])
+        names = [description[0] for description in cursor.description]
+        rows = cursor.fetchall()
+        for row in rows:
+            record = dict(zip(names, row))
+            if key == ["rowid"]:
+                last_key = [record.pop(ROWID_ALIAS)]
+            else:
+                last_key = [record[column] for column in key]
+            yield record
+        if len(rows) < page_size:
+            return
+
+
+def export_datasets(databases, datasets: List[str] = None, user_id: str = None,
+                    page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict]:
+    """
+    {"database", "dataset", "record"} objects for every requested table
+
+    The tables are checked when this is called, before anything is read.
+
+    Args:
+        databases: SQLite file or list of files, opened read-only
+        datasets (List[str]): Table names (default: every table in every
+            database); each database exports the ones it has
+        user_id (str): Only this user's rows; tables without a user_id
+            column (shared data such as the knowledge base) are skipped
+            with a warning on stderr
+        page_size (int): Rows fetched per query
+
+    Returns:
+        Iterator[Dict]: Records, database by database and table by table;
+        "database" is the file name
+
+    Raises:
+        ValueError: A requested table is in none of the databases
+    """
+    paths = [databases] if isinstance(databases, (str, os.PathLike)) else list(databases)
+    with ExitStack() as stack:
+        plan = []
+        for path in paths:
+            uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+            connection = stack.enter_context(closing(sqlite3.connect(uri, uri=True)))
+            plan.append([Path(path).name, connection, list_tables(connection)])
+
+        available = {table for _, _, tables in plan for table in tables}
+        missing = [table for table in datasets or [] if table not in available]
+        if missing:
+            raise ValueError(f"{', '.join(str(path) for path in paths)} "
+                             f"{'has' if len(paths) == 1 else 'have'} no table {', '.join(missing)} "
+                             f"(tables: {', '.join(sorted(available)) or 'none'})")
+
+        for entry in plan:
+            name, connection, tables = entry
+            selected = [table for table in dict.fromkeys(datasets) if table in tables] if datasets else tables
+            if user_id is not None:
+                shared = [table for table in selected if USER_COLUMN not in _columns(connection, table)]
+                if shared:
+                    print(f"⚠️ Skipping {name} tables without a {USER_COLUMN} column: {', '.join(shared)}",
+                          file=sys.stderr)
+                selected = [table for table in selected if table not in shared]
+            entry[2] = selected
+        # The connections now belong to the generator
+        stack.pop_all()
+    return _export_tables(plan, user_id, page_size)
+
+
+def _export_tables(plan, user_id, page_size) -> Iterator[Dict]:
+    with ExitStack() as stack:
+        for _, connection, _ in plan:
+            stack.enter_context(closing(connection))
+        for name, connection, tables in plan:
+            for table in tables:
+                for record in export_rows(connection, table, user_id, page_size):
+                    yield {"database": name, "dataset": table, "record": record}
+
+
+def _open_output(path, compress: bool):
+    if str(path) == "-":
+        return sys.stdout if not compress else gzip.open(sys.stdout.buffer, "wt", encoding="utf-8")
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def write_jsonl(records: Iterator[Dict], path, compress: Optional[bool] = None) -> Dict:
+    """
+    Write records as JSONL, one line at a time
+
+    Args:
+        records: Objects to write
+        path: Output file, or "-" for stdout
+        compress (bool): gzip the output (default: when the path ends in .gz)
+
+    Returns:
+        Dict: Records written per dataset ("<database>/<dataset>" when
+        records name their database), seconds and records per second
+    """
+    if compress is None:
+        compress = str(path).endswith(".gz")
+    counts = {}
+    start = time.perf_counter()
+    output = _open_output(path, compress)
+    try:
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            dataset = record.get("dataset")
+            if "database" in record:
+                dataset = f"{record['database']}/{dataset}"
+            counts[dataset] = counts.get(dataset, 0) + 1
+    finally:
+        if output is sys.stdout:
+            output.flush()
+        else:
+            output.close()
+    seconds = time.perf_counter() - start
+    total = sum(counts.values())
+    return {
+        "records": counts,
+        "seconds": round(seconds, 3),
+        "records_per_second": round(total / seconds) if seconds else total
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export OM AI data as JSONL")
+    parser.add_argument("output", help="Output file (.gz to compress) or - for stdout")
+    parser.add_argument("--user", help="Only this user's rows")
+    parser.add_argument("--tables", "--datasets", dest="datasets", nargs="*",
+                        help="Tables to export (default: every table in the database)")
+    parser.add_argument("--database", dest="databases", action="append",
+                        help="SQLite database, repeatable (default: OM_DATABASE_PATH or the "
+                             "database manager's file and the other .db files beside it)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Rows per query")
+    parser.add_argument("--gzip", action="store_true", default=None, help="Compress the output")
+    args = parser.parse_args(argv)
+
+    databases = args.databases or database_paths()
+    if not databases:
+        parser.error("no database: pass --database or set OM_DATABASE_PATH")
+    try:
+        records = export_datasets(databases, args.datasets, args.user, args.page_size)
+    except (ValueError, sqlite3.Error) as e:
+        parser.error(str(e))
+    report = write_jsonl(records, args.output, args.gzip)
+    print(f"✅ Exported {report['records']} in {report['seconds']}s "
+          f"({report['records_per_second']} records/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
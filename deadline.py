@@ -0,0 +1,68 @@
+"""
+Request Deadlines for OM AI
+Carries a per-request time budget from handle_command params into plugin calls
+"""
+
+import contextvars
+import time
+from typing import Optional
+
+# Absolute deadline on the time.monotonic() clock
+DEADLINE_PARAM = "deadline"
+# Relative budget in seconds, converted to a deadline on arrival
+TIMEOUT_PARAM = "timeout"
+
+_current_deadline = contextvars.ContextVar("om_request_deadline", default=None)
+
+
+def deadline_after(seconds: float) -> float:
+    """Deadline value for params, ``seconds`` from now"""
+    return time.monotonic() + seconds
+
+
+def get_deadline(params: dict) -> Optional[float]:
+    """
+    Read the request deadline from command params
+
+    Args:
+        params (dict): Command parameters, optionally holding
+            ``deadline`` (monotonic time) or ``timeout`` (seconds)
+
+    Returns:
+        Optional[float]: Monotonic deadline, or None if the request is unbounded
+    """
+    deadline = params.get(DEADLINE_PARAM)
+    if deadline is not None:
+        return float(deadline)
+    timeout = params.get(TIMEOUT_PARAM)
+    if timeout is not None:
+        deadline = deadline_after(float(timeout))
+        params[DEADLINE_PARAM] = deadline
+        return deadline
+    return None
+
+
+def set_current_deadline(deadline: Optional[float]):
+    """Make ``deadline`` visible to remaining_budget(); returns a reset token"""
+    return _current_deadline.set(deadline)
+
+
+def reset_current_deadline(token):
+    """Restore the deadline that was active before set_current_deadline()"""
+    _current_deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """
+    Seconds left for the plugin call currently running
+
+    Plugins can call this to cut their own work short (fewer results,
+    smaller timeouts on outgoing requests) instead of being abandoned.
+
+    Returns:
+        Optional[float]: Remaining seconds (never negative), or None if unbounded
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
@@ -0,0 +1,497 @@
+"""
+Expense Aggregates for OM AI
+Running expense totals per day, per month and overall, each split by
+category, updated as expenses are added so a summary never rescans history
+
+Amounts are kept in integer cents, so buckets add up exactly. A summary
+for any period is composed from whole-month buckets plus the day buckets
+at its edges: at most a year's months and a month's days are read, however
+many years of expenses exist.
+
+Buckets only cover expenses recorded through handle_command. ``rebuild``
+seeds them from the expense table once (and repairs them later); until
+then expense_summary keeps asking the daily life manager. Replies keep
+the daily life manager's own layout: the first get_expense_summary reply
+after seeding is matched field by field against the buckets (learn_layout),
+and the buckets only answer once every field of that reply is accounted
+for. Periods period_range() does not know always go to the plugin.
+
+Buckets need a file to outlive the process: set OM_EXPENSE_AGGREGATES
+(e.g. next to the database in the user's data directory) before rebuilding.
+
+    python -m <package>.expense_aggregates rebuild
+    python -m <package>.expense_aggregates check
+    python -m <package>.expense_aggregates summary --period year
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .knowledge_ingest import get_database_path
+
+# SQLite file the buckets live in (OM_EXPENSE_AGGREGATES; unset or empty
+# keeps them in memory for this process only)
+DEFAULT_AGGREGATES_PATH = os.environ.get("OM_EXPENSE_AGGREGATES") or None
+
+# Expense table read by rebuild/check; the first date column found is used
+EXPENSE_TABLE = "expenses"
+EXPENSE_DATE_COLUMNS = ("date", "expense_date", "created_at", "timestamp")
+
+DEFAULT_CATEGORY = "other"
+MAX_REPORTED_MISMATCHES = 20
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS expense_buckets (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    category TEXT NOT NULL,
+    total_cents INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (granularity, bucket, category)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS expense_aggregates_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+UPSERT_SQL = """
+INSERT INTO expense_buckets (granularity, bucket, category, total_cents, count)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (granularity, bucket, category) DO UPDATE SET
+    total_cents = total_cents + excluded.total_cents,
+    count = count + excluded.count
+"""
+
+
+def to_cents(amount) -> int:
+    return int(round(float(amount) * 100))
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    # "2024-05-01", "2024-05-01 10:30:00" and "2024-05-01T10:30:00" all start with the date
+    return date.fromisoformat(str(value).strip()[:10])
+
+
+def bucket_keys(expense_date: date) -> List[Tuple[str, str]]:
+    """(granularity, bucket) pairs an expense on this date is added to"""
+    return [("day", expense_date.isoformat()),
+            ("month", expense_date.strftime("%Y-%m")),
+            ("all", "")]
+
+
+def period_range(period: str, today: date = None) -> Optional[Tuple[date, date]]:
+    """
+    First and last day of a named period, None for all time
+
+    Args:
+        period (str): "today", "yesterday", "week" (last 7 days), "month",
+            "year" (calendar, to date), "all", "YYYY-MM" or "YYYY-MM-DD"
+        today (date): Reference day (default: date.today())
+
+    Raises:
+        ValueError: Unknown period
+    """
+    today = today or date.today()
+    period = (period or "month").strip().lower()
+    if period == "all":
+        return None
+    if period == "today":
+        return today, today
+    if period == "yesterday":
+        day = today - timedelta(days=1)
+        return day, day
+    if period == "week":
+        return today - timedelta(days=6), today
+    if period == "month":
+        return today.replace(day=1), today
+    if period == "year":
+        return today.replace(month=1, day=1), today
+    if len(period) == 7:
+        start = date.fromisoformat(period + "-01")
+        return start, _month_end(start)
+    day = date.fromisoformat(period)
+    return day, day
+
+
+def supports_period(period) -> bool:
+    """True if period_range() understands the period (the buckets can answer it)"""
+    try:
+        period_range(period)
+    except (AttributeError, ValueError):
+        return False
+    return True
+
+
+def _month_end(day: date) -> date:
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def compose_buckets(start: date, end: date) -> Tuple[List[str], List[str]]:
+    """
+    Month and day buckets that exactly cover start..end
+
+    Whole calendar months are read from their month bucket, the partial
+    months at either edge day by day.
+    """
+    months, days = [], []
+    cursor = start
+    while cursor <= end:
+        month_end = _month_end(cursor)
+        if cursor.day == 1 and month_end <= end:
+            months.append(cursor.strftime("%Y-%m"))
+            cursor = month_end + timedelta(days=1)
+        else:
+            days.append(cursor.isoformat())
+            cursor += timedelta(days=1)
+    return months, days
+
+
+class ExpenseAggregates:
+    """Day, month and all-time expense buckets per category in SQLite"""
+
+    def __init__(self, path=DEFAULT_AGGREGATES_PATH):
+        """
+        Args:
+            path: SQLite file for the buckets; empty or ":memory:" keeps
+                them in this process
+        """
+        self.path = str(path) if path else ":memory:"
+        self.recorded = 0
+        self.summaries = 0
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A forked worker must not reuse the parent's connection
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._connection.executescript(SCHEMA_SQL)
+            self._pid = os.getpid()
+        return self._connection
+
+    def record(self, amount, category: str = None, when=None) -> None:
+        """
+        Add one expense to its day, month and all-time buckets
+
+        Args:
+            amount: Expense amount
+            category (str): Expense category (default: DEFAULT_CATEGORY)
+            when: Date or ISO date string of the expense (default: today)
+        """
+        cents = to_cents(amount)
+        expense_date = _to_date(when) if when is not None else date.today()
+        category = str(category or DEFAULT_CATEGORY)
+        rows = [(granularity, bucket, category, cents, 1)
+                for granularity, bucket in bucket_keys(expense_date)]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(UPSERT_SQL, rows)
+            self.recorded += 1
+
+    def is_seeded(self) -> bool:
+        """True once rebuild() has loaded the expense history"""
+        return self._meta("rebuilt_at") is not None
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM expense_aggregates_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def learn(self, period: str, plugin_result) -> bool:
+        """
+        Learn the plugin's reply layout from one of its get_expense_summary results
+
+        Args:
+            period (str): Period the plugin was asked for
+            plugin_result: Its reply
+
+        Returns:
+            bool: True if the reply matched the buckets and its layout was kept
+        """
+        layout = learn_layout(plugin_result, self.summary(period))
+        if layout is None:
+            return False
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO expense_aggregates_meta (key, value) VALUES ('layout', ?)",
+                    (json.dumps(layout),))
+        return True
+
+    def plugin_reply(self, period: str) -> Optional[Dict]:
+        """
+        The period's totals in the plugin's learned layout
+
+        Returns:
+            Dict: Reply like get_expense_summary's, or None while the buckets
+            are unseeded, no layout has been learned or the period is unknown
+        """
+        layout = self._meta("layout")
+        if layout is None or not self.is_seeded() or not supports_period(period):
+            return None
+        return build_reply(json.loads(layout), self.summary(period))
+
+    def summary(self, period: str = "month", today: date = None) -> Dict:
+        """
+        Totals for a period, composed from the buckets
+
+        Args:
+            period (str): See period_range()
+            today (date): Reference day (default: date.today())
+
+        Returns:
+            Dict: "period", "start", "end", "total", "count" and
+            "by_category" ({category: {"total", "count"}}, largest first)
+        """
+        date_range = period_range(period, today)
+        if date_range is None:
+            clauses, params = ["granularity = 'all'"], []
+            start = end = None
+        else:
+            start, end = date_range
+            months, days = compose_buckets(start, end)
+            clauses, params = [], []
+            for granularity, buckets in (("month", months), ("day", days)):
+                if buckets:
+                    placeholders = ", ".join("?" * len(buckets))
+                    clauses.append(f"(granularity = '{granularity}' AND bucket IN ({placeholders}))")
+                    params.extend(buckets)
+
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT category, SUM(total_cents), SUM(count) FROM expense_buckets "
+                f"WHERE {' OR '.join(clauses)} GROUP BY category ORDER BY 2 DESC",
+                params).fetchall()
+            self.summaries += 1
+
+        return {
+            "period": period,
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+            "total": sum(cents for _, cents, _ in rows) / 100,
+            "count": sum(count for _, _, count in rows),
+            "by_category": {category: {"total": cents / 100, "count": count}
+                            for category, cents, count in rows}
+        }
+
+    def rebuild(self, expenses: Iterable[Tuple]) -> Dict:
+        """
+        Replace every bucket with a full recompute
+
+        Args:
+            expenses: (date, category, amount) rows, e.g. from expense_rows()
+
+        Returns:
+            Dict: Expenses loaded and buckets written
+        """
+        buckets = recompute_buckets(expenses)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM expense_buckets")
+                connection.executemany(
+                    "INSERT INTO expense_buckets (granularity, bucket, category, total_cents, count) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [key + value for key, value in buckets.items()])
+                connection.execute(
+                    "INSERT OR REPLACE INTO expense_aggregates_meta (key, value) VALUES ('rebuilt_at', ?)",
+                    (datetime.now().isoformat(timespec="seconds"),))
+        expenses_loaded = sum(count for (granularity, _, _), (_, count) in buckets.items()
+                              if granularity == "all")
+        return {"expenses": expenses_loaded, "buckets": len(buckets)}
+
+    def check_consistency(self, expenses: Iterable[Tuple]) -> Dict:
+        """
+        Compare the stored buckets with a full recompute
+
+        Args:
+            expenses: (date, category, amount) rows, e.g. from expense_rows()
+
+        Returns:
+            Dict: "consistent", buckets checked and the first mismatches as
+            {"bucket", "stored", "expected"} (totals in cents, and counts)
+        """
+        expected = recompute_buckets(expenses)
+        with self._lock:
+            stored = {(granularity, bucket, category): (cents, count)
+                      for granularity, bucket, category, cents, count in self._connect().execute(
+                          "SELECT granularity, bucket, category, total_cents, count FROM expense_buckets")}
+        mismatches = [key for key in sorted(set(expected) | set(stored))
+                      if expected.get(key) != stored.get(key)]
+        return {
+            "consistent": not mismatches,
+            "buckets_checked": len(set(expected) | set(stored)),
+            "mismatches": len(mismatches),
+            "first_mismatches": [{"bucket": list(key), "stored": stored.get(key),
+                                  "expected": expected.get(key)}
+                                 for key in mismatches[:MAX_REPORTED_MISMATCHES]]
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            connection = self._connect()
+            buckets = dict(connection.execute(
+                "SELECT granularity, COUNT(*) FROM expense_buckets GROUP BY granularity").fetchall())
+            rebuilt_at = connection.execute(
+                "SELECT value FROM expense_aggregates_meta WHERE key = 'rebuilt_at'").fetchone()
+            return {
+                "path": self.path,
+                "buckets": buckets,
+                "rebuilt_at": rebuilt_at[0] if rebuilt_at else None,
+                "recorded": self.recorded,
+                "summaries": self.summaries
+            }
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _summary_fields(value, summary: Dict) -> List[str]:
+    """summary() fields a reply value equals"""
+    fields = []
+    if value == summary["period"]:
+        fields.append("period")
+    if _is_number(value) and abs(value - summary["total"]) < 0.005:
+        fields.append("total")
+    if _is_number(value) and value == summary["count"]:
+        fields.append("count")
+    if isinstance(value, dict) and all(_is_number(total) for total in value.values()) and {
+            category: round(total, 2) for category, total in value.items()} == {
+            category: totals["total"] for category, totals in summary["by_category"].items()}:
+        fields.append("category_totals")
+    return fields
+
+
+def learn_layout(plugin_result, summary: Dict) -> Optional[List]:
+    """
+    Map a get_expense_summary reply onto summary() fields
+
+    Every value must equal exactly one field (period, total, count or the
+    {category: total} map), or be a bool or None, which is kept as is.
+    Anything else (averages, dates, messages) cannot be derived from the
+    buckets, so such replies have no usable layout.
+
+    Args:
+        plugin_result: The plugin's reply
+        summary (Dict): summary() for the same period, read right after it
+
+    Returns:
+        List: [key, "field", name] / [key, "value", constant] entries in
+        reply order, or None
+    """
+    if not isinstance(plugin_result, dict) or plugin_result.get("success") is False:
+        return None
+    layout = []
+    for key, value in plugin_result.items():
+        fields = _summary_fields(value, summary)
+        if len(fields) == 1:
+            layout.append([key, "field", fields[0]])
+        elif not fields and (value is None or isinstance(value, bool)):
+            layout.append([key, "value", value])
+        else:
+            return None
+    if ["field", "total"] not in [entry[1:] for entry in layout]:
+        return None
+    return layout
+
+
+def build_reply(layout: List, summary: Dict) -> Dict:
+    """A summary() result in a layout from learn_layout()"""
+    fields = {
+        "period": summary["period"],
+        "total": summary["total"],
+        "count": summary["count"],
+        "category_totals": {category: totals["total"]
+                            for category, totals in summary["by_category"].items()},
+    }
+    return {key: fields[value] if kind == "field" else value for key, kind, value in layout}
+
+
+def recompute_buckets(expenses: Iterable[Tuple]) -> Dict[Tuple[str, str, str], Tuple[int, int]]:
+    """Full recompute: (granularity, bucket, category) -> (total cents, count)"""
+    buckets = {}
+    for when, category, amount in expenses:
+        cents = to_cents(amount)
+        category = str(category or DEFAULT_CATEGORY)
+        for granularity, bucket in bucket_keys(_to_date(when)):
+            key = (granularity, bucket, category)
+            total, count = buckets.get(key, (0, 0))
+            buckets[key] = (total + cents, count + 1)
+    return buckets
+
+
+def expense_rows(database_path, table: str = EXPENSE_TABLE) -> Iterator[Tuple]:
+    """
+    Stream (date, category, amount) rows from the daily life manager's expense table
+
+    Raises:
+        ValueError: The table has no amount column or no date column
+    """
+    uri = f"{Path(database_path).resolve().as_uri()}?mode=ro"
+    with closing(sqlite3.connect(uri, uri=True)) as connection:
+        columns = [row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')]
+        date_column = next((column for column in EXPENSE_DATE_COLUMNS if column in columns), None)
+        if "amount" not in columns or date_column is None:
+            raise ValueError(f"{table} needs an amount column and one of {EXPENSE_DATE_COLUMNS}")
+        category = '"category"' if "category" in columns else "NULL"
+        yield from connection.execute(
+            f'SELECT "{date_column}", {category}, amount FROM "{table}" '
+            f'WHERE amount IS NOT NULL AND "{date_column}" IS NOT NULL')
+
+
+# Create global instance
+expense_aggregates = ExpenseAggregates()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain OM AI expense aggregates")
+    parser.add_argument("action", choices=("rebuild", "check", "summary", "stats"))
+    parser.add_argument("--period", default="month", help="Period for summary (default: month)")
+    parser.add_argument("--database", help="SQLite database with the expense table "
+                                           "(default: OM_DATABASE_PATH or the database manager's)")
+    parser.add_argument("--table", default=EXPENSE_TABLE, help="Expense table")
+    args = parser.parse_args(argv)
+
+    if args.action == "summary":
+        print(json.dumps(expense_aggregates.summary(args.period), indent=2))
+        return
+    if args.action == "stats":
+        print(json.dumps(expense_aggregates.get_stats(), indent=2))
+        return
+
+    database_path = args.database or get_database_path()
+    if not database_path:
+        parser.error("no database: pass --database or set OM_DATABASE_PATH")
+    if args.action == "rebuild" and expense_aggregates.path == ":memory:":
+        parser.error("OM_EXPENSE_AGGREGATES is not set: rebuilt buckets would be lost on exit")
+    rows = expense_rows(database_path, args.table)
+    if args.action == "rebuild":
+        report = expense_aggregates.rebuild(rows)
+        print(f"✅ Rebuilt {report['buckets']} buckets from {report['expenses']} expenses")
+    else:
+        report = expense_aggregates.check_consistency(rows)
+        print(json.dumps(report, indent=2))
+        if not report["consistent"]:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
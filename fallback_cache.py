@@ -0,0 +1,76 @@
+"""
+Fallback Cache for OM AI
+Bounded LRU of normalized utterances already known to match no routing
+rule, so repeats (ASR retries, identical chat lines) skip the rule scan
+
+Each matcher owns its cache, and reloading the routing tables builds a new
+matcher, so stale entries never outlive the tables they were computed from.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+FALLBACK_CACHE_SIZE = 4096
+
+# Longer utterances are rarely repeated verbatim; not worth the memory
+MAX_CACHED_LENGTH = 512
+
+_MISSING = object()
+
+
+class FallbackCache:
+    """Thread-safe LRU of known rule misses, with optional stored params"""
+
+    def __init__(self, maxsize: int = FALLBACK_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Stored value for a known miss
+
+        Returns:
+            The value passed to add(), or ``default`` when the utterance is
+            not known to miss
+        """
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def contains(self, key: Hashable) -> bool:
+        """True when ``key`` is a known miss (counted like lookup)"""
+        return self.lookup(key, _MISSING) is not _MISSING
+
+    def add(self, key: Hashable, value: Any = None):
+        """Remember that ``key`` matched no rule, evicting the oldest entry when full"""
+        if self.maxsize <= 0 or (isinstance(key, str) and len(key) > MAX_CACHED_LENGTH):
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,318 @@
+"""
+Intent Classifier for OM AI
+Compact local classifier consulted before the chat_ai fallback: hashed word
+and character n-gram features feeding a linear softmax model stored as
+NumPy arrays. Train it offline from the intent spec and logged traffic:
+
+    python -m <package>.intent_classifier [--traffic routed.jsonl ...]
+
+NumPy is optional; without it (or without a trained model file) the
+router simply keeps its rule-based fallback.
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from pathlib import Path
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .intent_engine import load_spec
+
+MODEL_FORMAT_VERSION = 1
+
+DEFAULT_MODEL_PATH = Path(os.environ.get(
+    "OM_INTENT_MODEL", Path(__file__).parent / "intent_classifier.npz"))
+
+# Hashed feature space; collisions are rare for a vocabulary of this size
+FEATURE_DIM = 1 << 14
+CHAR_NGRAM = 3
+
+# Share of each intent's examples kept out of training to report accuracy
+HOLDOUT_FRACTION = 0.2
+
+
+def extract_features(text: str, dim: int = FEATURE_DIM) -> List[int]:
+    """
+    Hashed feature indices for an utterance
+
+    Word unigrams and bigrams plus character trigrams of each padded word,
+    so spelling variants ("kharcha"/"kharche") share most features.
+
+    Args:
+        text (str): Utterance
+        dim (int): Size of the hashed feature space
+
+    Returns:
+        List[int]: Feature indices (duplicates kept, they act as counts)
+    """
+    words = text.lower().split()
+    grams = ["w:" + word for word in words]
+    grams += [f"b:{first} {second}" for first, second in zip(words, words[1:])]
+    for word in words:
+        padded = f"<{word}>"
+        grams += ["c:" + padded[i:i + CHAR_NGRAM] for i in range(len(padded) - CHAR_NGRAM + 1)]
+    return [zlib.crc32(gram.encode("utf-8")) % dim for gram in grams]
+
+
+class IntentClassifier:
+    """Linear softmax model over hashed n-gram features"""
+
+    def __init__(self, weights, bias, labels: List[str]):
+        """
+        Args:
+            weights: float32 array of shape (feature_dim, len(labels))
+            bias: float32 array of shape (len(labels),)
+            labels (List[str]): Intent for each output column
+        """
+        self.weights = weights
+        self.bias = bias
+        self.labels = list(labels)
+        self.dim = weights.shape[0]
+
+    def predict_proba(self, text: str):
+        """Probability per label for one utterance"""
+        indices = extract_features(text, self.dim)
+        logits = self.weights[indices].sum(axis=0) + self.bias if indices else self.bias.copy()
+        logits = np.exp(logits - logits.max())
+        return logits / logits.sum()
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """
+        Most likely intent for an utterance
+
+        Returns:
+            Tuple[str, float]: (intent, probability)
+        """
+        probabilities = self.predict_proba(text)
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def save(self, path=None):
+        """Write the model as a compressed .npz archive"""
+        path = Path(path or DEFAULT_MODEL_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez_compressed(temp_path, weights=self.weights, bias=self.bias,
+                            labels=np.array(self.labels), version=MODEL_FORMAT_VERSION)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path=None) -> "IntentClassifier":
+        """Read a model written by save()"""
+        with np.load(path or DEFAULT_MODEL_PATH) as archive:
+            if int(archive["version"]) != MODEL_FORMAT_VERSION:
+                raise ValueError(f"Unsupported intent model version {int(archive['version'])}")
+            return cls(archive["weights"], archive["bias"], [str(label) for label in archive["labels"]])
+
+
+def training_examples(spec: Dict = None, traffic_paths: Iterable = ()) -> List[Tuple[str, str]]:
+    """
+    Labeled utterances for training
+
+    Every rule contributes its trigger phrases and examples, the fallback
+    rule its examples. Traffic files are JSONL with "text" and "intent"
+    fields, as written by IntentRouter's traffic log.
+
+    Returns:
+        List[Tuple[str, str]]: (text, intent) pairs
+    """
+    spec = spec or load_spec()
+    examples = []
+    for rule in spec["rules"] + [spec["fallback"]]:
+        groups = rule.get("all") or ([rule["any"]] if "any" in rule else [])
+        if len(groups) > 1:
+            # Multi-group rules only match with one phrase from each group
+            phrases = [" ".join(combo) for combo in zip(*groups)]
+        else:
+            phrases = groups[0] if groups else []
+        examples += [(text, rule["intent"]) for text in list(phrases) + rule.get("examples", [])]
+
+    for traffic_path in traffic_paths:
+        with open(traffic_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    examples.append((record["text"], record["intent"]))
+                except (ValueError, KeyError, TypeError):
+                    continue
+    return examples
+
+
+def split_examples(examples: List[Tuple[str, str]], fraction: float = HOLDOUT_FRACTION,
+                   seed: int = 0) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Stratified train/held-out split
+
+    Each intent gives up round(fraction x its count) examples, but always
+    keeps at least one for training, so rare intents are still learned.
+
+    Args:
+        examples (List[Tuple[str, str]]): (text, intent) pairs
+        fraction (float): Share of each intent's examples to hold out
+        seed (int): Shuffle seed, fixed so reported accuracy is repeatable
+
+    Returns:
+        Tuple[List, List]: (training examples, held-out examples)
+    """
+    by_intent = {}
+    for example in examples:
+        by_intent.setdefault(example[1], []).append(example)
+
+    rng = random.Random(seed)
+    training, held_out = [], []
+    for intent in sorted(by_intent):
+        group = by_intent[intent]
+        rng.shuffle(group)
+        count = min(round(len(group) * fraction), len(group) - 1)
+        held_out += group[:count]
+        training += group[count:]
+    return training, held_out
+
+
+def evaluate(model: IntentClassifier, examples: List[Tuple[str, str]]) -> Dict:
+    """
+    Accuracy of a model on labeled examples
+
+    Returns:
+        Dict: "examples", "accuracy" and "balanced_accuracy" (mean recall
+        per intent, so a large intent cannot hide misses on small ones)
+    """
+    if not examples:
+        return {"examples": 0, "accuracy": 0.0, "balanced_accuracy": 0.0}
+    totals, correct = Counter(), Counter()
+    for text, intent in examples:
+        totals[intent] += 1
+        correct[intent] += model.predict(text)[0] == intent
+    return {
+        "examples": len(examples),
+        "accuracy": sum(correct.values()) / len(examples),
+        "balanced_accuracy": sum(correct[intent] / totals[intent] for intent in totals) / len(totals)
+    }
+
+
+def train(examples: List[Tuple[str, str]], epochs: int = 200, learning_rate: float = 0.5,
+          l2: float = 1e-4, dim: int = FEATURE_DIM, balanced: bool = True) -> IntentClassifier:
+    """
+    Fit the softmax model with full-batch gradient descent
+
+    Features stay sparse: each sample is a run of indices into the weight
+    matrix, so one epoch costs O(total features x labels).
+
+    Args:
+        examples (List[Tuple[str, str]]): (text, intent) pairs
+        epochs (int): Gradient steps
+        learning_rate (float): Step size
+        l2 (float): Weight decay, keeps probabilities from saturating
+        dim (int): Size of the hashed feature space
+        balanced (bool): Weight examples inversely to their intent's count,
+            so every intent carries the same total weight (google_search
+            has 64 examples, chat_ai only 3)
+
+    Returns:
+        IntentClassifier: Trained model
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required to train the intent classifier")
+    if not examples:
+        raise ValueError("No training examples")
+
+    labels = sorted({intent for _, intent in examples})
+    label_index = {label: i for i, label in enumerate(labels)}
+    features = [extract_features(text, dim) or [0] for text, _ in examples]
+    counts = np.array([len(indices) for indices in features])
+    indices = np.concatenate([np.array(f, dtype=np.int64) for f in features])
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    targets = np.zeros((len(examples), len(labels)), dtype=np.float32)
+    targets[np.arange(len(examples)), [label_index[intent] for _, intent in examples]] = 1.0
+    if balanced:
+        sizes = Counter(intent for _, intent in examples)
+        sample_weights = np.array([len(examples) / (len(labels) * sizes[intent])
+                                   for _, intent in examples], dtype=np.float32)
+    else:
+        sample_weights = np.ones(len(examples), dtype=np.float32)
+
+    weights = np.zeros((dim, len(labels)), dtype=np.float32)
+    bias = np.zeros(len(labels), dtype=np.float32)
+    scale = learning_rate / len(examples)
+
+    for _ in range(epochs):
+        logits = np.add.reduceat(weights[indices], offsets, axis=0) + bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        error = (probabilities - targets) * sample_weights[:, None]
+
+        gradient = np.zeros_like(weights)
+        np.add.at(gradient, indices, np.repeat(error, counts, axis=0))
+        weights -= scale * gradient + learning_rate * l2 * weights
+        bias -= scale * error.sum(axis=0)
+
+    return IntentClassifier(weights, bias, labels)
+
+
+_classifier = None
+_classifier_loaded = False
+_classifier_lock = threading.Lock()
+
+
+def get_classifier() -> Optional[IntentClassifier]:
+    """The trained model, loaded once; None without NumPy or a model file"""
+    global _classifier, _classifier_loaded
+    if not _classifier_loaded:
+        with _classifier_lock:
+            if not _classifier_loaded:
+                if np is not None and DEFAULT_MODEL_PATH.exists():
+                    try:
+                        _classifier = IntentClassifier.load()
+                    except (OSError, ValueError, KeyError) as e:
+                        print(f"⚠️ Could not load intent classifier {DEFAULT_MODEL_PATH}: {e}")
+                _classifier_loaded = True
+    return _classifier
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the OM AI local intent classifier")
+    parser.add_argument("--spec", help="Intent spec file (default: intents.json)")
+    parser.add_argument("--traffic", nargs="*", default=[],
+                        help="JSONL files of routed utterances with text and intent")
+    parser.add_argument("--output", default=str(DEFAULT_MODEL_PATH), help="Model file to write")
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--holdout", type=float, default=HOLDOUT_FRACTION,
+                        help="Share of each intent's examples held out to report accuracy")
+    parser.add_argument("--unbalanced", action="store_true",
+                        help="Do not weight intents by their number of examples")
+    args = parser.parse_args(argv)
+
+    examples = training_examples(load_spec(args.spec), args.traffic)
+    training, held_out = split_examples(examples, args.holdout)
+    scores = evaluate(train(training, epochs=args.epochs, balanced=not args.unbalanced), held_out)
+
+    # The shipped model learns from every example once accuracy is measured
+    start = time.perf_counter()
+    model = train(examples, epochs=args.epochs, balanced=not args.unbalanced)
+    train_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text, _ in examples:
+        model.predict(text)
+    predict_us = (time.perf_counter() - start) / len(examples) * 1e6
+
+    model.save(args.output)
+    print(f"✅ Trained on {len(examples)} examples, {len(model.labels)} intents "
+          f"in {train_seconds:.2f}s; held-out accuracy {scores['accuracy']:.1%} "
+          f"(balanced {scores['balanced_accuracy']:.1%}) on {scores['examples']} examples, "
+          f"{predict_us:.0f} µs per prediction → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""
+Intent Engine for OM AI
+Compiles the declarative intent spec (intents.json) into the keyword matcher
+behind process_command, and hot-reloads it without restarting the process
+
+Each rule in the spec names an intent, the keyword groups that must match
+("any" is one group, "all" is a list of groups), an optional regex, an
+optional priority, constant params and slot rules. Rules are tried by
+descending priority, then in file order; the first match wins. Every
+decision is counted in the routing profile (routing_profile.py).
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .fallback_cache import FallbackCache
+from .routing_snapshot import load_compiled_patterns, pattern_section
+from .routing_profile import get_routing_profile
+from .slot_extractor import SlotExtractor
+from .transliteration import canonicalize
+from .utterance import Utterance, as_utterance
+
+DEFAULT_SPEC_PATH = Path(os.environ.get(
+    "OM_INTENTS_FILE", Path(__file__).parent / "intents.json"))
+
+# Keyword match confidence: the whole utterance is a trigger phrase, every
+# group matched on word boundaries, or a group only matched inside a word
+EXACT_CONFIDENCE = 1.0
+WORD_CONFIDENCE = 0.9
+SUBSTRING_CONFIDENCE = 0.4
+
+# Letters that continue a word, Devanagari signs included
+_WORD_CHAR = r'[\w\u0900-\u097F]'
+
+
+def load_spec(path=None) -> Dict:
+    """Read and parse the intent spec file"""
+    with open(path or DEFAULT_SPEC_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Slot sources: source(slots, query, options) -> value or None.
+# ``slots.text`` is the lowercased utterance, ``query`` the Utterance.
+
+def _source_domain_word(slots, query, options):
+    for word in slots.text.split():
+        if "." in word and not word.startswith("."):
+            return word
+    return None
+
+
+def _source_word_after(slots, query, options):
+    words = slots.text.split()
+    if options["word"] in words:
+        idx = words.index(options["word"])
+        if idx + 1 < len(words):
+            return words[idx + 1]
+    return None
+
+
+def _source_words_after(slots, query, options):
+    words = slots.text.split()
+    if options["word"] in words:
+        return " ".join(words[words.index(options["word"]) + 1:])
+    return None
+
+
+def _source_first_word_not_in(slots, query, options):
+    excluded = set(options["words"])
+    for word in slots.text.split():
+        if word not in excluded:
+            return word.title() if options.get("title") else word
+    return None
+
+
+def _source_keyword_map(slots, query, options):
+    for keyword, value in options["map"]:
+        if keyword in slots.text:
+            return value
+    return None
+
+
+def _source_regex_group(slots, query, options):
+    match = re.search(options["pattern"], slots.text)
+    return match.group(options.get("group", 1)) if match else None
+
+
+SLOT_SOURCES = {
+    "utterance": lambda slots, query, options: query.text,
+    "query": lambda slots, query, options: slots.text,
+    "remainder": lambda slots, query, options: slots.remainder(),
+    "quoted": lambda slots, query, options: slots.quoted(),
+    "amount": lambda slots, query, options: slots.amount(),
+    "minutes": lambda slots, query, options: slots.minutes(),
+    "task_id": lambda slots, query, options: slots.task_id(),
+    "relative_time": lambda slots, query, options: slots.relative_time(),
+    "strip_words": lambda slots, query, options: slots.strip_words(options["words"]),
+    "description": lambda slots, query, options: slots.description(options.get("words", ())),
+    "domain_word": _source_domain_word,
+    "word_after": _source_word_after,
+    "words_after": _source_words_after,
+    "first_word_not_in": _source_first_word_not_in,
+    "keyword_map": _source_keyword_map,
+    "regex_group": _source_regex_group,
+}
+
+
+def _slot_value(slot: Dict, slots: SlotExtractor, query: Utterance):
+    """
+    Resolve one slot rule
+
+    Sources are tried in order and the first usable value wins; a value is
+    unusable when it is empty (zero too, unless "keep_zero") or shorter than
+    "min_length". Otherwise the slot's "default" is used, the slot is left
+    out when "optional", or the last source's raw value is kept.
+
+    Returns:
+        Tuple[bool, any]: (present, value)
+    """
+    sources = slot["from"] if isinstance(slot["from"], list) else [slot["from"]]
+    min_length = slot.get("min_length", 0)
+    value = None
+    for source in sources:
+        value = SLOT_SOURCES[source](slots, query, slot)
+        usable = value is not None and value != "" and (value != 0 or slot.get("keep_zero", False))
+        if usable and isinstance(value, str):
+            usable = len(value) >= min_length
+        if usable:
+            return True, value
+    if "default" in slot:
+        return True, slot["default"]
+    if slot.get("optional"):
+        return False, None
+    return True, value
+
+
+class CompiledRule:
+    """One spec rule with its keyword groups compiled to regexes"""
+
+    __slots__ = ("intent", "priority", "groups", "word_groups", "phrases", "trigger", "regex",
+                 "params", "slots", "needs_trigger", "keywords", "examples")
+
+    def __init__(self, rule: Dict, index: int, patterns: Dict[str, re.Pattern] = None):
+        """
+        Args:
+            rule (Dict): Rule from the spec
+            index (int): Position in the spec, for error messages
+            patterns (Dict[str, re.Pattern]): Precompiled regexes by source
+                (see matcher_pattern_sources); missing ones are compiled here
+        """
+        patterns = patterns or {}
+        self.intent = rule["intent"]
+        self.priority = rule.get("priority", 0)
+        raw_groups = _raw_groups(rule)
+        groups = _canonical_groups(rule)
+        self.groups = [_compile(_group_source(group), patterns) for group in groups]
+        self.word_groups = [_compile(_group_source(group, whole_words=True), patterns)
+                            for group in groups]
+        self.phrases = frozenset(phrase for group in groups for phrase in group)
+        self.keywords = sum(len(group) for group in groups)
+        # "remainder" and "description" cut out the first phrase of the first
+        # group that occurs; slots read the lowered text, so the trigger keeps
+        # the spec's spellings
+        self.trigger = [phrase.lower() for phrase in raw_groups[0]] if raw_groups else []
+        self.regex = _compile(rule["regex"], patterns) if "regex" in rule else None
+        self.params = rule.get("params", {})
+        self.slots = rule.get("slots", {})
+        self.examples = rule.get("examples", [])
+
+        sources = set()
+        for name, slot in self.slots.items():
+            for source in (slot["from"] if isinstance(slot["from"], list) else [slot["from"]]):
+                if source not in SLOT_SOURCES:
+                    raise ValueError(f"Rule {index} ({self.intent}): unknown slot source "
+                                     f"'{source}' for '{name}'")
+                sources.add(source)
+        self.needs_trigger = bool(sources & {"remainder", "description"})
+
+    def matches(self, text: str) -> bool:
+        return (all(group.search(text) for group in self.groups)
+                and (self.regex is None or self.regex.search(text) is not None))
+
+    def score(self, text: str) -> float:
+        """Keyword confidence for the rule, 0.0 when it does not match"""
+        if not self.matches(text):
+            return 0.0
+        if text in self.phrases:
+            return EXACT_CONFIDENCE
+        if all(group.search(text) for group in self.word_groups):
+            return WORD_CONFIDENCE
+        return SUBSTRING_CONFIDENCE
+
+    def build_params(self, slots: SlotExtractor, query: Utterance) -> Dict:
+        if self.needs_trigger:
+            slots.match(self.trigger)
+        params = {}
+        for name, slot in self.slots.items():
+            present, value = _slot_value(slot, slots, query)
+            if present:
+                params[name] = value
+        params.update(self.params)
+        return params
+
+
+def _raw_groups(rule: Dict) -> List[List[str]]:
+    return rule.get("all") or ([rule["any"]] if "any" in rule else [])
+
+
+def _canonical_groups(rule: Dict) -> List[List[str]]:
+    # Keywords are matched in canonical spelling, so script variants collapse
+    return [list(dict.fromkeys(canonicalize(phrase.lower()) for phrase in group))
+            for group in _raw_groups(rule)]
+
+
+def _compile(source: str, patterns: Dict[str, re.Pattern]) -> re.Pattern:
+    pattern = patterns.get(source)
+    return pattern if pattern is not None else re.compile(source)
+
+
+def _group_source(phrases: List[str], whole_words: bool = False) -> str:
+    """
+    One keyword group as a single alternation
+
+    A plain search is a substring test, like ``phrase in text``; with
+    ``whole_words`` a phrase must start and end on a word boundary (a plural
+    "s"/"es" is allowed).
+    """
+    if not phrases:
+        raise ValueError("Keyword groups must not be empty")
+    alternation = "|".join(re.escape(phrase) for phrase in phrases)
+    if whole_words:
+        return rf"(?<!{_WORD_CHAR})(?:{alternation})(?:e?s)?(?!{_WORD_CHAR})"
+    return alternation
+
+
+def matcher_pattern_sources(spec: Dict) -> List[str]:
+    """Every regex an IntentMatcher compiles for ``spec``, in build order"""
+    sources = []
+    for rule in spec["rules"] + [spec["fallback"]]:
+        for group in _canonical_groups(rule):
+            sources.append(_group_source(group))
+            sources.append(_group_source(group, whole_words=True))
+        if "regex" in rule:
+            sources.append(rule["regex"])
+    return list(dict.fromkeys(sources))
+
+
+def matcher_snapshot_sections(spec: Dict) -> List[Tuple]:
+    """Routing tables persisted by routing_snapshot: (name, tables, compiler, version)"""
+    return [pattern_section("intent_matcher", matcher_pattern_sources(spec))]
+
+
+class IntentMatcher:
+    """Keyword matcher compiled from the intent spec"""
+
+    def __init__(self, spec: Dict):
+        """
+        Args:
+            spec (Dict): Parsed intent spec
+        """
+        start = time.perf_counter()
+        self.version = spec.get("version", 1)
+        # Regexes come back from the routing snapshot instead of being recompiled
+        patterns = load_compiled_patterns("intent_matcher", matcher_pattern_sources(spec))
+        rules = [CompiledRule(rule, index, patterns) for index, rule in enumerate(spec["rules"])]
+        # sorted() is stable, so equal priorities keep file order
+        self.rules = sorted(rules, key=lambda rule: -rule.priority)
+        self.fallback = CompiledRule(spec["fallback"], len(rules), patterns)
+        self.rules_by_intent = {}
+        for rule in self.rules:
+            self.rules_by_intent.setdefault(rule.intent, rule)
+
+        # Canonical utterances no rule matches; dropped with the matcher on reload
+        self.fallback_cache = FallbackCache()
+        self.compile_seconds = time.perf_counter() - start
+
+    def match(self, query: str, record: bool = True) -> Tuple[str, Dict]:
+        """
+        Route an utterance to an intent
+
+        Args:
+            query (str): User's natural language query (str or Utterance)
+            record (bool): Count the decision in the routing profile
+
+        Returns:
+            tuple: (intent, parameters)
+        """
+        query = as_utterance(query)
+        canonical = query.canonical
+        checks = 0
+        if not self.fallback_cache.contains(canonical):
+            for checks, rule in enumerate(self.rules, 1):
+                if rule.matches(canonical):
+                    if record:
+                        get_routing_profile().record(rule.intent, checks)
+                    return rule.intent, rule.build_params(SlotExtractor(query.lowered, query.tokens), query)
+            self.fallback_cache.add(canonical)
+        if record:
+            get_routing_profile().record(self.fallback.intent, checks)
+        return self.match_fallback(query)
+
+    def match_fallback(self, query: str) -> Tuple[str, Dict]:
+        """The spec's fallback intent for an utterance no rule matched"""
+        query = as_utterance(query)
+        return self.fallback.intent, self.fallback.build_params(
+            SlotExtractor(query.lowered, query.tokens), query)
+
+    def match_scored(self, query: str, threshold: float = WORD_CONFIDENCE) -> Optional[Tuple[str, Dict, float]]:
+        """
+        Route an utterance by keyword confidence instead of first match
+
+        The first rule scoring at least ``threshold`` wins. A rule that only
+        matches inside another word ("om" in "complete") no longer shadows
+        later rules; it is returned only when nothing scores higher.
+
+        Args:
+            query (str): User's natural language query (str or Utterance)
+            threshold (float): Confidence that stops the scan
+
+        Returns:
+            Optional[tuple]: (intent, parameters, confidence), or None when
+            no rule matches
+        """
+        query = as_utterance(query)
+        canonical = query.canonical
+        if self.fallback_cache.contains(canonical):
+            return None
+        best_rule, best_confidence = None, 0.0
+        checks = 0
+        for rule in self.rules:
+            checks += 1
+            confidence = rule.score(canonical)
+            if confidence > best_confidence:
+                best_rule, best_confidence = rule, confidence
+                if confidence >= threshold:
+                    break
+        if best_rule is None:
+            self.fallback_cache.add(canonical)
+            return None
+        get_routing_profile().record(best_rule.intent, checks)
+        slots = SlotExtractor(query.lowered, query.tokens)
+        return best_rule.intent, best_rule.build_params(slots, query), best_confidence
+
+    def params_for(self, intent: str, query: str) -> Optional[Dict]:
+        """Slot values for an intent chosen by other means (e.g. a classifier)"""
+        rule = self.rules_by_intent.get(intent)
+        if rule is None:
+            return None
+        query = as_utterance(query)
+        return rule.build_params(SlotExtractor(query.lowered, query.tokens), query)
+
+    def check_examples(self) -> List[str]:
+        """Examples in the spec that do not route to their own rule's intent"""
+        errors = []
+        for rule in self.rules + [self.fallback]:
+            for example in rule.examples:
+                intent, _ = self.match(example, record=False)
+                if intent != rule.intent:
+                    errors.append(f"'{example}' routed to {intent}, expected {rule.intent}")
+        return errors
+
+    def get_stats(self) -> Dict:
+        """Compile time and size of the matcher"""
+        compiled = [group for rule in self.rules for group in rule.groups]
+        compiled += [rule.regex for rule in self.rules if rule.regex is not None]
+        return {
+            "version": self.version,
+            "rules": len(self.rules),
+            "intents": len({rule.intent for rule in self.rules} | {self.fallback.intent}),
+            "keywords": sum(rule.keywords for rule in self.rules),
+            "regexes": len(compiled),
+            "fallback_cache": self.fallback_cache.get_stats(),
+            "size_bytes": sum(sys.getsizeof(pattern) + sys.getsizeof(pattern.pattern)
+                              for pattern in compiled),
+            "compile_ms": round(self.compile_seconds * 1000, 2)
+        }
+
+
+_matcher: Optional[IntentMatcher] = None
+_matcher_lock = threading.Lock()
+_reload_executor = None
+
+
+def get_matcher() -> IntentMatcher:
+    """The live matcher, compiled from the spec file on first use"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = IntentMatcher(load_spec())
+    return _matcher
+
+
+def _reload(path) -> Dict:
+    global _matcher
+    from . import nlp_processor_fixed
+
+    start = time.perf_counter()
+    try:
+        spec = load_spec(path)
+        matcher = IntentMatcher(spec)
+        errors = matcher.check_examples()
+        if errors:
+            return {"reloaded": False, "errors": errors, "matcher": matcher.get_stats()}
+        processor = nlp_processor_fixed.EnhancedNLPProcessor(spec["patterns"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError, re.error) as e:
+        # Unreadable file, bad JSON, missing keys or a bad regex: keep the live matcher
+        return {"reloaded": False,
+                "errors": [f"{path or DEFAULT_SPEC_PATH}: {type(e).__name__}: {e}"]}
+
+    # Plain reference swaps: requests in flight finish on the old objects
+    with _matcher_lock:
+        _matcher = matcher
+        nlp_processor_fixed.nlp_processor = processor
+
+    return {
+        "reloaded": True,
+        "errors": [],
+        "matcher": matcher.get_stats(),
+        "regex_patterns": sum(len(patterns) for patterns in spec["patterns"].values()),
+        "total_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+
+
+def reload_intents(path=None) -> Future:
+    """
+    Recompile the intent spec in the background and swap it in atomically
+
+    The new matcher (and the EnhancedNLPProcessor built from the spec's
+    "patterns") is compiled off the request path; requests keep using the
+    current one until the swap. The spec's examples are routed first and the
+    reload is refused if any of them lands on the wrong intent; a spec that
+    cannot be read, parsed or compiled is refused the same way, and the
+    current matcher stays live.
+
+    Args:
+        path: Spec file (default: DEFAULT_SPEC_PATH)
+
+    Returns:
+        Future: Resolves to a report with "reloaded", "errors", the matcher's
+        compile time and size, and the total reload time
+    """
+    global _reload_executor
+    with _matcher_lock:
+        if _reload_executor is None:
+            # One worker, so overlapping reloads apply in call order
+            _reload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="intent-reload")
+    return _reload_executor.submit(_reload, path)
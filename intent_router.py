@@ -0,0 +1,191 @@
+"""
+Intent Router for OM AI
+One cascade over both NLP processors: the keyword matcher compiled from
+intents.json, then the EnhancedNLPProcessor regexes, then a fallback.
+Each stage stops the cascade once its confidence is high enough, so most
+utterances never reach the regex stage.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Tuple
+
+from . import nlp_processor_fixed
+from .intent_classifier import get_classifier
+from .intent_engine import WORD_CONFIDENCE, get_matcher
+from .utterance import as_utterance
+
+# Regex confidence: the pattern covers the whole utterance, matches on word
+# boundaries, or only matches inside a word ("hi" in "this")
+REGEX_FULL_CONFIDENCE = 0.95
+REGEX_WORD_CONFIDENCE = 0.75
+REGEX_SUBSTRING_CONFIDENCE = 0.35
+
+FALLBACK_CONFIDENCE = 0.0
+
+STAGES = ("keyword", "regex", "classifier", "fallback")
+
+# Confident decisions are appended here as classifier training data
+TRAFFIC_LOG_PATH = os.environ.get("OM_ROUTER_TRAFFIC_LOG")
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_" or '\u0900' <= char <= '\u097F'
+
+
+def _regex_confidence(text: str, match) -> float:
+    start, end = match.span()
+    if start == 0 and end == len(text):
+        return REGEX_FULL_CONFIDENCE
+    if ((start == 0 or not _is_word_char(text[start - 1]))
+            and (end == len(text) or not _is_word_char(text[end]))):
+        return REGEX_WORD_CONFIDENCE
+    return REGEX_SUBSTRING_CONFIDENCE
+
+
+class IntentRouter:
+    """Keyword -> regex -> fallback cascade with per-stage hit counters"""
+
+    def __init__(self, keyword_threshold: float = WORD_CONFIDENCE,
+                 regex_threshold: float = REGEX_WORD_CONFIDENCE, min_confidence: float = 0.5,
+                 classifier_threshold: float = 0.6, alternatives: int = 3,
+                 traffic_log: str = TRAFFIC_LOG_PATH):
+        """
+        Args:
+            keyword_threshold (float): Keyword confidence that skips the regex stage
+            regex_threshold (float): Regex confidence that beats a weaker keyword match
+            min_confidence (float): Below this the fallback stage answers
+            classifier_threshold (float): Classifier probability needed to
+                override the rule-based fallback
+            alternatives (int): Alternative intents listed on low-confidence turns
+            traffic_log (str): Optional JSONL file for confident decisions
+        """
+        self.keyword_threshold = keyword_threshold
+        self.regex_threshold = regex_threshold
+        self.min_confidence = min_confidence
+        self.classifier_threshold = classifier_threshold
+        self.alternatives = alternatives
+        self.traffic_log = traffic_log
+        self.hits = dict.fromkeys(STAGES, 0)
+        self.regex_runs = 0
+        self._lock = threading.Lock()
+
+    def route_with_details(self, query: str) -> Dict:
+        """
+        Route an utterance through the cascade
+
+        Args:
+            query (str): User's natural language query (str or Utterance)
+
+        Returns:
+            Dict: "intent", "params", "stage" that answered and "confidence";
+            below the keyword threshold also "alternatives", a ranked list
+            of (intent, score)
+        """
+        query = as_utterance(query)
+        matcher = get_matcher()
+        best = None
+        text = ""
+
+        keyword = matcher.match_scored(query, self.keyword_threshold)
+        if keyword:
+            intent, params, confidence = keyword
+            best = {"intent": intent, "params": params, "stage": "keyword", "confidence": confidence}
+
+        if best is None or best["confidence"] < self.keyword_threshold:
+            processor = nlp_processor_fixed.nlp_processor
+            text = query.normalized
+            regex = None
+            if text:
+                regex = processor.match_intent(text)
+                with self._lock:
+                    self.regex_runs += 1
+            if regex:
+                intent, match = regex
+                confidence = _regex_confidence(text, match)
+                if confidence >= self.regex_threshold and (best is None or confidence > best["confidence"]):
+                    best = {"intent": intent, "params": processor._extract_parameters(text, intent),
+                            "stage": "regex", "confidence": confidence}
+
+        if best is None or best["confidence"] < self.min_confidence:
+            best = self._classify(query, matcher)
+
+        if best is None:
+            intent, params = matcher.match_fallback(query)
+            best = {"intent": intent, "params": params, "stage": "fallback",
+                    "confidence": FALLBACK_CONFIDENCE}
+
+        if best["confidence"] < self.keyword_threshold and text:
+            # Low-confidence turn: offer the next best intents to disambiguate
+            best["alternatives"] = [
+                (intent, score) for intent, score in processor.rank_intents(text, self.alternatives + 1)
+                if intent != best["intent"]][:self.alternatives]
+
+        with self._lock:
+            self.hits[best["stage"]] += 1
+        if self.traffic_log and best["stage"] in ("keyword", "regex") \
+                and best["confidence"] >= self.keyword_threshold:
+            self._log_traffic(query, best["intent"])
+        best["confidence"] = round(best["confidence"], 2)
+        return best
+
+    def _classify(self, query: str, matcher):
+        """Classifier stage: a confident local prediction instead of the fallback"""
+        classifier = get_classifier()
+        if classifier is None or not query.strip():
+            return None
+        intent, probability = classifier.predict(query)
+        if probability < self.classifier_threshold or intent == matcher.fallback.intent:
+            return None
+        params = matcher.params_for(intent, query)
+        if params is None:
+            return None
+        return {"intent": intent, "params": params, "stage": "classifier", "confidence": probability}
+
+    def _log_traffic(self, query: str, intent: str):
+        record = json.dumps({"text": str(query), "intent": intent}, ensure_ascii=False)
+        try:
+            with self._lock, open(self.traffic_log, "a", encoding="utf-8") as f:
+                f.write(record + "\n")
+        except OSError:
+            pass
+
+    def route(self, query: str) -> Tuple[str, Dict]:
+        """Route an utterance; returns (intent, parameters) like process_command"""
+        result = self.route_with_details(query)
+        return result["intent"], result["params"]
+
+    def get_stats(self) -> Dict:
+        """Hits per stage, how often the regex stage had to run and the fallback caches"""
+        with self._lock:
+            total = sum(self.hits.values())
+            stats = {
+                "total": total,
+                "hits": dict(self.hits),
+                "hit_rate": {stage: round(hits / total, 3) if total else 0.0
+                             for stage, hits in self.hits.items()},
+                "regex_runs": self.regex_runs
+            }
+        stats["fallback_cache"] = {
+            "keyword": get_matcher().fallback_cache.get_stats(),
+            "regex": nlp_processor_fixed.nlp_processor.fallback_cache.get_stats()
+        }
+        return stats
+
+
+# Create global instance
+intent_router = IntentRouter()
+
+
+def route_command(query: str) -> Tuple[str, Dict]:
+    """
+    Route a query through the unified keyword/regex/fallback cascade
+
+    Args:
+        query (str): User's natural language query
+
+    Returns:
+        tuple: (intent, parameters)
+    """
+    return intent_router.route(query)
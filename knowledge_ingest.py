@@ -0,0 +1,300 @@
+"""
+Bulk Knowledge Ingestion for OM AI
+Streams a JSONL or CSV knowledge pack into the knowledge base in batched
+transactions, with memory bounded by the batch size
+
+Each record needs "content"; "topic" defaults to the first sentence (as
+the add_knowledge intent does) and "source" to the --source option. With a
+SQLite database (OM_DATABASE_PATH, or the database manager's db_path) the
+knowledge_base schema is checked first, then rows are staged in a temporary
+table with executemany, one transaction per batch. Only once the whole
+pack has been read do they move into knowledge_base, in a single
+transaction that drops its plain indexes, inserts and rebuilds exactly
+those indexes, so other connections never see the table without its
+indexes and a crash rolls the whole move back. A pack that fails part way
+(a bad byte, a full disk) leaves knowledge_base untouched. Without a
+database, rows go through add_to_knowledge_base one at a time and rows
+written before a failure stay.
+
+    python -m <package>.knowledge_ingest pack.jsonl [--batch-size 1000]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_SOURCE = "bulk_import"
+KNOWLEDGE_TABLE = "knowledge_base"
+STAGING_TABLE = "knowledge_ingest_staging"
+
+# Used when the table does not exist yet; an existing table keeps its schema
+CREATE_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {KNOWLEDGE_TABLE} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    content TEXT NOT NULL,
+    source TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)"""
+# Only for a table created here; an existing table keeps the indexes it had
+DEFAULT_INDEXES = [f"CREATE INDEX IF NOT EXISTS idx_knowledge_topic ON {KNOWLEDGE_TABLE}(topic)"]
+
+# Largest CSV field accepted; sys.maxsize overflows the C long on Windows
+CSV_FIELD_SIZE_LIMIT = 2 ** 31 - 1
+
+# Columns a pack fills; "source" is optional in an existing table
+REQUIRED_COLUMNS = ("topic", "content")
+OPTIONAL_COLUMNS = ("source",)
+
+
+def knowledge_topic(content: str) -> str:
+    """Topic of a knowledge entry: its first sentence"""
+    return content.split('.', 1)[0].strip()
+
+
+def read_records(path, file_format: str = None,
+                 source: str = DEFAULT_SOURCE) -> Iterator[Optional[Tuple[str, str, str]]]:
+    """
+    Stream (topic, content, source) rows from a JSONL or CSV file
+
+    Lines are parsed one at a time, so memory does not grow with the file.
+    Unusable records (bad JSON, no content) yield None so callers can count
+    them.
+
+    Args:
+        path: Input file
+        file_format (str): "jsonl" or "csv" (default: from the file extension)
+        source (str): Source for records without one
+    """
+    file_format = file_format or ("csv" if str(path).lower().endswith(".csv") else "jsonl")
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if file_format == "csv":
+            csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
+            records = csv.DictReader(f)
+        else:
+            records = (_parse_json_line(line) for line in f if line.strip())
+        for record in records:
+            yield _to_row(record, source)
+
+
+def _parse_json_line(line: str) -> Optional[Dict]:
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _to_row(record: Optional[Dict], source: str) -> Optional[Tuple[str, str, str]]:
+    if not record:
+        return None
+    content = str(record.get("content") or "").strip()
+    if not content:
+        return None
+    topic = str(record.get("topic") or "").strip() or knowledge_topic(content)
+    return topic, content, str(record.get("source") or source)
+
+
+def batched(rows: Iterable, size: int) -> Iterator[List]:
+    """Consecutive lists of up to ``size`` items"""
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def knowledge_columns(connection: sqlite3.Connection) -> List[str]:
+    """
+    Columns of knowledge_base a pack can fill, after checking its schema
+
+    Raises:
+        ValueError: The table lacks topic or content, or has another
+            NOT NULL column without a default that a pack cannot fill
+    """
+    columns = {name: (notnull, default, pk) for _, name, _, notnull, default, pk in
+               connection.execute(f"PRAGMA table_info({KNOWLEDGE_TABLE})")}
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"{KNOWLEDGE_TABLE} has no {', '.join(missing)} column; "
+                         f"found {', '.join(columns) or 'no columns'}")
+    fillable = [name for name in REQUIRED_COLUMNS + OPTIONAL_COLUMNS if name in columns]
+    unfillable = [name for name, (notnull, default, pk) in columns.items()
+                  if notnull and default is None and not pk and name not in fillable]
+    if unfillable:
+        raise ValueError(f"{KNOWLEDGE_TABLE} requires {', '.join(unfillable)}, "
+                         f"which knowledge packs do not provide")
+    return fillable
+
+
+class SQLiteKnowledgeWriter:
+    """Batched inserts into a staging table, moved into knowledge_base in one transaction"""
+
+    def __init__(self, database_path):
+        # Transactions are explicit: sqlite3 would commit before DROP INDEX otherwise
+        self.connection = sqlite3.connect(database_path, isolation_level=None)
+        try:
+            exists = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (KNOWLEDGE_TABLE,)).fetchone()
+            if not exists:
+                with self._transaction():
+                    self.connection.execute(CREATE_TABLE_SQL)
+                    for sql in DEFAULT_INDEXES:
+                        self.connection.execute(sql)
+            self.columns = knowledge_columns(self.connection)
+            self.connection.execute(f"CREATE TEMP TABLE {STAGING_TABLE} (topic, content, source)")
+        except Exception:
+            self.connection.close()
+            raise
+
+    @contextmanager
+    def _transaction(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    def write_batch(self, rows: List[Tuple[str, str, str]]) -> int:
+        with self._transaction():
+            self.connection.executemany(f"INSERT INTO {STAGING_TABLE} VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def finish(self):
+        """Move the staged rows into knowledge_base, rebuilding its plain indexes once"""
+        columns = ", ".join(self.columns)
+        try:
+            with self._transaction():
+                # Unique indexes stay, they enforce constraints on the inserted rows
+                indexes = [(name, sql) for name, sql in self.connection.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? "
+                    "AND sql IS NOT NULL", (KNOWLEDGE_TABLE,))
+                    if not sql.upper().startswith("CREATE UNIQUE")]
+                for name, _ in indexes:
+                    self.connection.execute(f'DROP INDEX "{name}"')
+                self.connection.execute(f"INSERT INTO {KNOWLEDGE_TABLE} ({columns}) "
+                                        f"SELECT {columns} FROM {STAGING_TABLE} ORDER BY rowid")
+                for _, sql in indexes:
+                    self.connection.execute(sql)
+        finally:
+            self.connection.close()
+
+    def abort(self):
+        """Drop the staged rows; knowledge_base is left as it was"""
+        self.connection.close()
+
+
+class PluginKnowledgeWriter:
+    """Row-at-a-time fallback through the database manager plugin"""
+
+    def __init__(self, add_entry):
+        self.add_entry = add_entry
+
+    def write_batch(self, rows: List[Tuple[str, str, str]]) -> int:
+        for topic, content, source in rows:
+            self.add_entry(topic, content, source)
+        return len(rows)
+
+    def finish(self):
+        pass
+
+    def abort(self):
+        # Rows already handed to the plugin cannot be taken back
+        pass
+
+
+def get_database_path() -> Optional[str]:
+    """SQLite file of the knowledge base: OM_DATABASE_PATH or the database manager's db_path"""
+    if os.environ.get("OM_DATABASE_PATH"):
+        return os.environ["OM_DATABASE_PATH"]
+    try:
+        from .plugins.database_manager import om_db
+    except ImportError:
+        return None
+    return getattr(om_db, "db_path", None)
+
+
+def ingest(path, file_format: str = None, batch_size: int = DEFAULT_BATCH_SIZE,
+           source: str = DEFAULT_SOURCE, database_path=None, writer=None) -> Dict:
+    """
+    Load a knowledge pack in batches
+
+    Args:
+        path: JSONL or CSV file
+        file_format (str): "jsonl" or "csv" (default: from the extension)
+        batch_size (int): Rows per transaction
+        source (str): Source for records without one
+        database_path: SQLite file (default: get_database_path())
+        writer: Object with write_batch(rows), finish() (commit) and abort()
+            (discard), overrides the database
+
+    Returns:
+        Dict: Rows written and skipped, batches, load and index seconds and
+        rows per second
+    """
+    if writer is None:
+        database_path = database_path or get_database_path()
+        if database_path:
+            writer = SQLiteKnowledgeWriter(database_path)
+        else:
+            from .command_handler import add_to_knowledge_base
+            writer = PluginKnowledgeWriter(add_to_knowledge_base)
+
+    written = skipped = batches = 0
+    start = time.perf_counter()
+    try:
+        for batch in batched(read_records(path, file_format, source), batch_size):
+            rows = [row for row in batch if row is not None]
+            skipped += len(batch) - len(rows)
+            if rows:
+                written += writer.write_batch(rows)
+                batches += 1
+    except BaseException:
+        writer.abort()
+        raise
+    load_seconds = time.perf_counter() - start
+
+    index_start = time.perf_counter()
+    writer.finish()
+    index_seconds = time.perf_counter() - index_start
+
+    total_seconds = load_seconds + index_seconds
+    return {
+        "written": written,
+        "skipped": skipped,
+        "batches": batches,
+        "load_seconds": round(load_seconds, 3),
+        "index_seconds": round(index_seconds, 3),
+        "rows_per_second": round(written / total_seconds) if total_seconds else written
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load a JSONL or CSV knowledge pack")
+    parser.add_argument("path", type=Path, help="Knowledge pack (.jsonl or .csv)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="Input format (default: from extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per transaction")
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help="Source for records without one")
+    parser.add_argument("--database", help="SQLite database (default: OM_DATABASE_PATH or the database manager's)")
+    args = parser.parse_args(argv)
+
+    report = ingest(args.path, args.format, args.batch_size, args.source, args.database)
+    print(f"✅ Ingested {report['written']} rows ({report['skipped']} skipped) in "
+          f"{report['batches']} batches: {report['load_seconds']}s load + "
+          f"{report['index_seconds']}s indexes, {report['rows_per_second']} rows/s")
+
+
+if __name__ == "__main__":
+    main()
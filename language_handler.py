@@ -3,13 +3,27 @@ Smart Language Handler for JARVIS AI
 Automatically detects and responds in Hindi, English, or Hinglish
 """
 
+import os
 import re
 import random
 
+from .utterance import as_utterance
+
+# Texts with fewer tokens give the n-gram model too little to go on
+# ("hi", "ok"); the rules decide those
+MIN_NGRAM_TOKENS = 3
+
 class LanguageHandler:
     """Intelligent language detection and response system"""
     
-    def __init__(self):
+    def __init__(self, detector=None):
+        """
+        Args:
+            detector (str): "rules" (word lists and patterns, the default) or
+                "ngram" (language_id character n-gram model, needs NumPy);
+                defaults to the OM_LANGUAGE_DETECTOR environment variable
+        """
+        self.detector = detector or os.environ.get("OM_LANGUAGE_DETECTOR", "rules")
         self.hindi_words = [
             'नमस्कार', 'नमस्ते', 'हैलो', 'कैसे', 'हो', 'क्या', 'है', 'कर', 'सकते', 'हैं',
             'मैं', 'आप', 'तुम', 'यह', 'वह', 'कहाँ', 'कब', 'कैसे', 'क्यों', 'जो',
@@ -32,13 +46,42 @@ class LanguageHandler:
             r'\b(kya|kaise|kahan|kab|kyun|jo|yeh|voh)\b',
             r'\b(google|search|internet|network|time|check)\b.*\b(kar|karo|hai)\b'
         ]
+        self.compiled_hinglish_patterns = [re.compile(pattern) for pattern in self.hinglish_patterns]
     
+    def _get_ngram_identifier(self):
+        if self.detector != "ngram":
+            return None
+        try:
+            from .language_id import get_language_identifier
+        except ImportError:
+            return None
+        return get_language_identifier()
+
+    def detect_languages(self, texts):
+        """Detect the language of many texts, in one vectorized pass with the n-gram detector"""
+        identifier = self._get_ngram_identifier()
+        if not identifier:
+            return [self.detect_language(text) for text in texts]
+        utterances = [as_utterance(text) for text in texts]
+        long_texts = [utterance for utterance in utterances if len(utterance.tokens) >= MIN_NGRAM_TOKENS]
+        detected = iter(identifier.detect_batch(long_texts) if long_texts else [])
+        return [next(detected) if len(utterance.tokens) >= MIN_NGRAM_TOKENS
+                else self._detect_with_rules(utterance) for utterance in utterances]
+
     def detect_language(self, text):
-        """Detect the primary language of the text"""
-        text_lower = text.lower()
+        """Detect the primary language of the text (str or Utterance)"""
+        utterance = as_utterance(text)
+        identifier = self._get_ngram_identifier()
+        if identifier and len(utterance.tokens) >= MIN_NGRAM_TOKENS:
+            return identifier.detect(utterance)
+        return self._detect_with_rules(utterance)
+
+    def _detect_with_rules(self, utterance):
+        """Word-list and pattern scoring"""
+        text_lower = utterance.lowered
         
         # Count Hindi characters (Devanagari script)
-        hindi_chars = len(re.findall(r'[\u0900-\u097F]', text))
+        hindi_chars = utterance.script_counts["devanagari"]
         
         # Count Hindi words
         hindi_word_count = sum(1 for word in self.hindi_words if word in text_lower)
@@ -47,8 +90,8 @@ class LanguageHandler:
         english_word_count = sum(1 for word in self.english_words if word in text_lower)
         
         # Check for Hinglish patterns
-        hinglish_patterns = sum(1 for pattern in self.hinglish_patterns 
-                               if re.search(pattern, text_lower))
+        hinglish_patterns = sum(1 for pattern in self.compiled_hinglish_patterns
+                               if pattern.search(text_lower))
         
         # Calculate scores
         hindi_score = hindi_chars * 2 + hindi_word_count * 3
@@ -0,0 +1,250 @@
+"""
+Language Identification for OM AI
+Character n-gram profiles for Hindi (Devanagari), Romanized Hindi
+(reported as 'hinglish', like LanguageHandler) and English, scored as a
+naive Bayes model in one vectorized NumPy pass (batches) or from cached
+per-word log-probabilities (single texts)
+
+Profiles are built from language_corpus.json at first use (a few
+milliseconds). Compare against LanguageHandler.detect_language with
+``python -m <package>.language_id``.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CORPUS_PATH = Path(__file__).parent / "language_corpus.json"
+
+LANGUAGES = ("hindi", "hinglish", "english")
+
+# Hashed n-gram table size; collisions barely matter at this vocabulary size
+PROFILE_DIM = 1 << 15
+NGRAM_SIZES = (1, 2, 3)
+
+# Everything that is not a letter becomes a space; Devanagari signs are not \w
+NON_LETTERS_PATTERN = re.compile(r"[^a-z\u0900-\u097F]+")
+DEVANAGARI_PATTERN = re.compile(r"[\u0900-\u097F]")
+LATIN_PATTERN = re.compile(r"[a-z]")
+
+# Share of the minority script above which a text counts as mixed (Hinglish)
+MIXED_SCRIPT_RATIO = 0.2
+
+# Separates texts in a batch; never part of an n-gram
+_SEPARATOR = "\x01"
+
+# Entries kept by a single-text score cache before it starts over
+SCORE_CACHE_SIZE = 50000
+
+
+def hash_ngrams(texts: Sequence[str]):
+    """
+    Hashed character 1-3-grams of many texts in one vectorized pass
+
+    Texts are lowercased, runs of non-letters collapse to one space and
+    each text is padded with spaces, so word starts and ends are features.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: (n-gram hashes, index of the
+        text each hash came from)
+    """
+    joined = _SEPARATOR.join(" " + NON_LETTERS_PATTERN.sub(" ", text.lower()).strip() + " "
+                             for text in texts)
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    is_separator = codes == ord(_SEPARATOR)
+    text_ids = np.cumsum(is_separator)
+
+    hashes, owners = [], []
+    for size in NGRAM_SIZES:
+        length = len(codes) - size + 1
+        if length <= 0:
+            continue
+        gram = np.full(length, size, dtype=np.uint64)
+        crosses = np.zeros(length, dtype=bool)
+        for offset in range(size):
+            gram = gram * np.uint64(1000003) + codes[offset:offset + length]
+            crosses |= is_separator[offset:offset + length]
+        keep = ~crosses
+        hashes.append(gram[keep] % np.uint64(PROFILE_DIM))
+        owners.append(text_ids[:length][keep])
+    return np.concatenate(hashes).astype(np.intp), np.concatenate(owners).astype(np.intp)
+
+
+def _hash_gram(gram: str) -> int:
+    """hash_ngrams' hash of one n-gram (the table size divides 2**64, so no wrap needed)"""
+    value = len(gram)
+    for char in gram:
+        value = value * 1000003 + ord(char)
+    return value % PROFILE_DIM
+
+
+class _ScoreCache(dict):
+    """key -> log-probability per language, computed by ``score`` on first use"""
+
+    def __init__(self, score):
+        super().__init__()
+        self.score = score
+
+    def __missing__(self, key: str) -> tuple:
+        if len(self) >= SCORE_CACHE_SIZE:
+            self.clear()
+        scores = self[key] = self.score(key)
+        return scores
+
+
+class LanguageIdentifier:
+    """Array-backed character n-gram language identifier"""
+
+    def __init__(self, corpus_path=None):
+        """
+        Build add-one smoothed n-gram log-probability profiles
+
+        Args:
+            corpus_path: Corpus file with a "training" section (default:
+                language_corpus.json next to this module)
+        """
+        with open(corpus_path or CORPUS_PATH, encoding="utf-8") as f:
+            training = json.load(f)["training"]
+        self.languages = list(LANGUAGES)
+
+        # (PROFILE_DIM, languages) so one gather scores every language
+        columns = []
+        for language in self.languages:
+            hashes, _ = hash_ngrams(training[language])
+            counts = np.bincount(hashes, minlength=PROFILE_DIM).astype(np.float64)
+            columns.append(np.log((counts + 1) / (counts.sum() + PROFILE_DIM)))
+        self.log_probs = np.stack(columns, axis=1).astype(np.float32)
+        self.gram_scores = _ScoreCache(lambda gram: tuple(self.log_probs[_hash_gram(gram)].tolist()))
+        self.word_scores = _ScoreCache(self._score_word)
+
+    def score_batch(self, texts: Sequence[str]):
+        """
+        Log-likelihood of every text under every language profile
+
+        Returns:
+            numpy.ndarray: Shape (len(texts), len(languages))
+        """
+        hashes, owners = hash_ngrams(texts)
+        weights = self.log_probs[hashes]
+        return np.stack([np.bincount(owners, weights=weights[:, column], minlength=len(texts))
+                         for column in range(len(self.languages))], axis=1)
+
+    def detect_batch(self, texts: Sequence[str]) -> List[str]:
+        """
+        Detect the language of many texts at once
+
+        Texts mixing Devanagari and Latin letters are 'hinglish' regardless
+        of the profile scores.
+
+        Args:
+            texts (Sequence[str]): Utterances
+
+        Returns:
+            List[str]: 'hindi', 'hinglish' or 'english' per text
+        """
+        if not texts:
+            return []
+        best = self.score_batch(texts).argmax(axis=1)
+        return [_script_override(text) or self.languages[index] for text, index in zip(texts, best)]
+
+    def _score_word(self, word: str) -> tuple:
+        """Summed scores of every n-gram of `` word ``"""
+        padded = f" {word} "
+        grams = [padded[start:start + size] for size in NGRAM_SIZES
+                 for start in range(len(padded) - size + 1)]
+        return tuple(sum(column) for column in zip(*map(self.gram_scores.__getitem__, grams)))
+
+    def detect(self, text: str) -> str:
+        """
+        Detect the language of one text
+
+        Same model as detect_batch, summed in plain Python from cached word
+        scores, since for one text the NumPy setup costs more than the
+        scoring. The n-grams of " w1 w2 " are those of " w1 " and " w2 ",
+        less the shared space, plus the trigram spanning it.
+        """
+        words = NON_LETTERS_PATTERN.sub(" ", text.lower()).split() or [""]
+        scores = list(map(self.word_scores.__getitem__, words))
+        scores.extend(self.gram_scores[f"{left[-1]} {right[0]}"] for left, right in zip(words, words[1:]))
+        space = self.gram_scores[" "]
+        totals = [sum(column) - (len(words) - 1) * shared for column, shared in zip(zip(*scores), space)]
+        best = max(range(len(totals)), key=totals.__getitem__)
+        return _script_override(text) or self.languages[best]
+
+
+def _script_override(text: str) -> Optional[str]:
+    devanagari = len(DEVANAGARI_PATTERN.findall(text))
+    if not devanagari:
+        return None
+    latin = len(LATIN_PATTERN.findall(text.lower()))
+    if min(devanagari, latin) / (devanagari + latin) >= MIXED_SCRIPT_RATIO:
+        return "hinglish"
+    return None
+
+
+_identifier = None
+
+
+def get_language_identifier() -> Optional[LanguageIdentifier]:
+    """Shared identifier, built on first use; None when NumPy is missing"""
+    global _identifier
+    if _identifier is None and np is not None:
+        _identifier = LanguageIdentifier()
+    return _identifier
+
+
+def benchmark(corpus_path=None, repeat: int = 20) -> Dict[str, Dict]:
+    """
+    Accuracy and speed of the n-gram identifier vs LanguageHandler's rules
+
+    Uses the held-out "benchmark" section of the corpus.
+
+    Returns:
+        Dict[str, Dict]: Per detector: accuracy, per-language accuracy and
+        microseconds per text (batched for the n-gram model)
+    """
+    from .language_handler import LanguageHandler
+
+    with open(corpus_path or CORPUS_PATH, encoding="utf-8") as f:
+        labeled = [(text, language) for language, texts in json.load(f)["benchmark"].items()
+                   for text in texts]
+    texts = [text for text, _ in labeled]
+    identifier = LanguageIdentifier(corpus_path)
+    rules = LanguageHandler()
+
+    detectors = {
+        "rules": lambda batch: [rules.detect_language(text) for text in batch],
+        "ngram": lambda batch: [identifier.detect(text) for text in batch],
+        "ngram_batch": identifier.detect_batch,
+    }
+    report = {}
+    for name, detect in detectors.items():
+        predictions = detect(texts)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            detect(texts)
+        seconds = (time.perf_counter() - start) / repeat
+
+        per_language = {}
+        for language in LANGUAGES:
+            pairs = [(p, l) for p, (_, l) in zip(predictions, labeled) if l == language]
+            per_language[language] = round(sum(p == l for p, l in pairs) / len(pairs), 3)
+        report[name] = {
+            "accuracy": round(sum(p == l for p, (_, l) in zip(predictions, labeled)) / len(labeled), 3),
+            "per_language": per_language,
+            "us_per_text": round(seconds / len(texts) * 1e6, 1)
+        }
+    return report
+
+
+if __name__ == "__main__":
+    for detector, result in benchmark().items():
+        print(f"{detector:12} accuracy {result['accuracy']:.1%}  {result['us_per_text']} µs/text  "
+              f"{result['per_language']}")
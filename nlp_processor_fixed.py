@@ -8,139 +8,77 @@ import re
 import json
 from typing import Dict, List, Tuple, Optional
 
+from .fallback_cache import FallbackCache
+from .intent_engine import load_spec
+from .routing_snapshot import (compile_intent_literals, load_compiled_patterns, load_compiled_tables,
+                               pattern_section)
+from .utterance import as_utterance
 
-class EnhancedNLPProcessor:
-    """Enhanced NLP processor with improved intent recognition"""
-
-    def __init__(self):
-        self.intent_patterns = self._load_intent_patterns()
-        self.entity_extractors = self._setup_entity_extractors()
-
-    def _load_intent_patterns(self) -> Dict[str, List[str]]:
-        """Load intent recognition patterns"""
-        return {
-            # Search intents
-            "google_search": [
-                r"search (?:for )?(.+)",
-                r"google (.+)",
-                r"find (?:information about )?(.+)",
-                r"look up (.+)",
-                r"what is (.+)",
-                r"tell me about (.+)"
-            ],
-
-            "detailed_search": [
-                r"detailed search (?:for )?(.+)",
-                r"comprehensive (?:search|info) (?:about )?(.+)",
-                r"in-depth (?:search|information) (?:on )?(.+)"
-            ],
-
-            "image_search": [
-                r"(?:search|find|show) (?:me )?images? (?:of )?(.+)",
-                r"picture(?:s)? (?:of )?(.+)",
-                r"photo(?:s)? (?:of )?(.+)"
-            ],
+# Bump when compile_intent_literals output changes to invalidate snapshots
+PATTERN_COMPILER_VERSION = 1
 
-            "video_search": [
-                r"(?:search|find|show) (?:me )?videos? (?:of )?(.+)",
-                r"youtube (?:search )?(.+)",
-                r"video(?:s)? (?:about )?(.+)"
-            ],
-
-            "lucky_search": [
-                r"(?:i'm )?feeling lucky (.+)",
-                r"lucky search (.+)",
-                r"first result (?:for )?(.+)"
-            ],
+# Words of an utterance for keyword scoring ("what's" stays one word)
+WORD_PATTERN = re.compile(r"[\w']+")
 
-            # Weather intents
-            "get_weather": [
-                r"weather (?:in )?(.+)",
-                r"(?:what's|how's) the weather (?:in )?(.+)",
-                r"temperature (?:in )?(.+)",
-                r"mausam (.+)"
-            ],
+# Pattern words too common to suggest an intent on their own
+COMMON_PATTERN_WORDS = {"the", "for", "you", "are", "what", "how", "does", "is", "it", "me"}
 
-            # System intents
-            "get_time": [
-                r"(?:what )?time (?:is it)?",
-                r"current time",
-                r"tell me the time",
-                r"samay kya hai"
-            ],
+# Scores used by score_intents / get_confidence_score
+PATTERN_MATCH_SCORE = 0.9
+KEYWORD_MATCH_SCORE = 0.6
 
-            "get_date": [
-                r"(?:what's )?(?:the )?date (?:today)?",
-                r"today's date",
-                r"current date",
-                r"aaj ki tarikh"
-            ],
+# What _extract_intent returns when no pattern matches
+FALLBACK_INTENT = "google_search"
 
-            # AI intents
-            "chat_ai": [
-                r"chat (.+)",
-                r"talk (?:to me )?about (.+)",
-                r"discuss (.+)",
-                r"conversation (?:about )?(.+)"
-            ],
 
-            "openai_explain": [
-                r"explain (.+)",
-                r"describe (.+)",
-                r"what does (.+) mean",
-                r"definition (?:of )?(.+)"
-            ],
-
-            # Utility intents
-            "motivate": [
-                r"motivate (?:me)?",
-                r"motivation",
-                r"inspire (?:me)?",
-                r"encouragement"
-            ],
-
-            "introduction": [
-                r"(?:who are you|introduce yourself)",
-                r"what (?:can you do|are your capabilities)",
-                r"about (?:you|yourself)"
-            ],
-
-            # Network intents
-            "check_internet": [
-                r"check internet",
-                r"internet (?:status|connection)",
-                r"am i online",
-                r"network (?:status|check)"
-            ],
-
-            "ping_website": [
-                r"ping (.+)",
-                r"test connection (?:to )?(.+)",
-                r"check (?:if )?(.+) (?:is )?(?:up|online|working)"
-            ],
+class EnhancedNLPProcessor:
+    """Enhanced NLP processor with improved intent recognition"""
 
-            # Greetings and social
-            "greeting": [
-                r"(?:hi|hello|hey|namaste)",
-                r"good (?:morning|afternoon|evening)",
-                r"greetings"
-            ],
+    def __init__(self, intent_patterns: Optional[Dict[str, List[str]]] = None):
+        self.intent_patterns = intent_patterns or self._load_intent_patterns()
+        self.compiled_patterns = self._compile_intent_patterns()
+        self.pattern_literals = self._load_pattern_literals()
+        self.keyword_index = self._build_keyword_index()
+        self.intent_order = {intent: position for position, intent in enumerate(self.intent_patterns)}
+        self.entity_extractors = self._setup_entity_extractors()
+        # Cleaned texts no pattern matches -> their fallback parameters
+        self.fallback_cache = FallbackCache()
 
-            "how_are_you": [
-                r"how are you",
-                r"how (?:are )?things",
-                r"kaise ho",
-                r"what's up"
-            ],
+    def _load_intent_patterns(self) -> Dict[str, List[str]]:
+        """Load intent recognition patterns from the "patterns" table of intents.json"""
+        return load_spec()["patterns"]
 
-            "thank_you": [
-                r"thank(?:s| you)",
-                r"dhanyawad",
-                r"shukriya",
-                r"appreciate (?:it|this)"
-            ]
+    def _compile_intent_patterns(self) -> Dict[str, List[re.Pattern]]:
+        """Compile intent patterns once (from their snapshotted programs) so matching never hits the re cache"""
+        name, tables, _, _ = self.snapshot_sections()[1]
+        compiled = load_compiled_patterns(name, tables["patterns"], tables["flags"])
+        return {
+            intent: [compiled[pattern] for pattern in patterns]
+            for intent, patterns in self.intent_patterns.items()
         }
 
+    def snapshot_sections(self) -> List[Tuple]:
+        """Routing tables persisted by routing_snapshot: (name, tables, compiler, version)"""
+        sources = [pattern for patterns in self.intent_patterns.values() for pattern in patterns]
+        return [("intent_patterns", {"intent_patterns": self.intent_patterns},
+                 compile_intent_literals, PATTERN_COMPILER_VERSION),
+                pattern_section("intent_pattern_programs", list(dict.fromkeys(sources)), re.IGNORECASE)]
+
+    def _load_pattern_literals(self) -> Dict[str, List[List[str]]]:
+        """Literal prefilters per pattern, mapped from the on-disk snapshot when current"""
+        name, tables, compiler, version = self.snapshot_sections()[0]
+        return load_compiled_tables(name, tables, compiler, version)["intent_literals"]
+
+    def _build_keyword_index(self) -> Dict[str, frozenset]:
+        """Map each plain word used in the patterns to the intents using it"""
+        index = {}
+        for intent, patterns in self.intent_patterns.items():
+            for pattern in patterns:
+                for word in WORD_PATTERN.findall(pattern.lower()):
+                    if len(word) > 1 and word not in COMMON_PATTERN_WORDS:
+                        index.setdefault(word, set()).add(intent)
+        return {word: frozenset(intents) for word, intents in index.items()}
+
     def _setup_entity_extractors(self) -> Dict[str, callable]:
         """Setup entity extraction functions"""
         return {
@@ -155,7 +93,7 @@ class EnhancedNLPProcessor:
         Process natural language text and extract intent and parameters
 
         Args:
-            text (str): Input text to process
+            text (str): Input text to process (str or Utterance)
 
         Returns:
             Tuple[str, Dict]: Intent and extracted parameters
@@ -164,7 +102,12 @@ class EnhancedNLPProcessor:
             return "unknown", {}
 
         # Clean and normalize text
-        cleaned_text = self._clean_text(text)
+        cleaned_text = as_utterance(text).normalized
+
+        # Known misses skip the pattern scan
+        cached_params = self.fallback_cache.lookup(cleaned_text)
+        if cached_params is not None:
+            return FALLBACK_INTENT, dict(cached_params)
 
         # Extract intent
         intent = self._extract_intent(cleaned_text)
@@ -175,36 +118,49 @@ class EnhancedNLPProcessor:
         return intent, params
 
     def _clean_text(self, text: str) -> str:
-        """Clean and normalize input text"""
-        # Convert to lowercase
-        text = text.lower().strip()
-
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-
-        # Remove punctuation at the end
-        text = re.sub(r'[.!?]+$', '', text)
-
-        return text
+        """Clean and normalize input text (lowercase, single spaces, no trailing punctuation)"""
+        return as_utterance(text).normalized
 
     def _extract_intent(self, text: str) -> str:
         """Extract intent from cleaned text"""
-        # Check each intent pattern
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return intent
+        match = self._match_patterns(text)
+        if match:
+            return match[0]
 
         # Default fallback - if it looks like a question, search it
         if any(word in text for word in ['what', 'how', 'why', 'when', 'where', 'who']):
-            return "google_search"
+            return FALLBACK_INTENT
 
         # If it contains search-like keywords
         if any(word in text for word in ['search', 'find', 'lookup', 'google']):
-            return "google_search"
+            return FALLBACK_INTENT
 
         # Default to search for unknown intents
-        return "google_search"
+        return FALLBACK_INTENT
+
+    def match_intent(self, text: str) -> Optional[Tuple[str, re.Match]]:
+        """
+        First intent whose regex matches the cleaned text, without the
+        search fallback of _extract_intent
+
+        Returns:
+            Optional[Tuple[str, re.Match]]: Intent and the regex match
+        """
+        if self.fallback_cache.lookup(text) is not None:
+            return None
+        return self._match_patterns(text)
+
+    def _match_patterns(self, text: str) -> Optional[Tuple[str, re.Match]]:
+        """Scan the compiled patterns; a miss is remembered in the fallback cache"""
+        for intent, patterns in self.compiled_patterns.items():
+            # Skip regexes whose mandatory literals are not in the text
+            for pattern, literals in zip(patterns, self.pattern_literals[intent]):
+                if all(literal in text for literal in literals):
+                    match = pattern.search(text)
+                    if match:
+                        return intent, match
+        self.fallback_cache.add(text, self._extract_parameters(text, FALLBACK_INTENT))
+        return None
 
     def _extract_parameters(self, text: str, intent: str) -> Dict[str, any]:
         """Extract parameters based on intent"""
@@ -219,9 +175,16 @@ class EnhancedNLPProcessor:
         elif intent == "ping_website":
             params["host"] = self._extract_website(text)
 
-        elif intent in ["chat_ai", "openai_explain"]:
+        elif intent == "chat_ai":
             params["message"] = self._extract_message(text, intent)
 
+        # Same parameter names handle_command reads for these intents
+        elif intent == "openai_explain":
+            params["query"] = self._extract_message(text, intent)
+
+        elif intent == "greeting":
+            params["message"] = text
+
         elif intent == "open_app":
             params["app"] = self._extract_app_name(text)
 
@@ -366,6 +329,53 @@ class EnhancedNLPProcessor:
 
         return ""
 
+    def score_intents(self, text: str) -> Dict[str, float]:
+        """
+        Score every intent in one pass over the utterance
+
+        Words of the text are looked up once in the keyword index (partial
+        match); only intents whose literal prefilter passes have their
+        precompiled regexes run (full match).
+
+        Args:
+            text (str): Input text (str or Utterance)
+
+        Returns:
+            Dict[str, float]: Score per matching intent; intents with no
+            match are left out
+        """
+        text = as_utterance(text).lowered
+        scores = {}
+        for word in set(WORD_PATTERN.findall(text)):
+            for intent in self.keyword_index.get(word, ()):
+                scores[intent] = KEYWORD_MATCH_SCORE
+
+        for intent, patterns in self.compiled_patterns.items():
+            for pattern, literals in zip(patterns, self.pattern_literals[intent]):
+                if all(literal in text for literal in literals) and pattern.search(text):
+                    scores[intent] = PATTERN_MATCH_SCORE
+                    break
+        return scores
+
+    def rank_intents(self, text: str, top_k: int = 3, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """
+        Best scoring intents for an utterance
+
+        Args:
+            text (str): Input text
+            top_k (int): Number of intents to return
+            min_score (float): Leave out intents scoring below this
+
+        Returns:
+            List[Tuple[str, float]]: (intent, score), highest first; ties keep
+            pattern table order
+        """
+        scores = self.score_intents(text)
+        order = self.intent_order
+        ranked = sorted((item for item in scores.items() if item[1] >= min_score),
+                        key=lambda item: (-item[1], order[item[0]]))
+        return ranked[:top_k]
+
     def get_confidence_score(self, text: str, intent: str) -> float:
         """Get confidence score for intent recognition"""
         if intent == "unknown":
@@ -374,30 +384,13 @@ class EnhancedNLPProcessor:
         if intent not in self.intent_patterns:
             return 0.5
 
-        # Check how well the text matches the intent patterns
-        patterns = self.intent_patterns[intent]
-        max_confidence = 0.0
+        return self.score_intents(text).get(intent, 0.0)
 
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                # Exact pattern match gets high confidence
-                max_confidence = max(max_confidence, 0.9)
-            elif any(word in text.lower() for word in pattern.split()):
-                # Partial match gets medium confidence
-                max_confidence = max(max_confidence, 0.6)
-
-        return max_confidence
-
-    def suggest_alternatives(self, text: str) -> List[str]:
+    def suggest_alternatives(self, text: str, top_k: int = 3) -> List[str]:
         """Suggest alternative intents for ambiguous text"""
-        suggestions = []
-
-        for intent, patterns in self.intent_patterns.items():
-            confidence = self.get_confidence_score(text, intent)
-            if 0.3 <= confidence < 0.8:  # Medium confidence range
-                suggestions.append(intent)
-
-        return suggestions[:3]  # Return top 3 suggestions
+        # Medium confidence range: keyword hits without a full pattern match
+        return [intent for intent, score in self.rank_intents(text, len(self.intent_patterns), 0.3)
+                if score < 0.8][:top_k]
 
 
 # Create global instance
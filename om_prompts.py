@@ -7,6 +7,10 @@ Author: Pradeep
 
 import datetime
 import random
+
+from .conversation_buffer import conversation_buffer
+from .utterance import as_utterance
+
 BEHAVIOR_PROMPTS = """आप OM हैं — एक advanced voice-based AI assistant, जिसे pradeep ने design और program किया है।
 
 ### संदर्भ (Context):
@@ -254,10 +258,38 @@ What would you like to explore first?"""
             "🎯 Goodbye for now! Don't hesitate to reach out when you need help."
         ]
 
-    def get_context_aware_prompt(self, user_query, context=None):
-        """Generate context-aware responses based on user query and history"""
-        query_lower = user_query.lower()
+    def get_context_aware_prompt(self, user_query, context=None, user_id=None):
+        """
+        Generate context-aware responses based on user query and history
+
+        Args:
+            user_query (str): Current utterance
+            context: Earlier conversation, either a string or a
+                conversation_buffer.get_context() result
+            user_id (str): Session whose buffered turns are used when no
+                context is given; without one only the query is considered
+        """
+        if context is None and user_id is not None:
+            context = conversation_buffer.get_context(user_id)
+
+        # Follow-ups ("and the other one?") carry the topic of the recent turns
+        if isinstance(context, dict):
+            earlier = [turn["query"] for turn in reversed(context.get("recent_turns", []))]
+        elif context:
+            earlier = [str(context)]
+        else:
+            earlier = []
+        queries = [user_query] + earlier
+        for query in queries:
+            prompt = self._topic_prompt(as_utterance(query).lowered)
+            if prompt:
+                return prompt
+
+        # Default professional response
+        return "🎯 I'm analyzing your request to provide the most helpful response."
 
+    def _topic_prompt(self, query_lower):
+        """Prompt for a technical, research, urgent or creative query, else None"""
         # Technical queries
         if any(word in query_lower for word in ['code', 'programming', 'debug', 'error', 'technical']):
             return "🔧 I see you're working on something technical. Let me provide precise, actionable assistance."
@@ -274,8 +306,7 @@ What would you like to explore first?"""
         elif any(word in query_lower for word in ['create', 'design', 'idea', 'brainstorm']):
             return "💡 I'm ready to help you explore creative solutions and ideas."
 
-        # Default professional response
-        return "🎯 I'm analyzing your request to provide the most helpful response."
+        return None
 
 
 # Global instance for easy access
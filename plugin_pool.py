@@ -0,0 +1,121 @@
+"""
+Plugin Thread Pools for OM AI
+One bounded pool of threads per plugin, so a backend that stops answering
+can only tie up its own threads and never delays calls to the others
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+DEFAULT_PLUGIN_WORKERS = 4
+# Threads per plugin; abandoned calls keep theirs until the plugin returns
+PLUGIN_WORKERS = {
+    "search_info": 8,
+    "conversation": 8,
+}
+
+
+class PluginBusyError(RuntimeError):
+    """Every thread of a plugin's pool is taken"""
+
+
+class PluginPool:
+    """Threads for one plugin; a call is only submitted once a thread is free"""
+
+    def __init__(self, name: str, max_workers: int = DEFAULT_PLUGIN_WORKERS):
+        """
+        Args:
+            name (str): Plugin name, used for thread names and stats
+            max_workers (int): Calls that may run (or hang) at the same time
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.submitted = 0
+        self.busy_rejections = 0
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix=f"om-{name}")
+        self._in_use = 0
+        self._lock = threading.Lock()
+
+    def wait_for_thread(self, timeout: float) -> bool:
+        """
+        Wait until a thread is free, without taking it
+
+        Returns:
+            bool: False if every thread stayed busy for ``timeout`` seconds
+        """
+        if not self._slots.acquire(timeout=max(0.0, timeout)):
+            with self._lock:
+                self.busy_rejections += 1
+            return False
+        self._slots.release()
+        return True
+
+    def submit(self, fn: Callable, *args):
+        """
+        Run ``fn(*args)`` on a free thread of this plugin
+
+        Because a call only goes in when a thread is free, it starts running
+        right away: its timeout measures plugin time, not time in a queue.
+
+        Raises:
+            PluginBusyError: No thread is free
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.busy_rejections += 1
+            raise PluginBusyError(f"{self.name} has no free thread")
+        with self._lock:
+            self._in_use += 1
+            self.submitted += 1
+        try:
+            future = self._executor.submit(self._run, fn, args)
+        except BaseException:
+            self._release()
+            raise
+        # A call cancelled before it ran never reaches _run's release
+        future.add_done_callback(lambda f: self._release() if f.cancelled() else None)
+        return future
+
+    def _run(self, fn: Callable, args: tuple):
+        try:
+            return fn(*args)
+        finally:
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            self._in_use -= 1
+        self._slots.release()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_use": self._in_use,
+                "submitted": self.submitted,
+                "busy_rejections": self.busy_rejections
+            }
+
+
+_pools: Dict[str, PluginPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_plugin_pool(name: str) -> PluginPool:
+    """Return the shared pool for a plugin, creating it on first use"""
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = PluginPool(name, PLUGIN_WORKERS.get(name, DEFAULT_PLUGIN_WORKERS))
+                _pools[name] = pool
+    return pool
+
+
+def get_pool_stats() -> Dict[str, Dict]:
+    """Thread use of every plugin pool created so far"""
+    return {name: pool.get_stats() for name, pool in sorted(_pools.items())}
@@ -0,0 +1,192 @@
+"""
+Request Hedging for OM AI
+Opt-in hedged requests for idempotent, latency-critical search intents
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, TimeoutError as FutureTimeoutError, wait
+from typing import Callable, Dict, Optional
+
+# Only idempotent lookups may be sent twice
+HEDGEABLE_INTENTS = {
+    "google_search", "openai_explain", "detailed_search", "image_search",
+    "video_search", "get_weather"
+}
+
+
+class HedgePolicy:
+    """Hedging settings and latency history for one intent"""
+
+    def __init__(self, intent: str, percentile: float = 0.95, alternate: Callable = None,
+                 initial_delay: float = 1.0, min_delay: float = 0.05, max_delay: float = 5.0,
+                 window: int = 200, min_samples: int = 20):
+        """
+        Args:
+            intent (str): Intent to hedge
+            percentile (float): First-attempt latency percentile after which a
+                second attempt is sent (0.95 = hedge the slowest 5%)
+            alternate (Callable): Optional ``alternate(params) -> str`` provider
+                for the second attempt; defaults to repeating the first
+            initial_delay (float): Hedge delay until min_samples are recorded
+            min_delay (float): Lower bound for the hedge delay in seconds
+            max_delay (float): Upper bound for the hedge delay in seconds
+            window (int): Number of recent latencies kept
+            min_samples (int): Latencies needed before using the percentile
+        """
+        self.intent = intent
+        self.percentile = percentile
+        self.alternate = alternate
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.latencies = deque(maxlen=window)
+        self.calls = 0
+        self.hedges_fired = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def record_latency(self, seconds: float):
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the first attempt before hedging"""
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                delay = self.initial_delay
+            else:
+                ordered = sorted(self.latencies)
+                delay = ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))]
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            calls = self.calls
+            return {
+                "percentile": self.percentile,
+                "calls": calls,
+                "hedges_fired": self.hedges_fired,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": round(self.hedges_fired / calls, 3) if calls else 0.0,
+                "alternate_provider": self.alternate is not None
+            }
+
+
+_policies: Dict[str, HedgePolicy] = {}
+
+
+def enable_hedging(intent: str, percentile: float = 0.95, alternate: Callable = None,
+                   **settings) -> HedgePolicy:
+    """
+    Turn on hedging for an idempotent search-type intent
+
+    Args:
+        intent (str): One of HEDGEABLE_INTENTS
+        percentile (float): Latency percentile that triggers the second attempt
+        alternate (Callable): Optional ``alternate(params) -> str`` provider
+        **settings: Other HedgePolicy settings
+
+    Returns:
+        HedgePolicy: The active policy
+    """
+    if intent not in HEDGEABLE_INTENTS:
+        raise ValueError(f"Intent '{intent}' is not idempotent and cannot be hedged")
+    policy = HedgePolicy(intent, percentile, alternate, **settings)
+    _policies[intent] = policy
+    return policy
+
+
+def disable_hedging(intent: str):
+    """Turn off hedging for an intent"""
+    _policies.pop(intent, None)
+
+
+def get_hedge_policy(intent: str) -> Optional[HedgePolicy]:
+    """Active policy for an intent, or None if it is not hedged"""
+    return _policies.get(intent)
+
+
+def get_hedging_stats() -> Dict[str, Dict]:
+    """How often hedging fired and won, per hedged intent"""
+    return {intent: policy.get_stats() for intent, policy in sorted(_policies.items())}
+
+
+def run_hedged(policy: HedgePolicy, primary: Callable, alternate: Callable, executor,
+               timeout: float, is_failure: Callable = None):
+    """
+    Run ``primary``, adding a second attempt if it is slower than the hedge delay
+
+    The first successful attempt wins. Attempts that finish together are
+    all looked at first, so a success beats a failure however ``wait``
+    orders them. The losing attempt is not cancelled (executor submissions
+    start running right away); it finishes on its thread and its result is
+    discarded.
+
+    Args:
+        policy (HedgePolicy): Policy for the intent
+        primary (Callable): First attempt, no arguments
+        alternate (Callable): Second attempt, no arguments
+        executor: Executor both attempts run on; if it has no room for the
+            second attempt (submit raises RuntimeError, e.g. PluginBusyError),
+            the first attempt just keeps its time
+        timeout (float): Total seconds to wait for an answer
+        is_failure (Callable): Returns True for results that should not win
+
+    Returns:
+        The winning attempt's result
+
+    Raises:
+        concurrent.futures.TimeoutError: If no attempt answered within timeout
+    """
+    start = time.monotonic()
+    with policy._lock:
+        policy.calls += 1
+
+    first = executor.submit(primary)
+    first.add_done_callback(lambda _: policy.record_latency(time.monotonic() - start))
+
+    done, _ = wait([first], timeout=min(policy.hedge_delay(), timeout))
+    if done:
+        return first.result()
+
+    try:
+        second = executor.submit(alternate)
+    except RuntimeError:
+        # No spare thread to hedge with: keep waiting for the first attempt
+        done, _ = wait([first], timeout=max(0.0, timeout - (time.monotonic() - start)))
+        if done:
+            return first.result()
+        raise FutureTimeoutError()
+    with policy._lock:
+        policy.hedges_fired += 1
+
+    pending = {first, second}
+    failed_result, error = None, None
+    while pending:
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            if is_failure and is_failure(result):
+                failed_result = result
+                continue
+            if future is second:
+                with policy._lock:
+                    policy.hedge_wins += 1
+            return result
+
+    # No success: a failed reply beats an exception, an exception beats a timeout
+    if failed_result is not None:
+        return failed_result
+    if error is not None and not pending:
+        raise error
+    raise FutureTimeoutError()
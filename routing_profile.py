@@ -0,0 +1,198 @@
+"""
+Routing Profile for OM AI
+Counts how often each intent is routed and how many rule checks it took,
+and persists the counts
+
+The counts show which intents dominate traffic and what first-match
+routing costs (router_stats, ``python -m <package>.routing_profile``).
+They do not reorder the matcher: keyword groups are substring tests, so
+any two keyword rules match an utterance holding both their phrases, and
+moving a frequent rule ahead of an earlier one would change where such
+utterances go.
+
+Profiling is opt-in: set OM_ROUTING_PROFILE to a file to keep the counts
+across restarts.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROFILE_FORMAT_VERSION = 1
+
+# Unset or empty OM_ROUTING_PROFILE keeps the counts in memory only
+_profile_setting = os.environ.get("OM_ROUTING_PROFILE")
+DEFAULT_PROFILE_PATH = Path(_profile_setting) if _profile_setting else None
+
+# Hits between writes; counts from several workers are merged into the file
+FLUSH_EVERY = 50
+
+
+class RoutingProfile:
+    """Per-intent hit counts with periodic, merge-on-write persistence"""
+
+    def __init__(self, path=DEFAULT_PROFILE_PATH, flush_every: int = FLUSH_EVERY):
+        """
+        Args:
+            path: Profile file, or None to keep the counts in memory
+            flush_every (int): Hits between writes
+        """
+        self.path = Path(path) if path else None
+        self.flush_every = flush_every
+        self.enabled = True
+        self.hits = Counter()
+        self.checks = 0
+        self.routed = 0
+        # Recorded since the last write, added to the file on save()
+        self._pending_hits = Counter()
+        self._pending_checks = 0
+        self._lock = threading.Lock()
+        # Serializes file writes without holding up record()
+        self._save_lock = threading.Lock()
+
+    def record(self, intent: str, checks: int):
+        """Count one routed utterance and the rule checks it needed"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.hits[intent] += 1
+            self.checks += checks
+            self.routed += 1
+            self._pending_hits[intent] += 1
+            self._pending_checks += checks
+            flush = self.path is not None and sum(self._pending_hits.values()) >= self.flush_every
+        if flush:
+            self.save()
+
+    @contextmanager
+    def paused(self):
+        """Stop counting for synthetic traffic such as warm-up queries"""
+        enabled, self.enabled = self.enabled, False
+        try:
+            yield
+        finally:
+            self.enabled = enabled
+
+    def save(self):
+        """Add the pending counts to the profile file (temp file + rename)"""
+        if self.path is None:
+            return
+        with self._save_lock:
+            # Take the pending counts under the lock; the file is written outside it
+            with self._lock:
+                pending_hits, pending_checks = self._pending_hits, self._pending_checks
+                self._pending_hits, self._pending_checks = Counter(), 0
+            if not pending_hits:
+                return
+            stored = load_profile(self.path)
+            hits = Counter(stored["hits"])
+            hits.update(pending_hits)
+            data = {
+                "version": PROFILE_FORMAT_VERSION,
+                "hits": dict(hits.most_common()),
+                "checks": stored["checks"] + pending_checks
+            }
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=1)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"⚠️ Could not write routing profile {self.path}: {e}")
+                # Keep the counts for the next attempt
+                with self._lock:
+                    self._pending_hits.update(pending_hits)
+                    self._pending_checks += pending_checks
+
+    def get_stats(self) -> Dict:
+        """Hits in this process and the average number of rule checks per utterance"""
+        with self._lock:
+            return {
+                "routed": self.routed,
+                "checks_per_utterance": round(self.checks / self.routed, 2) if self.routed else 0.0,
+                "top_intents": dict(self.hits.most_common(10)),
+                "path": str(self.path) if self.path else None
+            }
+
+
+def load_profile(path=DEFAULT_PROFILE_PATH) -> Dict:
+    """
+    Read a profile file
+
+    Returns:
+        Dict: "hits" per intent and total "checks"; empty when the file is
+        missing, unreadable or from another format version
+    """
+    empty = {"hits": {}, "checks": 0}
+    if not path:
+        return empty
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if not isinstance(data, dict) or data.get("version") != PROFILE_FORMAT_VERSION:
+        return empty
+    return {"hits": {str(k): int(v) for k, v in data.get("hits", {}).items()},
+            "checks": int(data.get("checks", 0))}
+
+
+def expected_checks(rules: List, hits: Dict[str, int]) -> float:
+    """Average rule checks per utterance under a hit distribution"""
+    position = {}
+    for index, rule in enumerate(rules, 1):
+        position.setdefault(rule.intent, index)
+    counted = {intent: count for intent, count in hits.items() if intent in position}
+    total = sum(counted.values())
+    if not total:
+        return 0.0
+    return sum(position[intent] * count for intent, count in counted.items()) / total
+
+
+_profile: Optional[RoutingProfile] = None
+_profile_lock = threading.Lock()
+
+
+def get_routing_profile() -> RoutingProfile:
+    """The process-wide profile; pending counts are written at exit"""
+    global _profile
+    if _profile is None:
+        with _profile_lock:
+            if _profile is None:
+                _profile = RoutingProfile()
+                atexit.register(_profile.save)
+    return _profile
+
+
+def main(argv=None):
+    from .intent_engine import IntentMatcher, load_spec
+
+    parser = argparse.ArgumentParser(description="Show the OM AI routing profile")
+    parser.add_argument("--spec", help="Intent spec file (default: intents.json)")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE_PATH,
+                        help="Profile file (default: OM_ROUTING_PROFILE)")
+    args = parser.parse_args(argv)
+
+    if not args.profile:
+        parser.error("no profile: pass --profile or set OM_ROUTING_PROFILE")
+    profile = load_profile(args.profile)
+    hits = profile["hits"]
+    routed = sum(hits.values())
+    rules = IntentMatcher(load_spec(args.spec)).rules
+    print(f"Profile: {routed} routed utterances, {len(hits)} intents ({args.profile})")
+    if routed:
+        print(f"Rule checks per utterance: {profile['checks'] / routed:.2f} recorded, "
+              f"{expected_checks(rules, hits):.2f} for the current spec order")
+    for intent, count in Counter(hits).most_common(15):
+        print(f"{count:8}  {intent}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+Routing Table Snapshots for OM AI
+Persists the compiled routing tables to a versioned, checksummed file that is
+memory-mapped at startup, so the routing layer loads instead of rebuilding
+
+Two kinds of sections are stored: the literal prefilters of the
+EnhancedNLPProcessor patterns, and the compiled regex programs (the sre
+bytecode re.compile produces) of every keyword-matcher and processor
+pattern. Patterns are rebuilt from their programs without parsing or
+compiling; rule order and the keyword index are cheap and rebuilt as usual.
+
+Each section is keyed by a hash of its source tables, the compiler version,
+the full interpreter version and the regex engine's MAGIC, so a patch
+release that changes the sre bytecode never loads old programs; when any of
+them changes the section is rebuilt. Programs are private sre internals, so
+any pattern that cannot be restored is compiled with re.compile instead.
+
+Snapshots live in the user's cache directory (or OM_ROUTING_SNAPSHOT), not
+in the package, and are only written when a section had to be rebuilt; a
+read-only or missing cache just means compiling as usual. Build them ahead
+of time with ``python -m <package>.routing_snapshot``.
+"""
+
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import re
+import struct
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import _sre
+except ImportError:  # Not CPython: patterns are always compiled
+    _sre = None
+
+try:
+    from re import _parser as sre_parse
+    from re import _compiler as sre_compile
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_compile
+    import sre_constants
+
+SNAPSHOT_MAGIC = b"OMRT"
+SNAPSHOT_VERSION = 1
+
+# magic, format version, payload sha256, source-table hash, payload length
+HEADER = struct.Struct("<4sH32s32sI")
+
+SNAPSHOT_FILE_NAME = "routing_tables.snapshot"
+
+# Literal runs shorter than this are too common to be a useful prefilter
+MIN_LITERAL_LENGTH = 3
+
+# Bump when pattern_program output changes to invalidate snapshots
+PATTERN_PROGRAM_VERSION = 1
+
+
+def default_snapshot_path() -> Path:
+    """OM_ROUTING_SNAPSHOT, or routing_tables.snapshot in the user's cache directory"""
+    if os.environ.get("OM_ROUTING_SNAPSHOT"):
+        return Path(os.environ["OM_ROUTING_SNAPSHOT"])
+    if sys.platform == "win32":
+        cache_dir = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        cache_dir = Path.home() / "Library" / "Caches"
+    else:
+        cache_dir = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_dir) / "om_ai" / SNAPSHOT_FILE_NAME
+
+
+def interpreter_key() -> str:
+    """Everything the stored sre programs depend on besides the pattern sources"""
+    return ":".join(str(part) for part in (
+        sys.implementation.cache_tag, sys.version, sre_constants.MAGIC,
+        getattr(_sre, "CODESIZE", None), getattr(_sre, "MAXREPEAT", None)))
+
+
+def source_hash(tables: Dict, compiler_version: int) -> bytes:
+    """Hash of the source tables, compiler version and interpreter (see interpreter_key)"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(tables, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    digest.update(f"{SNAPSHOT_VERSION}:{compiler_version}:{interpreter_key()}".encode())
+    return digest.digest()
+
+
+def write_snapshot(path, tables_hash: bytes, compiled: Dict):
+    """Write compiled tables atomically (temp file + rename)"""
+    path = Path(path)
+    payload = marshal.dumps(compiled)
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                         hashlib.sha256(payload).digest(), tables_hash, len(payload))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path, tables_hash: bytes) -> Optional[Dict]:
+    """
+    Memory-map a snapshot and return its tables if it is valid and current
+
+    Args:
+        path: Snapshot file
+        tables_hash (bytes): Expected source_hash()
+
+    Returns:
+        Optional[Dict]: Compiled tables, or None if missing, stale or corrupt
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if len(mapped) < HEADER.size:
+                return None
+            magic, version, checksum, stored_hash, length = HEADER.unpack_from(mapped, 0)
+            if (magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION
+                    or stored_hash != tables_hash or len(mapped) != HEADER.size + length):
+                return None
+            payload = memoryview(mapped)[HEADER.size:]
+            try:
+                if hashlib.sha256(payload).digest() != checksum:
+                    return None
+                return marshal.loads(payload)
+            finally:
+                payload.release()
+    except Exception:
+        # Unreadable, truncated or unmarshallable: rebuild
+        return None
+
+
+def load_compiled_tables(name: str, tables: Dict, compiler: Callable[[Dict], Dict],
+                         compiler_version: int = 1, path=None) -> Dict:
+    """
+    Load compiled routing tables from the snapshot, rebuilding them when stale
+
+    Args:
+        name (str): Section name, several table sets can share one snapshot
+        tables (Dict): Source tables (JSON-serializable)
+        compiler (Callable): Builds the compiled tables from ``tables``
+        compiler_version (int): Bump when the compiler output changes
+        path: Snapshot file (default: default_snapshot_path())
+
+    Returns:
+        Dict: Compiled tables (marshal-able plain data)
+    """
+    section_path = _section_path(path, name)
+    tables_hash = source_hash(tables, compiler_version)
+
+    compiled = read_snapshot(section_path, tables_hash)
+    if compiled is not None:
+        return compiled
+
+    compiled = compiler(tables)
+    try:
+        write_snapshot(section_path, tables_hash, compiled)
+    except (OSError, ValueError):
+        # Read-only install or cache: the tables are simply rebuilt next time
+        pass
+    return compiled
+
+
+def _section_path(path, name: str) -> Path:
+    path = Path(path or default_snapshot_path())
+    return path.with_name(f"{path.stem}.{name}{path.suffix}")
+
+
+def required_literals(pattern: str) -> List[str]:
+    """
+    Literal substrings that every match of a regex must contain
+
+    Only top-level literal runs (and runs inside mandatory groups) count;
+    anything optional, repeated or alternated is skipped, so the result is
+    a safe prefilter: if a literal is absent the regex cannot match.
+
+    Args:
+        pattern (str): Regular expression source
+
+    Returns:
+        List[str]: Lowercased literals of at least MIN_LITERAL_LENGTH chars
+    """
+    literals = []
+
+    def walk(items):
+        run = []
+        for op, value in items:
+            if op == sre_constants.LITERAL:
+                run.append(chr(value))
+                continue
+            flush(run)
+            run = []
+            if op == sre_constants.SUBPATTERN:
+                walk(value[-1])
+            elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and value[0] >= 1:
+                walk(value[2])
+        flush(run)
+
+    def flush(run):
+        literal = "".join(run).strip().lower()
+        if len(literal) >= MIN_LITERAL_LENGTH:
+            literals.append(literal)
+
+    try:
+        walk(sre_parse.parse(pattern))
+    except Exception:
+        return []
+    return literals
+
+
+def compile_intent_literals(tables: Dict) -> Dict:
+    """Compiler for EnhancedNLPProcessor pattern tables: literal prefilters per pattern"""
+    return {
+        "intent_literals": {
+            intent: [required_literals(pattern) for pattern in patterns]
+            for intent, patterns in tables["intent_patterns"].items()
+        }
+    }
+
+
+def pattern_program(source: str, flags: int = 0) -> Optional[list]:
+    """
+    The sre program re.compile builds for a pattern, as marshal-able data
+
+    Returns:
+        Optional[list]: Arguments for _sre.compile, or None if the pattern
+        cannot be compiled this way (it is then compiled normally on load)
+    """
+    try:
+        parsed = sre_parse.parse(source, flags)
+        code = sre_compile._code(parsed, flags)
+    except Exception:
+        return None
+    groupindex = dict(parsed.state.groupdict)
+    indexgroup = [None] * parsed.state.groups
+    for name, index in groupindex.items():
+        indexgroup[index] = name
+    # Opcodes are int subclasses, which marshal cannot store
+    return [source, int(flags | parsed.state.flags), [int(op) for op in code], parsed.state.groups - 1,
+            groupindex, indexgroup]
+
+
+def restore_pattern(program: Optional[list], source: str, flags: int = 0) -> re.Pattern:
+    """Rebuild a compiled pattern from pattern_program() output, or compile it"""
+    if program is not None and _sre is not None:
+        try:
+            pattern_source, pattern_flags, code, groups, groupindex, indexgroup = program
+            pattern = _sre.compile(pattern_source, pattern_flags, code, groups,
+                                   groupindex, tuple(indexgroup))
+            if pattern.pattern == source and pattern.flags & flags == flags:
+                return pattern
+        except Exception:
+            pass
+    return re.compile(source, flags)
+
+
+def compile_pattern_programs(tables: Dict) -> Dict:
+    """Compiler for regex sources: one sre program per pattern"""
+    return {"programs": [pattern_program(source, tables["flags"]) for source in tables["patterns"]]}
+
+
+def pattern_section(name: str, sources: List[str], flags: int = 0) -> tuple:
+    """Snapshot section holding the sre programs of ``sources``: (name, tables, compiler, version)"""
+    return (name, {"patterns": list(sources), "flags": int(flags)},
+            compile_pattern_programs, PATTERN_PROGRAM_VERSION)
+
+
+def load_compiled_patterns(name: str, sources: List[str], flags: int = 0,
+                           path=None) -> Dict[str, re.Pattern]:
+    """
+    Compiled regexes for ``sources``, rebuilt from their snapshotted programs
+
+    When the snapshot section matches the sources, no pattern is parsed or
+    compiled; otherwise the programs are built, written and used.
+
+    Args:
+        name (str): Snapshot section
+        sources (List[str]): Regex sources
+        flags (int): re flags shared by every pattern
+        path: Snapshot file (default: default_snapshot_path())
+
+    Returns:
+        Dict[str, re.Pattern]: Source -> compiled pattern
+    """
+    try:
+        programs = load_compiled_tables(*pattern_section(name, sources, flags), path)["programs"]
+    except Exception:
+        programs = []
+    if len(programs) != len(sources):
+        programs = [None] * len(sources)
+    return {source: restore_pattern(program, source, flags)
+            for source, program in zip(sources, programs)}
+
+
+def build_all(path=None) -> Dict[str, int]:
+    """Rebuild every routing snapshot section; returns section sizes in bytes"""
+    from .intent_engine import load_spec, matcher_snapshot_sections
+    from .nlp_processor_fixed import EnhancedNLPProcessor
+
+    processor = EnhancedNLPProcessor()
+    sizes = {}
+    sections = processor.snapshot_sections() + matcher_snapshot_sections(load_spec())
+    for name, tables, compiler, version in sections:
+        section_path = _section_path(path, name)
+        write_snapshot(section_path, source_hash(tables, version), compiler(tables))
+        sizes[str(section_path)] = section_path.stat().st_size
+    return sizes
+
+
+if __name__ == "__main__":
+    for snapshot_path, size in build_all(sys.argv[1] if len(sys.argv) > 1 else None).items():
+        print(f"✅ Wrote {snapshot_path} ({size} bytes)")
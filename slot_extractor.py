@@ -0,0 +1,181 @@
+"""
+Slot Extractor for OM AI
+Matches trigger phrases and extracts slot values (numbers, times, names)
+from one utterance without re-copying the string for every keyword
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+# Words, numbers and quoted names; Devanagari vowel signs are not \w
+TOKEN_PATTERN = re.compile(r'[\w\u0900-\u097F]+(?:[.:][\w\u0900-\u097F]+)*')
+
+QUOTED_PATTERN = re.compile(r'"([^"]+)"|\'([^\']+)\'|“([^”]+)”')
+
+AMOUNT_PATTERN = re.compile(
+    r'(?:₹|rs\.?|inr)\s*(\d+(?:\.\d+)?)|(\d+(?:\.\d+)?)\s*(?:rs|rupees?|rupaye|rupay|inr|₹)?')
+
+TASK_ID_PATTERN = re.compile(r'(?:task|id|number|#)\s*(?:id\s*)?(?:no\.?\s*)?#?\s*(\d+)')
+
+# Spoken number words, only trusted next to a unit ("das minute")
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+    'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'fifteen': 15,
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'forty-five': 45, 'sixty': 60,
+    'ek': 1, 'do': 2, 'teen': 3, 'char': 4, 'chaar': 4, 'paanch': 5,
+    'panch': 5, 'das': 10, 'pandrah': 15, 'bees': 20, 'pachees': 25,
+    'tees': 30, 'chalis': 40, 'pachas': 50
+}
+
+MINUTE_UNITS = ('minutes', 'minute', 'mins', 'min', 'minat', 'मिनट')
+HOUR_UNITS = ('hours', 'hour', 'hrs', 'hr', 'ghante', 'ghanta', 'घंटे', 'घंटा')
+
+DURATION_PATTERN = re.compile(
+    r'(?<![\w\u0900-\u097F])(\d+|' + '|'.join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r')\s*('
+    + '|'.join(MINUTE_UNITS + HOUR_UNITS) + r')(?![\w\u0900-\u097F])')
+
+_WEEKDAYS = (r'monday|tuesday|wednesday|thursday|friday|saturday|sunday|'
+             r'somvar|mangalvar|budhvar|guruvar|shukravar|shanivar|ravivar')
+_DAY_PARTS = r'morning|afternoon|evening|night|subah|dopahar|shaam|sham|raat'
+_CLOCK = r'(?:at\s+)?\d{1,2}(?::\d{2})?\s*(?:am|pm|baje|bje|o\'?clock)'
+
+# Relative time phrases, kept raw here and normalized by the scheduler intents
+RELATIVE_TIME_PATTERN = re.compile(
+    r'(?<![\w\u0900-\u097F])(?:(?:in|after)\s+\d+\s*(?:' + '|'.join(MINUTE_UNITS + HOUR_UNITS) + r'|days?|din)\b'
+    r'|\d+\s*(?:' + '|'.join(MINUTE_UNITS + HOUR_UNITS) + r'|days?|din)\s+(?:baad|bad|later|mein)\b'
+    r'|(?:(?:next|agle|agla)\s+(?:' + _WEEKDAYS + r'|week|hafte|month|mahine)'
+    r'|today|tonight|tomorrow|day after tomorrow|aaj|kal|parso|parson|' + _WEEKDAYS + r')\b'
+    r'(?:\s+(?:' + _DAY_PARTS + r'))?(?:\s+' + _CLOCK + r')?'
+    r'|(?:(?:' + _DAY_PARTS + r')\s+)?' + _CLOCK + r')')
+
+
+def _amount_match(text: str):
+    """First AMOUNT_PATTERN match that holds a number"""
+    for match in AMOUNT_PATTERN.finditer(text):
+        if match.group(1) or match.group(2):
+            return match
+    return None
+
+
+class SlotExtractor:
+    """One-pass trigger matching and slot extraction for a single utterance"""
+
+    def __init__(self, text: str, tokens: Optional[List[Tuple[str, int, int]]] = None):
+        """
+        Args:
+            text (str): Lowercased utterance
+            tokens (list): Tokens of ``text`` if already computed (Utterance.tokens)
+        """
+        self.text = text
+        self.trigger_span: Optional[Tuple[int, int]] = None
+        self._tokens = tokens
+
+    @property
+    def tokens(self) -> List[Tuple[str, int, int]]:
+        """Tokens with their character spans, computed once per utterance"""
+        if self._tokens is None:
+            self._tokens = [(m.group(), m.start(), m.end())
+                            for m in TOKEN_PATTERN.finditer(self.text)]
+        return self._tokens
+
+    def match(self, phrases) -> bool:
+        """
+        Check trigger phrases and remember where the first one matched
+
+        Args:
+            phrases (list): Trigger phrases, checked in order
+
+        Returns:
+            bool: True if any phrase occurs in the utterance
+        """
+        text = self.text
+        for phrase in phrases:
+            start = text.find(phrase)
+            if start != -1:
+                end = start + len(phrase)
+                # Swallow the rest of a partially matched word ("image" -> "images")
+                while end < len(text) and (text[end].isalnum() or '\u0900' <= text[end] <= '\u097F'):
+                    end += 1
+                self.trigger_span = (start, end)
+                return True
+        self.trigger_span = None
+        return False
+
+    def remainder(self) -> str:
+        """Utterance with the matched trigger span cut out by position"""
+        if not self.trigger_span:
+            return self.text.strip()
+        start, end = self.trigger_span
+        return " ".join((self.text[:start] + " " + self.text[end:]).split())
+
+    def strip_words(self, words) -> str:
+        """Utterance with the given whole words removed"""
+        words = set(words)
+        return " ".join(token for token, _, _ in self.tokens if token not in words)
+
+    def numbers(self) -> List[float]:
+        """All numeric tokens in the utterance"""
+        values = []
+        for token, _, _ in self.tokens:
+            try:
+                values.append(float(token))
+            except ValueError:
+                continue
+        return values
+
+    def amount(self) -> Optional[float]:
+        """Money amount such as "500", "₹500" or "500 rupees" """
+        match = _amount_match(self.text)
+        if match:
+            amount = float(match.group(1) or match.group(2))
+            return int(amount) if amount.is_integer() else amount
+        return None
+
+    def description(self, connectors=()) -> str:
+        """
+        Remainder with the money amount cut out, e.g. "lunch" from
+        "add expense 250 for lunch"
+
+        Args:
+            connectors: Words dropped where the amount leaves them dangling
+                at either end ("for", "on", "ke liye")
+        """
+        text = self.remainder()
+        match = _amount_match(text)
+        if match:
+            text = text[:match.start()] + " " + text[match.end():]
+        words = text.split()
+        connectors = set(connectors)
+        while words and words[0] in connectors:
+            words.pop(0)
+        while words and words[-1] in connectors:
+            words.pop()
+        return " ".join(words)
+
+    def minutes(self) -> Optional[int]:
+        """Duration in minutes, e.g. "15 minutes", "2 hours", "das minute" """
+        match = DURATION_PATTERN.search(self.text)
+        if not match:
+            return None
+        number, unit = match.groups()
+        value = int(number) if number.isdigit() else NUMBER_WORDS[number]
+        return value * 60 if unit in HOUR_UNITS else value
+
+    def task_id(self) -> Optional[int]:
+        """Task id such as "task 3", "id 12" or "#4" """
+        match = TASK_ID_PATTERN.search(self.text)
+        if match:
+            return int(match.group(1))
+        return None
+
+    def relative_time(self) -> Optional[str]:
+        """Raw relative time phrase such as "kal subah 7 baje" or "in 15 minutes" """
+        match = RELATIVE_TIME_PATTERN.search(self.text)
+        return match.group().strip() if match else None
+
+    def quoted(self) -> Optional[str]:
+        """Name given in quotes, e.g. add contact "Rahul" """
+        match = QUOTED_PATTERN.search(self.text)
+        if match:
+            return next(group for group in match.groups() if group).strip()
+        return None
@@ -0,0 +1,123 @@
+"""
+Tests for the plugin circuit breaker state machine
+"""
+
+import time
+
+import pytest
+
+from .. import circuit_breaker, command_handler, plugin_pool
+from ..circuit_breaker import CircuitBreaker
+
+
+def open_breaker(failure_threshold=2, reset_timeout=0.05):
+    breaker = CircuitBreaker("stub", failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+    for _ in range(failure_threshold):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("stub", failure_threshold=3, reset_timeout=10.0)
+    for _ in range(2):
+        breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.get_stats()["rejected_calls"] == 1
+    assert breaker.retry_after() > 9
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("stub", failure_threshold=2)
+    breaker.allow_request()
+    breaker.record_failure()
+    breaker.allow_request()
+    breaker.record_success()
+    breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = open_breaker()
+    time.sleep(0.06)
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+
+def test_successful_probe_closes():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    breaker.allow_request()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    breaker.allow_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.get_stats()["times_opened"] == 2
+    assert not breaker.allow_request()
+
+
+def test_skipped_probe_frees_the_slot():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow_request()
+
+    breaker.record_skipped()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+@pytest.fixture
+def isolated_breakers(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(plugin_pool, "_pools", {})
+    return circuit_breaker.get_breaker("daily_life_manager")
+
+
+def test_local_errors_do_not_count_against_the_plugin(monkeypatch, isolated_breakers):
+    def bad_due_date(value):
+        raise ValueError(f"cannot read {value!r}")
+
+    monkeypatch.setattr(command_handler, "normalize_time", bad_due_date)
+    for _ in range(isolated_breakers.failure_threshold + 1):
+        result = command_handler.handle_command("add_task", {"title": "x", "due_date": "someday"})
+
+    assert result.startswith("❌ Error")
+    assert isolated_breakers.state == CircuitBreaker.CLOSED
+    assert isolated_breakers.get_stats()["total_failures"] == 0
+
+
+def test_plugin_exceptions_count_against_the_plugin(monkeypatch, isolated_breakers):
+    def broken_storage(*args):
+        raise OSError("database is locked")
+
+    monkeypatch.setattr(command_handler, "add_personal_task",
+                        command_handler._plugin_function(broken_storage))
+    for _ in range(isolated_breakers.failure_threshold):
+        result = command_handler.handle_command("add_task", {"title": "x"})
+
+    assert type(result) is str and "database is locked" in result
+    assert isolated_breakers.state == CircuitBreaker.OPEN
@@ -0,0 +1,113 @@
+"""
+Tests for conversation turns recorded on the request path and read back as context
+"""
+
+import pytest
+
+from .. import circuit_breaker, command_handler, om_prompts, plugin_pool
+from ..conversation_buffer import ConversationBuffer, _save_to_database, turn_arguments
+
+
+class StubConversation:
+    """conversation stand-in that echoes the message it was given"""
+
+    is_fallback = False
+
+    def __init__(self):
+        self.messages = []
+
+    def chat_response(self, message):
+        self.messages.append(message)
+        return f"reply {len(self.messages)}"
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    buffer = ConversationBuffer(writer=None)
+    monkeypatch.setattr(command_handler, "conversation_buffer", buffer)
+    monkeypatch.setattr(om_prompts, "conversation_buffer", buffer)
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(plugin_pool, "_pools", {})
+    return buffer
+
+
+def test_handle_command_records_the_turn(buffer):
+    result = command_handler.handle_command(
+        "get_time", {"user_id": "asha", "utterance": "what time is it"})
+
+    (turn,) = buffer.recent_turns("asha")
+    assert (turn["query"], turn["intent"]) == ("what time is it", "get_time")
+    assert turn["response"] == result[:len(turn["response"])]
+    assert buffer.recent_turns("default_user") == []
+
+
+def test_chat_ai_gets_the_recent_turns(monkeypatch, buffer):
+    stub = StubConversation()
+    monkeypatch.setattr(command_handler, "conversation", stub)
+
+    command_handler.handle_command("chat_ai", {"user_id": "asha", "message": "who wrote godan"})
+    command_handler.handle_command("chat_ai", {"user_id": "asha", "message": "when was it published"})
+
+    assert stub.messages[0] == "who wrote godan"
+    assert "User: who wrote godan\nAssistant: reply 1" in stub.messages[1]
+    assert stub.messages[1].endswith("User: when was it published")
+
+
+def test_prompt_follows_the_topic_of_recent_turns(buffer):
+    prompts = om_prompts.OMPrompts()
+    buffer.record("asha", "help me debug this code", "chat_ai", "sure")
+
+    assert prompts.get_context_aware_prompt("and now?", user_id="asha").startswith("🔧")
+    assert prompts.get_context_aware_prompt("and now?", user_id="ravi").startswith("🎯")
+
+
+def test_turns_without_a_user_id_are_not_shared(buffer):
+    command_handler.handle_command("get_time", {"utterance": "what time is it"})
+
+    assert buffer.get_stats()["turns"] == 0
+
+
+def test_prompt_without_a_user_id_ignores_the_buffer(buffer):
+    prompts = om_prompts.OMPrompts()
+    buffer.record("default_user", "help me debug this code", "chat_ai", "sure")
+
+    assert prompts.get_context_aware_prompt("and now?").startswith("🎯")
+
+
+def test_prompt_accepts_a_string_context(buffer):
+    prompts = om_prompts.OMPrompts()
+
+    assert prompts.get_context_aware_prompt("and now?", "we were debugging code").startswith("🔧")
+    assert prompts.get_context_aware_prompt("and now?", "").startswith("🎯")
+
+
+def test_writer_arguments_follow_the_parameter_names():
+    def save(user_query, ai_response, session_id=None, user_id="x", metadata=None):
+        pass
+
+    def stub(*args):
+        pass
+
+    def needs_more(query, response, timestamp):
+        pass
+
+    assert turn_arguments(save) == {"user_query": "query", "ai_response": "response",
+                                    "session_id": "session_id"}
+    assert turn_arguments(stub) is None
+    with pytest.raises(TypeError):
+        turn_arguments(needs_more)
+
+
+def test_buffer_writes_turns_by_keyword(monkeypatch):
+    saved = []
+
+    def save_conversation_to_db(user_input, response, user_id, intent=None):
+        saved.append((user_input, response, user_id, intent))
+
+    monkeypatch.setattr(command_handler, "save_conversation_to_db", save_conversation_to_db)
+    buffer = ConversationBuffer(writer=_save_to_database)
+
+    buffer.record("asha", "what time is it", "get_time", "10:00")
+    buffer.flush()
+
+    assert saved == [("what time is it", "10:00", "asha", "get_time")]
@@ -0,0 +1,130 @@
+"""
+Tests for daily summary snapshots seeded from get_daily_summary
+"""
+
+import json
+import os
+from datetime import date
+
+import pytest
+
+from .. import circuit_breaker, command_handler, plugin_pool
+from ..daily_summaries import DEFAULT_SUMMARIES_PATH, DailySummaries, set_plugin_summary
+
+TODAY = date.today().isoformat()
+
+
+class StubPlugin:
+    """get_daily_summary stand-in backed by a list of stored task titles"""
+
+    def __init__(self):
+        self.titles = []
+        self.calls = 0
+
+    def add_task(self, title, *args):
+        self.titles.append(title)
+        return {"success": True, "task_id": len(self.titles)}
+
+    def summary(self, date=None):
+        self.calls += 1
+        return {"success": True, "date": date, "tasks_total": len(self.titles),
+                "titles": list(self.titles), "mood": "calm"}
+
+
+@pytest.fixture
+def plugin(monkeypatch):
+    plugin = StubPlugin()
+    monkeypatch.setattr(command_handler, "daily_summaries", DailySummaries(":memory:"))
+    monkeypatch.setattr(command_handler, "add_personal_task", plugin.add_task)
+    monkeypatch.setattr(command_handler, "get_daily_summary", plugin.summary)
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(plugin_pool, "_pools", {})
+    return plugin
+
+
+def summary_of(response):
+    return json.loads(response.split("\n\n", 1)[1])
+
+
+def test_first_write_seeds_from_the_plugin(plugin):
+    plugin.titles.append("written elsewhere")
+    command_handler.handle_command("add_task", {"title": "buy milk"})
+
+    result = summary_of(command_handler.handle_command("daily_summary", {}))
+
+    assert result["titles"] == ["written elsewhere", "buy milk"]
+    assert result["mood"] == "calm"
+    assert result["recorded_today"]["tasks"]["added_titles"] == ["buy milk"]
+
+
+def test_several_writes_keep_the_plugin_summary_current(plugin):
+    for title in ("a", "b", "c"):
+        command_handler.handle_command("add_task", {"title": title})
+
+    result = summary_of(command_handler.handle_command("daily_summary", {}))
+
+    assert result["tasks_total"] == 3
+    assert result["titles"] == ["a", "b", "c"]
+    assert result["recorded_today"]["tasks"]["added"] == 3
+    assert "plugin_read_at" not in result["recorded_today"]
+
+
+def test_older_plugin_read_does_not_replace_a_newer_one():
+    summaries = DailySummaries(":memory:")
+    summaries.record("u1", "add_task", {"title": "b"}, seed=lambda day: {"titles": ["a", "b"]})
+    summary = summaries._snapshot(summaries._connect(), "u1", TODAY)
+
+    set_plugin_summary(summary, {"titles": ["a"]}, summary["plugin_read_at"] - 1)
+
+    assert summary["plugin"] == {"titles": ["a", "b"]}
+
+
+def test_day_without_writes_asks_the_plugin(plugin):
+    result = summary_of(command_handler.handle_command("daily_summary", {"date": TODAY}))
+
+    assert result["titles"] == []
+    assert plugin.calls == 1
+
+
+def test_unseeded_snapshot_is_the_counts_alone():
+    summaries = DailySummaries(":memory:")
+    summaries.record("u1", "add_expense", {"amount": 5, "category": "food"},
+                     seed=lambda day: "Daily summary not available")
+
+    summary = summaries.get("u1")
+
+    assert "recorded_today" not in summary
+    assert summary["expenses"] == {"total": 5.0, "count": 1, "by_category": {"food": 5.0}}
+
+
+def test_rebuild_reconciles_with_plugin_storage():
+    summaries = DailySummaries(":memory:")
+    stored = {"tasks": ["a"]}
+    summaries.record("u1", "add_task", {"title": "a"}, seed=lambda day: dict(stored))
+    stored["tasks"].append("b")
+
+    report = summaries.rebuild(seed=lambda day: dict(stored))
+
+    assert report == {"summaries": 1, "events": 1, "reseeded": 1}
+    summary = summaries.get("u1")
+    assert summary["tasks"] == ["a", "b"]
+    assert summary["recorded_today"]["tasks"]["added"] == 1
+
+
+def test_failed_reseed_keeps_the_old_seed():
+    summaries = DailySummaries(":memory:")
+    summaries.record("u1", "add_task", {"title": "a"}, seed=lambda day: {"tasks": ["a"]})
+
+    def broken(day):
+        raise OSError("plugin storage offline")
+
+    assert summaries.rebuild(seed=broken)["reseeded"] == 0
+    assert summaries.get("u1")["tasks"] == ["a"]
+
+
+def test_snapshots_stay_in_memory_unless_configured():
+    if os.environ.get("OM_DAILY_SUMMARIES"):
+        pytest.skip("OM_DAILY_SUMMARIES is set")
+
+    assert DEFAULT_SUMMARIES_PATH is None
+    assert DailySummaries().path == ":memory:"
@@ -0,0 +1,96 @@
+"""
+Tests for JSONL data export
+"""
+
+import sqlite3
+
+import pytest
+
+from ..data_export import database_paths, export_datasets, main
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "om.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE conversation_history (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                           "user_id TEXT, query TEXT)")
+        connection.execute("CREATE TABLE knowledge_base (topic TEXT, content TEXT)")
+        connection.executemany("INSERT INTO conversation_history (user_id, query) VALUES (?, ?)",
+                               [("asha", "hello"), ("ravi", "hi"), ("asha", "time?")])
+        connection.execute("INSERT INTO knowledge_base VALUES ('om', 'OM is an assistant')")
+    return path
+
+
+def test_exports_the_tables_the_database_has(database):
+    records = list(export_datasets(database))
+
+    assert [record["dataset"] for record in records] == ["conversation_history"] * 3 + ["knowledge_base"]
+
+
+def test_missing_table_is_an_error(database):
+    with pytest.raises(ValueError, match="no table conversations"):
+        export_datasets(database, ["conversations", "knowledge_base"])
+
+
+def test_user_filter_warns_about_shared_tables(database, capsys):
+    records = list(export_datasets(database, user_id="asha"))
+
+    assert [record["record"]["query"] for record in records] == ["hello", "time?"]
+    assert "knowledge_base" in capsys.readouterr().err
+
+
+def test_cli_fails_before_writing(database, tmp_path):
+    output = tmp_path / "export.jsonl"
+
+    with pytest.raises(SystemExit):
+        main([str(output), "--database", str(database), "--tables", "memories"])
+
+    assert not output.exists()
+
+
+def test_without_rowid_tables_page_on_the_primary_key(tmp_path):
+    path = tmp_path / "tasks.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE habits (user_id TEXT, day TEXT, done INTEGER, "
+                           "PRIMARY KEY (user_id, day)) WITHOUT ROWID")
+        connection.executemany("INSERT INTO habits VALUES (?, ?, ?)",
+                               [(user, f"2026-01-0{day}", day) for user in ("asha", "ravi")
+                                for day in range(1, 6)])
+
+    records = [record["record"] for record in export_datasets(path, page_size=2)]
+    asha = [record["record"]["day"] for record in export_datasets(path, user_id="asha", page_size=2)]
+
+    assert len(records) == 10
+    assert len({(record["user_id"], record["day"]) for record in records}) == 10
+    assert asha == [f"2026-01-0{day}" for day in range(1, 6)]
+
+
+def test_rowid_tables_page_without_repeats(database):
+    records = list(export_datasets(database, ["conversation_history"], page_size=1))
+
+    assert [record["record"]["id"] for record in records] == [1, 2, 3]
+
+
+def test_every_database_is_exported_and_named(database, tmp_path, monkeypatch):
+    with sqlite3.connect(tmp_path / "memory.db") as connection:
+        connection.execute("CREATE TABLE memories (user_id TEXT, content TEXT)")
+        connection.execute("INSERT INTO memories VALUES ('asha', 'likes tea')")
+    monkeypatch.setenv("OM_DATABASE_PATH", str(database))
+
+    paths = database_paths()
+    records = list(export_datasets(paths, user_id="asha"))
+
+    assert paths == [str(database), str(tmp_path / "memory.db")]
+    assert [(record["database"], record["dataset"]) for record in records] == [
+        ("om.db", "conversation_history"), ("om.db", "conversation_history"), ("memory.db", "memories")]
+
+
+def test_table_from_any_database_can_be_requested(database, tmp_path):
+    other = tmp_path / "memory.db"
+    with sqlite3.connect(other) as connection:
+        connection.execute("CREATE TABLE memories (content TEXT)")
+
+    records = list(export_datasets([database, other], ["memories", "knowledge_base"]))
+
+    assert [record["database"] for record in records] == ["om.db"]
@@ -0,0 +1,119 @@
+"""
+Tests for request deadlines carried into plugin calls through contextvars
+"""
+
+import threading
+import time
+
+import pytest
+
+from .. import circuit_breaker, command_handler, plugin_pool
+from ..deadline import (get_deadline, remaining_budget, reset_current_deadline,
+                        set_current_deadline)
+
+
+class StubSearch:
+    """search_info stand-in that sleeps, then reports the budget it saw"""
+
+    is_fallback = False
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.seen_budgets = []
+
+    def search_web(self, query):
+        self.seen_budgets.append(remaining_budget())
+        time.sleep(self.delay)
+        return f"results for {query}"
+
+
+@pytest.fixture
+def isolated_plugins(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(plugin_pool, "_pools", {})
+    monkeypatch.setitem(command_handler.PLUGIN_TIMEOUTS, "search_info", 0.5)
+
+
+def test_timeout_param_becomes_deadline():
+    params = {"timeout": 2.0}
+    before = time.monotonic()
+
+    deadline = get_deadline(params)
+
+    assert before + 2.0 <= deadline <= time.monotonic() + 2.0
+    assert params["deadline"] == deadline
+    assert get_deadline({}) is None
+
+
+def test_current_deadline_is_scoped_by_token():
+    assert remaining_budget() is None
+    token = set_current_deadline(time.monotonic() + 1.0)
+    try:
+        assert 0.9 < remaining_budget() <= 1.0
+    finally:
+        reset_current_deadline(token)
+    assert remaining_budget() is None
+
+
+def test_current_deadline_does_not_leak_into_other_threads():
+    seen = []
+    token = set_current_deadline(time.monotonic() + 1.0)
+    try:
+        thread = threading.Thread(target=lambda: seen.append(remaining_budget()))
+        thread.start()
+        thread.join()
+    finally:
+        reset_current_deadline(token)
+
+    assert seen == [None]
+
+
+def test_expired_deadline_reads_zero():
+    token = set_current_deadline(time.monotonic() - 1.0)
+    try:
+        assert remaining_budget() == 0.0
+    finally:
+        reset_current_deadline(token)
+
+
+def test_request_deadline_reaches_plugin(monkeypatch, isolated_plugins):
+    stub = StubSearch()
+    monkeypatch.setattr(command_handler, "search_info", stub)
+
+    result = command_handler.handle_command("google_search", {"query": "om", "timeout": 0.3})
+
+    assert result == "results for om"
+    assert 0.0 < stub.seen_budgets[0] <= 0.3
+    assert remaining_budget() is None
+
+
+def test_plugin_slice_caps_unbounded_request(monkeypatch, isolated_plugins):
+    stub = StubSearch()
+    monkeypatch.setattr(command_handler, "search_info", stub)
+
+    command_handler.handle_command("google_search", {"query": "om"})
+
+    assert 0.4 < stub.seen_budgets[0] <= 0.5
+
+
+def test_delayed_plugin_is_abandoned_at_deadline(monkeypatch, isolated_plugins):
+    stub = StubSearch(delay=1.0)
+    monkeypatch.setattr(command_handler, "search_info", stub)
+    start = time.monotonic()
+
+    result = command_handler.handle_command("google_search", {"query": "om", "timeout": 0.2})
+
+    assert time.monotonic() - start < 0.6
+    assert result.startswith("⏱️ search_info took too long")
+    assert circuit_breaker.get_breaker("search_info").get_stats()["total_failures"] == 1
+
+
+def test_expired_request_skips_plugin(monkeypatch, isolated_plugins):
+    stub = StubSearch()
+    monkeypatch.setattr(command_handler, "search_info", stub)
+
+    result = command_handler.handle_command("google_search",
+                                            {"query": "om", "deadline": time.monotonic() - 1})
+
+    assert result.startswith("⏱️")
+    assert stub.seen_budgets == []
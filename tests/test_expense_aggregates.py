@@ -0,0 +1,110 @@
+"""
+Tests for running expense aggregates behind expense_summary
+"""
+
+import json
+import os
+from datetime import date
+
+import pytest
+
+from .. import circuit_breaker, command_handler, plugin_pool
+from ..expense_aggregates import DEFAULT_AGGREGATES_PATH, ExpenseAggregates, learn_layout
+
+TODAY = date.today().isoformat()
+
+
+@pytest.fixture
+def aggregates(monkeypatch):
+    aggregates = ExpenseAggregates(":memory:")
+    monkeypatch.setattr(command_handler, "expense_aggregates", aggregates)
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(plugin_pool, "_pools", {})
+    return aggregates
+
+
+def summary_of(response):
+    return json.loads(response.split("\n\n", 1)[1])
+
+
+class StubExpensePlugin:
+    """get_expense_summary stand-in with its own reply layout"""
+
+    def __init__(self, expenses, extra=None):
+        self.expenses = expenses
+        self.extra = extra or {}
+        self.calls = 0
+
+    def __call__(self, period):
+        self.calls += 1
+        categories = {}
+        for _, category, amount in self.expenses:
+            categories[category] = categories.get(category, 0) + amount
+        return dict({"success": True, "period": period, "total_spent": sum(categories.values()),
+                     "entries": len(self.expenses), "categories": categories}, **self.extra)
+
+
+def test_seeded_summary_answers_in_the_learned_plugin_layout(monkeypatch, aggregates):
+    expenses = [(TODAY, "food", 120.5), (TODAY, "travel", 40), (TODAY, "food", 9.5)]
+    plugin = StubExpensePlugin(expenses)
+    monkeypatch.setattr(command_handler, "get_expense_summary", plugin)
+    aggregates.rebuild(expenses)
+
+    first = summary_of(command_handler.handle_command("expense_summary", {"period": "month"}))
+    aggregates.record(30, "travel")
+    expenses.append((TODAY, "travel", 30))
+    second = summary_of(command_handler.handle_command("expense_summary", {"period": "month"}))
+
+    assert plugin.calls == 1
+    assert second == plugin("month")
+    assert list(second) == list(first)
+    assert second["total_spent"] == 200.0
+
+
+def test_reply_with_underivable_fields_keeps_asking_the_plugin(monkeypatch, aggregates):
+    expenses = [(TODAY, "food", 10)]
+    plugin = StubExpensePlugin(expenses, extra={"average_per_day": 0.33})
+    monkeypatch.setattr(command_handler, "get_expense_summary", plugin)
+    aggregates.rebuild(expenses)
+
+    for _ in range(2):
+        result = summary_of(command_handler.handle_command("expense_summary", {"period": "month"}))
+
+    assert plugin.calls == 2
+    assert result["average_per_day"] == 0.33
+
+
+def test_unseeded_summary_asks_the_plugin(monkeypatch, aggregates):
+    monkeypatch.setattr(command_handler, "get_expense_summary",
+                        lambda period: {"success": True, "period": period, "source": "plugin"})
+
+    result = summary_of(command_handler.handle_command("expense_summary", {"period": "week"}))
+
+    assert result["source"] == "plugin"
+
+
+def test_unknown_period_goes_to_the_plugin_without_tripping_the_breaker(monkeypatch, aggregates):
+    monkeypatch.setattr(command_handler, "get_expense_summary",
+                        lambda period: {"success": True, "period": period, "source": "plugin"})
+    aggregates.rebuild([(TODAY, "food", 10)])
+
+    for _ in range(circuit_breaker.get_breaker("daily_life_manager").failure_threshold + 1):
+        result = summary_of(command_handler.handle_command("expense_summary", {"period": "weekly"}))
+
+    assert result == {"success": True, "period": "weekly", "source": "plugin"}
+    assert circuit_breaker.get_breaker("daily_life_manager").state == "closed"
+
+
+def test_layout_is_not_learned_from_ambiguous_replies():
+    summary = ExpenseAggregates(":memory:").summary("month")
+
+    assert learn_layout({"total": 0, "count": 0}, summary) is None
+    assert learn_layout("Expense summary not available", summary) is None
+
+
+def test_buckets_stay_in_memory_unless_configured():
+    if os.environ.get("OM_EXPENSE_AGGREGATES"):
+        pytest.skip("OM_EXPENSE_AGGREGATES is set")
+
+    assert DEFAULT_AGGREGATES_PATH is None
+    assert ExpenseAggregates().path == ":memory:"
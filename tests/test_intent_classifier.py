@@ -0,0 +1,98 @@
+"""
+Tests for the local intent classifier and its stage in the router
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from .. import intent_classifier, intent_router
+from ..intent_classifier import (IntentClassifier, evaluate, get_classifier, split_examples,
+                                 train, training_examples)
+from ..intent_router import IntentRouter
+
+EXAMPLES = [
+    ("what time is it", "get_time"), ("tell me the time", "get_time"),
+    ("current time please", "get_time"), ("time now", "get_time"),
+    ("play some music", "play_music"), ("play a song", "play_music"),
+    ("put on music", "play_music"), ("start the music", "play_music"),
+]
+
+
+class StubClassifier:
+    """Classifier stand-in with a fixed prediction"""
+
+    def __init__(self, intent, probability):
+        self.intent = intent
+        self.probability = probability
+
+    def predict(self, text):
+        return self.intent, self.probability
+
+
+def test_predicts_trained_intents():
+    model = train(EXAMPLES, epochs=100)
+
+    assert model.predict("what is the time")[0] == "get_time"
+    assert model.predict("play music")[0] == "play_music"
+    assert evaluate(model, EXAMPLES)["accuracy"] == 1.0
+
+
+def test_saved_model_loads_back(tmp_path):
+    model = train(EXAMPLES, epochs=20)
+    path = tmp_path / "model.npz"
+
+    model.save(path)
+    loaded = IntentClassifier.load(path)
+
+    assert loaded.labels == model.labels
+    assert loaded.predict("play a song") == model.predict("play a song")
+
+
+def test_balanced_training_gives_the_small_intent_more_weight():
+    topics = "python rust java ruby perl lisp rome paris oslo lima rain snow moon mars".split()
+    examples = [(f"what is {topic}", "google_search") for topic in topics] * 3
+    examples += [("what is up", "chat_ai"), ("what is new with you", "chat_ai")]
+
+    balanced = train(examples, epochs=100).predict_proba("what is")
+    unbalanced = train(examples, epochs=100, balanced=False).predict_proba("what is")
+
+    # Labels are sorted: chat_ai, google_search
+    assert balanced[0] > 2 * unbalanced[0]
+
+
+def test_split_holds_out_from_every_intent_but_keeps_one_to_train():
+    examples = training_examples()
+
+    training, held_out = split_examples(examples, 0.2)
+
+    assert sorted(training + held_out) == sorted(examples)
+    assert {intent for _, intent in training} == {intent for _, intent in examples}
+    assert len(held_out) >= len(examples) // 10
+
+
+def test_confident_prediction_replaces_the_fallback(monkeypatch):
+    monkeypatch.setattr(intent_router, "get_classifier", lambda: StubClassifier("get_time", 0.9))
+
+    result = IntentRouter(classifier_threshold=0.6).route_with_details("zzqx blorp")
+
+    assert result["stage"] == "classifier"
+    assert result["intent"] == "get_time"
+
+
+def test_prediction_below_threshold_falls_back(monkeypatch):
+    monkeypatch.setattr(intent_router, "get_classifier", lambda: StubClassifier("get_time", 0.5))
+
+    result = IntentRouter(classifier_threshold=0.6).route_with_details("zzqx blorp")
+
+    assert result["stage"] == "fallback"
+    assert result["intent"] == "chat_ai"
+
+
+def test_without_a_model_the_router_falls_back(monkeypatch, tmp_path):
+    monkeypatch.setattr(intent_classifier, "DEFAULT_MODEL_PATH", tmp_path / "missing.npz")
+    monkeypatch.setattr(intent_classifier, "_classifier", None)
+    monkeypatch.setattr(intent_classifier, "_classifier_loaded", False)
+
+    assert get_classifier() is None
+    assert IntentRouter().route_with_details("zzqx blorp")["stage"] == "fallback"
@@ -0,0 +1,70 @@
+"""
+Tests for hot reloading the intent spec
+"""
+
+import json
+
+import pytest
+
+from .. import intent_engine, nlp_processor_fixed
+from ..intent_engine import DEFAULT_SPEC_PATH, get_matcher, reload_intents
+
+
+def load_default_spec():
+    with open(DEFAULT_SPEC_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def bad_regex_in_rule(spec):
+    spec["rules"][0]["regex"] = "(unclosed"
+
+
+def bad_regex_in_patterns(spec):
+    next(iter(spec["patterns"].values())).append("[unclosed")
+
+
+def missing_rules(spec):
+    del spec["rules"]
+
+
+@pytest.fixture
+def live_state():
+    return get_matcher(), nlp_processor_fixed.nlp_processor
+
+
+def assert_still_live(live_state):
+    matcher, processor = live_state
+    assert intent_engine.get_matcher() is matcher
+    assert nlp_processor_fixed.nlp_processor is processor
+
+
+def test_malformed_file_keeps_the_current_matcher(tmp_path, live_state):
+    path = tmp_path / "bad.json"
+    path.write_text('{"rules": [', encoding="utf-8")
+
+    report = reload_intents(path).result()
+
+    assert report["reloaded"] is False
+    assert "JSONDecodeError" in report["errors"][0]
+    assert_still_live(live_state)
+
+
+def test_missing_file_keeps_the_current_matcher(tmp_path, live_state):
+    report = reload_intents(tmp_path / "missing.json").result()
+
+    assert report["reloaded"] is False
+    assert_still_live(live_state)
+
+
+@pytest.mark.parametrize("break_spec", [bad_regex_in_rule, bad_regex_in_patterns, missing_rules])
+def test_spec_that_does_not_compile_keeps_the_current_matcher(tmp_path, live_state, break_spec):
+    spec = load_default_spec()
+    break_spec(spec)
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps(spec), encoding="utf-8")
+
+    report = reload_intents(path).result()
+
+    assert report["reloaded"] is False
+    assert report["errors"]
+    assert_still_live(live_state)
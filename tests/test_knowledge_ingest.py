@@ -0,0 +1,100 @@
+"""
+Tests for bulk knowledge ingestion into SQLite
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from .. import knowledge_ingest
+from ..knowledge_ingest import ingest
+
+
+def write_pack(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for number in range(count):
+            f.write(json.dumps({"content": f"Fact {number}. More detail."}) + "\n")
+    return path
+
+
+def index_names(database):
+    with sqlite3.connect(database) as connection:
+        return {name for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'knowledge_base'")}
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "om.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute(knowledge_ingest.CREATE_TABLE_SQL)
+        connection.execute("CREATE INDEX idx_knowledge_source ON knowledge_base(source)")
+    return path
+
+
+def test_rows_land_and_indexes_are_rebuilt(tmp_path, database):
+    report = ingest(write_pack(tmp_path / "pack.jsonl", 25), batch_size=10, database_path=database)
+
+    assert (report["written"], report["batches"]) == (25, 3)
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("SELECT topic FROM knowledge_base ORDER BY id LIMIT 1").fetchone() == ("Fact 0",)
+    assert index_names(database) == {"idx_knowledge_source"}
+
+
+def test_failed_load_keeps_indexes(monkeypatch, tmp_path, database):
+    def failing_records(*args):
+        yield ("topic", "content", "source")
+        raise OSError("disk went away")
+
+    monkeypatch.setattr(knowledge_ingest, "read_records", failing_records)
+
+    with pytest.raises(OSError):
+        ingest(tmp_path / "pack.jsonl", batch_size=1, database_path=database)
+
+    assert index_names(database) == {"idx_knowledge_source"}
+
+
+def test_unexpected_schema_is_rejected_before_any_change(tmp_path):
+    database = tmp_path / "other.db"
+    with sqlite3.connect(database) as connection:
+        connection.execute("CREATE TABLE knowledge_base (id INTEGER PRIMARY KEY, title TEXT, body TEXT)")
+        connection.execute("CREATE INDEX idx_title ON knowledge_base(title)")
+
+    with pytest.raises(ValueError, match="no topic, content column"):
+        ingest(write_pack(tmp_path / "pack.jsonl", 3), database_path=database)
+
+    assert index_names(database) == {"idx_title"}
+
+
+def test_table_without_source_column(tmp_path):
+    database = tmp_path / "lean.db"
+    with sqlite3.connect(database) as connection:
+        connection.execute("CREATE TABLE knowledge_base (topic TEXT NOT NULL, content TEXT NOT NULL)")
+
+    assert ingest(write_pack(tmp_path / "pack.jsonl", 3), database_path=database)["written"] == 3
+    assert index_names(database) == set()
+
+
+def test_new_table_gets_the_default_indexes(tmp_path):
+    database = tmp_path / "new.db"
+
+    ingest(write_pack(tmp_path / "pack.jsonl", 3), database_path=database)
+
+    assert index_names(database) == {"idx_knowledge_topic"}
+
+
+def test_bad_byte_part_way_commits_nothing(tmp_path, database):
+    pack = tmp_path / "pack.csv"
+    with open(pack, "wb") as f:
+        f.write(b"topic,content\n")
+        for number in range(3000):
+            line = f"t{number},Fact {number}.\n".encode()
+            f.write(line.replace(b"Fact", b"F\xffct") if number == 2900 else line)
+
+    with pytest.raises(UnicodeDecodeError):
+        ingest(pack, batch_size=100, database_path=database)
+
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM knowledge_base").fetchone() == (0,)
+    assert index_names(database) == {"idx_knowledge_source"}
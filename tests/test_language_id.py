@@ -0,0 +1,28 @@
+"""
+Tests for the n-gram language identifier and its short-text fallback
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from ..language_handler import LanguageHandler
+from ..language_id import get_language_identifier
+
+TEXTS = ["what is the weather today", "mausam kaisa hai aaj", "आज मौसम कैसा है",
+         "light on kar do please", "google par python search karo", "", "!!"]
+
+
+def test_single_text_path_agrees_with_batch():
+    identifier = get_language_identifier()
+
+    assert [identifier.detect(text) for text in TEXTS] == identifier.detect_batch(TEXTS)
+
+
+@pytest.mark.parametrize("text", ["hi", "ok", "hello there"])
+def test_short_texts_use_the_rules(text):
+    rules, ngram = LanguageHandler("rules"), LanguageHandler("ngram")
+
+    assert ngram.detect_language(text) == rules.detect_language(text)
+    assert ngram.detect_languages([text, "what is the weather today"]) == [
+        rules.detect_language(text), "english"]
@@ -0,0 +1,115 @@
+"""
+Tests for per-plugin thread pools in handle_command
+"""
+
+import threading
+import time
+
+import pytest
+
+from .. import circuit_breaker, command_handler, plugin_pool
+from ..plugin_pool import PluginBusyError, PluginPool
+
+
+class HangingSearch:
+    """search_info stand-in whose calls block until released"""
+
+    is_fallback = False
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def search_web(self, query):
+        self.release.wait(5)
+        return f"results for {query}"
+
+
+class StubDailyLife:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, date=None):
+        self.calls += 1
+        return [{"title": "buy milk"}]
+
+
+@pytest.fixture
+def hanging_search(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(plugin_pool, "_pools", {})
+    monkeypatch.setitem(command_handler.PLUGIN_TIMEOUTS, "search_info", 0.1)
+    search = HangingSearch()
+    monkeypatch.setattr(command_handler, "search_info", search)
+    yield search
+    search.release.set()
+
+
+def test_hung_plugin_does_not_starve_others(monkeypatch, hanging_search):
+    get_tasks = StubDailyLife()
+    monkeypatch.setattr(command_handler, "get_daily_tasks", get_tasks)
+    circuit_breaker.get_breaker("search_info").failure_threshold = 100
+
+    # More abandoned calls than search_info has threads
+    for _ in range(plugin_pool.PLUGIN_WORKERS["search_info"] + 2):
+        command_handler.handle_command("google_search", {"query": "om"})
+
+    start = time.monotonic()
+    result = command_handler.handle_command("get_tasks", {})
+
+    assert time.monotonic() - start < 0.5
+    assert "buy milk" in result
+    assert circuit_breaker.get_breaker("daily_life_manager").get_stats()["total_failures"] == 0
+
+
+def test_waiting_for_a_thread_is_not_a_plugin_failure(hanging_search):
+    breaker = circuit_breaker.get_breaker("search_info")
+    breaker.failure_threshold = 100
+    workers = plugin_pool.PLUGIN_WORKERS["search_info"]
+    for _ in range(workers):
+        command_handler.handle_command("google_search", {"query": "om"})
+
+    result = command_handler.handle_command("google_search", {"query": "om", "timeout": 0.05})
+
+    assert "is busy" in result
+    assert breaker.get_stats()["total_failures"] == workers
+
+
+def test_slice_starts_when_call_runs(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(plugin_pool, "_pools", {"search_info": PluginPool("search_info", 1)})
+    monkeypatch.setitem(command_handler.PLUGIN_TIMEOUTS, "search_info", 0.3)
+
+    class SlowThenFast:
+        is_fallback = False
+
+        def search_web(self, query):
+            time.sleep(0.25 if query == "slow" else 0.15)
+            return query
+
+    monkeypatch.setattr(command_handler, "search_info", SlowThenFast())
+    results = {}
+    slow = threading.Thread(target=lambda: results.setdefault(
+        "slow", command_handler.handle_command("google_search", {"query": "slow"})))
+    slow.start()
+    time.sleep(0.05)
+
+    # Waits ~0.2s for the only thread, then still gets its full 0.3s slice
+    results["fast"] = command_handler.handle_command("google_search", {"query": "fast"})
+    slow.join()
+
+    assert results == {"slow": "slow", "fast": "fast"}
+
+
+def test_full_pool_rejects_until_a_thread_frees():
+    pool = PluginPool("stub", max_workers=1)
+    blocker = threading.Event()
+    running = pool.submit(blocker.wait, 5)
+
+    with pytest.raises(PluginBusyError):
+        pool.submit(lambda: None)
+    assert not pool.wait_for_thread(0.01)
+
+    blocker.set()
+    running.result(timeout=1)
+    assert pool.wait_for_thread(1)
+    assert pool.get_stats()["in_use"] == 0
@@ -0,0 +1,195 @@
+"""
+Tests for request hedging with delayed stub providers
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import pytest
+
+from ..request_hedging import HedgePolicy, run_hedged
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that keeps every future it hands out"""
+
+    def __init__(self, max_workers=2):
+        super().__init__(max_workers=max_workers)
+        self.futures = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = super().submit(fn, *args, **kwargs)
+        self.futures.append(future)
+        return future
+
+
+def delayed(seconds, result=None, error=None, calls=None):
+    """Stub provider that answers (or raises) after ``seconds``"""
+    def provider():
+        if calls is not None:
+            calls.append(time.monotonic())
+        time.sleep(seconds)
+        if error:
+            raise error
+        return result
+    return provider
+
+
+@pytest.fixture
+def executor():
+    pool = RecordingExecutor()
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def test_fast_primary_does_not_hedge(executor):
+    policy = HedgePolicy("google_search", initial_delay=0.2)
+    alternate_calls = []
+
+    result = run_hedged(policy, delayed(0.01, "primary"), delayed(0, "alternate", calls=alternate_calls),
+                        executor, timeout=1.0)
+
+    assert result == "primary"
+    assert policy.hedges_fired == 0
+    assert alternate_calls == []
+    assert len(executor.futures) == 1
+
+
+def test_hedge_fires_after_delay_threshold(executor):
+    policy = HedgePolicy("google_search", initial_delay=0.05, min_delay=0.05)
+    alternate_calls = []
+    start = time.monotonic()
+
+    result = run_hedged(policy, delayed(0.5, "primary"), delayed(0, "alternate", calls=alternate_calls),
+                        executor, timeout=2.0)
+
+    assert result == "alternate"
+    assert policy.hedges_fired == 1
+    assert policy.hedge_wins == 1
+    assert alternate_calls and alternate_calls[0] - start >= 0.05
+
+
+def test_hedge_delay_follows_latency_percentile():
+    policy = HedgePolicy("google_search", percentile=0.9, min_samples=10, min_delay=0.0)
+    for latency in range(1, 11):
+        policy.record_latency(latency / 100)
+
+    assert policy.hedge_delay() == pytest.approx(0.10)
+
+
+def test_first_result_wins_and_loser_is_left_alone():
+    class QueueingExecutor(RecordingExecutor):
+        """Runs the first call; later calls never start"""
+
+        def submit(self, fn, *args, **kwargs):
+            if self.futures:
+                future = Future()
+                self.futures.append(future)
+                return future
+            return super().submit(fn, *args, **kwargs)
+
+    executor = QueueingExecutor()
+    policy = HedgePolicy("google_search", initial_delay=0.05, min_delay=0.05)
+    try:
+        result = run_hedged(policy, delayed(0.2, "primary"), delayed(0, "alternate"),
+                            executor, timeout=2.0)
+    finally:
+        executor.shutdown(wait=True)
+
+    _, second = executor.futures
+    assert result == "primary"
+    assert policy.hedges_fired == 1
+    assert policy.hedge_wins == 0
+    assert not second.cancelled()
+
+
+def test_running_loser_result_is_discarded(executor):
+    policy = HedgePolicy("google_search", initial_delay=0.05, min_delay=0.05)
+    loser_finished = threading.Event()
+
+    def slow_primary():
+        time.sleep(0.3)
+        loser_finished.set()
+        return "primary"
+
+    result = run_hedged(policy, slow_primary, delayed(0.01, "alternate"), executor, timeout=2.0)
+
+    assert result == "alternate"
+    assert not loser_finished.is_set()
+
+
+def test_success_beats_failure_finishing_in_the_same_wait():
+    class FinishTogether(RecordingExecutor):
+        """Hands out futures that both complete when the second is submitted"""
+
+        def submit(self, fn, *args, **kwargs):
+            self.futures.append(Future())
+            if len(self.futures) == 2:
+                first, second = self.futures
+                first.set_exception(RuntimeError("primary down"))
+                second.set_result("alternate")
+            return self.futures[-1]
+
+    for _ in range(20):
+        executor = FinishTogether()
+        policy = HedgePolicy("google_search", initial_delay=0.01, min_delay=0.01)
+        try:
+            assert run_hedged(policy, lambda: None, lambda: None, executor, timeout=1.0) == "alternate"
+        finally:
+            executor.shutdown(wait=True)
+
+
+def test_primary_answers_when_alternate_raises(executor):
+    policy = HedgePolicy("google_search", initial_delay=0.05, min_delay=0.05)
+
+    result = run_hedged(policy, delayed(0.2, "primary"),
+                        delayed(0, error=RuntimeError("alternate down")), executor, timeout=2.0)
+
+    assert result == "primary"
+    assert policy.hedges_fired == 1
+    assert policy.hedge_wins == 0
+
+
+def test_alternate_answers_when_primary_raises(executor):
+    policy = HedgePolicy("google_search", initial_delay=0.05, min_delay=0.05)
+
+    result = run_hedged(policy, delayed(0.1, error=RuntimeError("primary down")),
+                        delayed(0.2, "alternate"), executor, timeout=2.0)
+
+    assert result == "alternate"
+
+
+def test_failed_result_does_not_beat_pending_attempt(executor):
+    policy = HedgePolicy("google_search", initial_delay=0.05, min_delay=0.05)
+
+    result = run_hedged(policy, delayed(0.3, "primary"), delayed(0, "❌ Error: quota"),
+                        executor, timeout=2.0, is_failure=lambda r: r.startswith("❌ Error"))
+
+    assert result == "primary"
+
+
+def test_timeout_when_no_attempt_answers(executor):
+    policy = HedgePolicy("google_search", initial_delay=0.05, min_delay=0.05)
+
+    with pytest.raises(FutureTimeoutError):
+        run_hedged(policy, delayed(0.5, "primary"), delayed(0.5, "alternate"), executor, timeout=0.15)
+
+
+def test_no_hedge_without_spare_thread():
+    class FullAfterFirst(RecordingExecutor):
+        def submit(self, fn, *args, **kwargs):
+            if self.futures:
+                raise RuntimeError("no free thread")
+            return super().submit(fn, *args, **kwargs)
+
+    executor = FullAfterFirst()
+    policy = HedgePolicy("google_search", initial_delay=0.05, min_delay=0.05)
+    try:
+        result = run_hedged(policy, delayed(0.2, "primary"), delayed(0, "alternate"),
+                            executor, timeout=2.0)
+    finally:
+        executor.shutdown(wait=True)
+
+    assert result == "primary"
+    assert policy.hedges_fired == 0
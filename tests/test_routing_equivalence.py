@@ -0,0 +1,49 @@
+"""
+Routing equivalence: utterances must keep the intent they routed to before
+transliteration canonicalization and routing profiles were added
+"""
+
+import pytest
+
+from ..nlp_processor import process_command
+from ..time_parser import parse_time_phrase
+from ..transliteration import canonicalize
+
+ROUTES = {
+    # Specific network rules win over check_internet
+    "check network speed": "network_speed",
+    "network speed check karo": "network_speed",
+    "check network info": "network_info",
+    "network info batao": "network_info",
+    "network information dekho": "network_info",
+    "diagnose network and check status": "diagnose_network",
+    "wifi networks dekho": "show_wifi",
+    "network check": "chat_ai",
+    # check_internet itself, in both scripts
+    "check internet": "check_internet",
+    "check internet connection": "check_internet",
+    "इंटरनेट चेक करो": "check_internet",
+    "नेटवर्क चेक करो": "check_internet",
+    "नेटवर्क स्टेटस": "check_internet",
+    # Names are not time words outside the time parser
+    "meeting with parson": "chat_ai",
+    "sham ko yaad dilao": "chat_ai",
+}
+
+
+@pytest.mark.parametrize("utterance, intent", sorted(ROUTES.items()))
+def test_route_is_unchanged(utterance, intent):
+    assert process_command(utterance)[0] == intent
+
+
+@pytest.mark.parametrize("text", ["www.google.com kholo", "open https://www.example.com/path"])
+def test_urls_are_not_collapsed(text):
+    assert canonicalize(text) == text
+
+
+def test_elongation_still_collapses():
+    assert canonicalize("hiii helloooo") == "hi hello"
+
+
+def test_time_parser_reads_name_spellings_as_time_words():
+    assert parse_time_phrase("parson sham") == parse_time_phrase("parso shaam")
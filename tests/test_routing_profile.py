@@ -0,0 +1,68 @@
+"""
+Tests for the routing profile counts
+"""
+
+import json
+import threading
+
+from ..routing_profile import PROFILE_FORMAT_VERSION, RoutingProfile, load_profile
+
+
+def test_counts_are_merged_into_the_file(tmp_path):
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps({"version": PROFILE_FORMAT_VERSION,
+                                "hits": {"greeting": 5}, "checks": 20}), encoding="utf-8")
+    profile = RoutingProfile(path, flush_every=3)
+
+    for intent in ("greeting", "get_time", "greeting"):
+        profile.record(intent, checks=2)
+
+    assert load_profile(path) == {"hits": {"greeting": 7, "get_time": 1}, "checks": 26}
+    assert profile.get_stats()["checks_per_utterance"] == 2.0
+
+
+def test_paused_profile_does_not_count(tmp_path):
+    profile = RoutingProfile(None)
+
+    with profile.paused():
+        profile.record("greeting", checks=1)
+
+    assert profile.get_stats()["routed"] == 0
+
+
+def test_record_is_not_blocked_by_a_slow_write(monkeypatch, tmp_path):
+    profile = RoutingProfile(tmp_path / "profile.json", flush_every=1000)
+    profile.record("greeting", checks=1)
+    writing, release = threading.Event(), threading.Event()
+
+    def slow_dump(*args, **kwargs):
+        writing.set()
+        release.wait(5)
+
+    monkeypatch.setattr(json, "dump", slow_dump)
+    saver = threading.Thread(target=profile.save)
+    saver.start()
+    writing.wait(5)
+
+    recorded = threading.Thread(target=profile.record, args=("get_time", 1))
+    recorded.start()
+    recorded.join(1)
+    done = not recorded.is_alive()
+    release.set()
+    saver.join()
+
+    assert done
+    assert profile.get_stats()["routed"] == 2
+
+
+def test_failed_write_keeps_the_pending_counts(tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("", encoding="utf-8")
+    profile = RoutingProfile(blocker / "profile.json", flush_every=1000)
+    profile.record("greeting", checks=1)
+
+    profile.save()
+    profile.path = tmp_path / "profile.json"
+    profile.save()
+
+    assert load_profile(profile.path)["hits"] == {"greeting": 1}
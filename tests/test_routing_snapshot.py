@@ -0,0 +1,95 @@
+"""
+Tests for routing snapshots of compiled regex programs
+"""
+
+import re
+import sys
+from pathlib import Path
+
+from .. import routing_snapshot
+from ..intent_engine import load_spec, matcher_pattern_sources
+from ..routing_snapshot import (load_compiled_patterns, pattern_program, restore_pattern,
+                                sre_constants)
+
+
+def test_restored_patterns_match_like_compiled_ones(tmp_path):
+    sources = matcher_pattern_sources(load_spec())[:40] + [r"(?P<city>\w+) ka mausam"]
+    texts = ["light on karo", "delhi ka mausam", "weather in pune", "set alarm for 7"]
+
+    built = load_compiled_patterns("test", sources, re.IGNORECASE, path=tmp_path / "t.snapshot")
+    loaded = load_compiled_patterns("test", sources, re.IGNORECASE, path=tmp_path / "t.snapshot")
+
+    assert list(tmp_path.iterdir())
+    for source in sources:
+        expected = re.compile(source, re.IGNORECASE)
+        assert loaded[source].flags == expected.flags
+        assert loaded[source].groupindex == expected.groupindex
+        for text in texts:
+            for patterns in (built, loaded):
+                found, wanted = patterns[source].search(text), expected.search(text)
+                assert (found and found.span()) == (wanted and wanted.span())
+
+
+def test_unusable_program_falls_back_to_compiling():
+    program = pattern_program("light (on|off)")
+    program[0] = "something else"
+
+    pattern = restore_pattern(program, "light (on|off)")
+
+    assert pattern.pattern == "light (on|off)"
+    assert pattern.search("light off").group(1) == "off"
+
+
+def test_interpreter_change_rebuilds_the_section(monkeypatch, tmp_path):
+    path = tmp_path / "t.snapshot"
+    builds = []
+
+    def compiler(tables):
+        builds.append(tables)
+        return {"value": len(builds)}
+
+    routing_snapshot.load_compiled_tables("keyed", {"a": 1}, compiler, path=path)
+    routing_snapshot.load_compiled_tables("keyed", {"a": 1}, compiler, path=path)
+    monkeypatch.setattr(routing_snapshot, "interpreter_key", lambda: "3.12.99:other-magic")
+    routing_snapshot.load_compiled_tables("keyed", {"a": 1}, compiler, path=path)
+
+    assert len(builds) == 2
+
+
+def test_key_includes_regex_magic_and_full_version():
+    key = routing_snapshot.interpreter_key()
+
+    assert str(sre_constants.MAGIC) in key
+    assert sys.version in key
+
+
+def test_unwritable_cache_still_compiles(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("", encoding="utf-8")
+
+    patterns = load_compiled_patterns("ro", ["light (on|off)"], path=blocker / "t.snapshot")
+
+    assert patterns["light (on|off)"].search("light on").group(1) == "on"
+
+
+def test_load_error_falls_back_to_compiling(monkeypatch, tmp_path):
+    def broken(*args, **kwargs):
+        raise RuntimeError("bad snapshot")
+
+    monkeypatch.setattr(routing_snapshot, "load_compiled_tables", broken)
+
+    patterns = load_compiled_patterns("broken", ["light (on|off)"], path=tmp_path / "t.snapshot")
+
+    assert patterns["light (on|off)"].search("light off").group(1) == "off"
+
+
+def test_default_path_is_in_the_user_cache(monkeypatch, tmp_path):
+    monkeypatch.delenv("OM_ROUTING_SNAPSHOT", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+    path = routing_snapshot.default_snapshot_path()
+
+    assert tmp_path in path.parents
+    assert Path(routing_snapshot.__file__).parent not in path.parents
@@ -0,0 +1,34 @@
+"""
+Tests for slot values extracted from one utterance
+"""
+
+import pytest
+
+from ..nlp_processor import process_command
+from ..slot_extractor import SlotExtractor
+
+
+@pytest.mark.parametrize("utterance, amount, description", [
+    ("add expense 250 for food", 250, "food"),
+    ("add expense ₹250 for lunch with team", 250, "lunch with team"),
+    ("money spent 40 on bus", 40, "bus"),
+    ("add expense for taxi 300 rupees", 300, "taxi"),
+    ("chai ke liye 20 kharcha add", 20, "chai"),
+])
+def test_expense_description_leaves_out_the_amount(utterance, amount, description):
+    intent, params = process_command(utterance)
+
+    assert intent == "add_expense"
+    assert params["amount"] == amount
+    assert params["description"] == description
+
+
+def test_expense_without_a_description_leaves_it_out():
+    assert process_command("kharcha add 500")[1] == {"amount": 500, "category": "general"}
+
+
+def test_description_keeps_connectors_inside_the_text():
+    slots = SlotExtractor("add expense 99 for coffee for two")
+    slots.match(["add expense"])
+
+    assert slots.description(["for"]) == "coffee for two"
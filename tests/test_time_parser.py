@@ -0,0 +1,47 @@
+"""
+Tests for natural language time phrases and durations
+"""
+
+from datetime import datetime
+
+from ..time_parser import parse_duration_minutes, parse_time_phrase
+
+MORNING = datetime(2026, 3, 10, 8, 0)
+EARLY = datetime(2026, 3, 10, 3, 0)
+
+
+def test_bare_hour_is_pm_with_or_without_a_day():
+    assert parse_time_phrase("at 5", MORNING) == "2026-03-10 17:00:00"
+    assert parse_time_phrase("at 5", EARLY) == "2026-03-10 17:00:00"
+    assert parse_time_phrase("tomorrow at 5", MORNING) == "2026-03-11 17:00:00"
+    assert parse_time_phrase("kal 5 baje", MORNING) == "2026-03-11 17:00:00"
+
+
+def test_explicit_morning_keeps_the_am_hour():
+    assert parse_time_phrase("tomorrow at 5 am", MORNING) == "2026-03-11 05:00:00"
+    assert parse_time_phrase("kal subah 5 baje", MORNING) == "2026-03-11 05:00:00"
+    assert parse_time_phrase("tomorrow at 9", MORNING) == "2026-03-11 09:00:00"
+
+
+def test_passed_hour_without_a_day_is_tomorrow():
+    assert parse_time_phrase("at 9", datetime(2026, 3, 10, 10, 0)) == "2026-03-11 09:00:00"
+
+
+def test_decimal_durations():
+    assert parse_duration_minutes("1.5") == 2
+    assert parse_duration_minutes("1.5 hours") == 90
+    assert parse_duration_minutes("2.5 minutes") == 3
+    assert parse_duration_minutes(2.5) == 3
+
+
+def test_durations():
+    assert parse_duration_minutes("15") == 15
+    assert parse_duration_minutes("10 minutes") == 10
+    assert parse_duration_minutes("2 ghante") == 120
+    assert parse_duration_minutes("soon") == 15
+    assert parse_duration_minutes("-5") == 15
+    assert parse_duration_minutes("nan") == 15
+
+
+def test_decimal_offsets():
+    assert parse_time_phrase("in 1.5 hours", MORNING) == "2026-03-10 09:30:00"
@@ -0,0 +1,246 @@
+"""
+Natural Language Time Parser for OM AI
+Turns English and Hinglish time phrases ("kal subah 7 baje", "in 15 minutes",
+"next monday") into normalized timestamps for the scheduler and reminder intents
+"""
+
+import calendar
+import math
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from .slot_extractor import HOUR_UNITS, MINUTE_UNITS, NUMBER_WORDS
+from .transliteration import canonicalize
+
+# Parses are cached per phrase and per reference-time bucket, so repeat
+# phrases within the same minute cost a dictionary lookup
+TIME_BUCKET_SECONDS = 60
+PARSE_CACHE_SIZE = 2048
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Phrases are canonicalized first (transliteration.canonicalize), so the
+# tables below list one spelling per word: "कल" and "शाम" arrive as "kal"
+# and "shaam". "parson" and "sham" are also names, so they are only read as
+# time words here, not canonicalized globally.
+
+# Day offsets from today ("kal" is read as tomorrow in a scheduling context)
+DAY_OFFSETS = {
+    'today': 0, 'aaj': 0, 'tonight': 0,
+    'tomorrow': 1, 'kal': 1,
+    'day after tomorrow': 2, 'parso': 2, 'parson': 2
+}
+
+WEEKDAYS = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6,
+    'somvar': 0, 'mangalvar': 1, 'budhvar': 2, 'guruvar': 3,
+    'shukravar': 4, 'shanivar': 5, 'ravivar': 6
+}
+
+# Day part -> (default hour, add 12 to a bare clock hour below 12)
+DAY_PARTS = {
+    'morning': (9, False), 'subah': (9, False),
+    'afternoon': (14, True), 'dopahar': (14, True),
+    'evening': (18, True), 'shaam': (18, True), 'sham': (18, True),
+    'night': (21, True), 'raat': (21, True), 'tonight': (21, True)
+}
+
+DAY_UNITS = ('days', 'day', 'din')
+
+# A bare clock hour below this ("at 5", "tomorrow at 5", "kal 5 baje") is
+# read as PM, with or without a day; "5 am" or "subah 5 baje" keep the morning
+BARE_PM_BEFORE = 8
+
+_NUMBER = r'(\d+(?:\.\d+)?|' + '|'.join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r')'
+_UNIT = r'(' + '|'.join(MINUTE_UNITS + HOUR_UNITS + DAY_UNITS) + r')'
+
+OFFSET_PATTERNS = [
+    re.compile(r'(?:in|after)\s+' + _NUMBER + r'\s*' + _UNIT),
+    re.compile(_NUMBER + r'\s*' + _UNIT + r'\s+(?:baad|bad|later|mein)')
+]
+
+CLOCK_PATTERN = re.compile(
+    r'(?<![\d:])(\d{1,2})(?::(\d{2}))?\s*(am|pm|baje|o\'?clock)?(?![\d:])')
+
+NEXT_PATTERN = re.compile(r'\b(?:next|agle|agla)\s+(week|hafte|month|mahine)\b')
+
+
+def _number_value(token: str) -> float:
+    return NUMBER_WORDS[token] if token in NUMBER_WORDS else float(token)
+
+
+def _offset_delta(phrase: str) -> Optional[timedelta]:
+    """Offset such as "in 15 minutes" or "2 ghante baad" """
+    for pattern in OFFSET_PATTERNS:
+        match = pattern.search(phrase)
+        if match:
+            value = _number_value(match.group(1))
+            unit = match.group(2)
+            if unit in MINUTE_UNITS:
+                return timedelta(minutes=value)
+            if unit in HOUR_UNITS:
+                return timedelta(hours=value)
+            return timedelta(days=value)
+    return None
+
+
+def _add_month(moment: datetime) -> datetime:
+    year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+    day = min(moment.day, calendar.monthrange(year, month)[1])
+    return moment.replace(year=year, month=month, day=day)
+
+
+def _parse(phrase: str, reference: datetime) -> Optional[datetime]:
+    """Parse a normalized phrase against a reference time"""
+    delta = _offset_delta(phrase)
+    if delta is not None:
+        return reference + delta
+
+    words = phrase.split()
+    day = None
+    day_part = None
+
+    for name, offset in DAY_OFFSETS.items():
+        if (' ' in name and name in phrase) or name in words:
+            day = reference + timedelta(days=offset)
+
+    next_match = NEXT_PATTERN.search(phrase)
+    if next_match:
+        unit = next_match.group(1)
+        day = reference + timedelta(days=7) if unit in ('week', 'hafte') else _add_month(reference)
+
+    for name, weekday in WEEKDAYS.items():
+        if name in words:
+            days_ahead = (weekday - reference.weekday()) % 7
+            if days_ahead == 0:
+                days_ahead = 7
+            day = reference + timedelta(days=days_ahead)
+            break
+
+    for name in DAY_PARTS:
+        if name in words:
+            day_part = name
+            break
+
+    clock = None
+    for match in CLOCK_PATTERN.finditer(phrase):
+        suffix = match.group(3)
+        # A bare number is only a clock time next to "at" or a day part
+        if suffix or 'at' in words or day_part:
+            clock = match
+            break
+
+    if day is None and clock is None and day_part is None:
+        return None
+
+    target_day = day or reference
+    if clock:
+        hour = int(clock.group(1))
+        minute = int(clock.group(2) or 0)
+        suffix = clock.group(3)
+        if hour > 23 or minute > 59:
+            return None
+        if suffix == 'pm' and hour < 12:
+            hour += 12
+        elif suffix == 'am' and hour == 12:
+            hour = 0
+        elif suffix != 'am' and day_part and DAY_PARTS[day_part][1] and hour < 12:
+            hour += 12
+        elif suffix not in ('am', 'pm') and not day_part and 0 < hour < BARE_PM_BEFORE:
+            hour += 12
+        result = target_day.replace(hour=hour % 24, minute=minute, second=0, microsecond=0)
+    elif day_part:
+        result = target_day.replace(hour=DAY_PARTS[day_part][0], minute=0, second=0, microsecond=0)
+    elif day is not None and day.date() != reference.date():
+        result = day.replace(hour=9, minute=0, second=0, microsecond=0)
+    else:
+        result = target_day.replace(second=0, microsecond=0)
+
+    # A time of day with no explicit day that has already passed means tomorrow
+    if day is None and result <= reference:
+        result += timedelta(days=1)
+
+    return result
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(phrase: str, bucket: int) -> Optional[str]:
+    reference = datetime.fromtimestamp(bucket * TIME_BUCKET_SECONDS)
+    result = _parse(phrase, reference)
+    return result.strftime(TIMESTAMP_FORMAT) if result else None
+
+
+def parse_time_phrase(phrase: str, reference: datetime = None) -> Optional[str]:
+    """
+    Parse a natural language time phrase into a normalized timestamp
+
+    Results are memoized per phrase and per reference-time bucket
+    (TIME_BUCKET_SECONDS), so offsets such as "in 15 minutes" are measured
+    from the start of the current bucket.
+
+    Args:
+        phrase (str): Time phrase, e.g. "kal subah 7 baje" or "next monday"
+        reference (datetime): Time the phrase is relative to (default: now)
+
+    Returns:
+        Optional[str]: "YYYY-MM-DD HH:MM:SS" timestamp, or None if not understood
+    """
+    if not phrase or not isinstance(phrase, str):
+        return None
+    reference = reference or datetime.now()
+    bucket = int(reference.timestamp()) // TIME_BUCKET_SECONDS
+    return _parse_cached(canonicalize(" ".join(phrase.lower().split())), bucket)
+
+
+def normalize_time(value, reference: datetime = None):
+    """
+    Normalize a time phrase for plugins, leaving anything unparseable as-is
+
+    Args:
+        value: Time phrase or already-normalized timestamp
+        reference (datetime): Time the phrase is relative to (default: now)
+
+    Returns:
+        Normalized timestamp string, or the original value
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        datetime.strptime(value, TIMESTAMP_FORMAT)
+        return value
+    except ValueError:
+        pass
+    return parse_time_phrase(value, reference) or value
+
+
+def parse_duration_minutes(value, default: int = 15) -> int:
+    """
+    Convert a duration ("15", "1.5", "10 minutes", "2 ghante") into minutes
+
+    Args:
+        value: Minutes as a number or a spoken duration
+        default (int): Minutes to use when the value is not understood
+
+    Returns:
+        int: Duration in minutes, rounded to the nearest minute
+    """
+    if isinstance(value, str):
+        text = value.strip().lower()
+        try:
+            value = float(text)
+        except ValueError:
+            delta = _offset_delta("in " + text)
+            if delta is None:
+                return default
+            value = delta.total_seconds() / 60
+    if isinstance(value, (int, float)) and math.isfinite(value) and value >= 0:
+        return math.floor(value + 0.5)
+    return default
+
+
+def get_cache_info():
+    """Hit/miss statistics of the phrase cache"""
+    return _parse_cached.cache_info()
@@ -0,0 +1,106 @@
+"""
+Transliteration Normalization for OM AI
+Maps Devanagari and common Romanized spellings of a word to one canonical
+Romanized form before keyword matching, so keyword tables need one entry
+per concept instead of one per script and spelling
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+# Canonical form -> other spellings (Devanagari and Romanized variants).
+# Only whole words are mapped; words that happen to look like a variant
+# ("me", "he", "bad", "rat", the names "Parson" and "Sham") are
+# deliberately left out. Devanagari "नेटवर्क" is not mapped either: it is a
+# check_internet keyword of its own, while Romanized "network" is not.
+CANONICAL_FORMS: Dict[str, List[str]] = {
+    # Network and system
+    "internet": ["इंटरनेट", "intrnet", "internett"],
+    "network": ["netwrk"],
+    "connection": ["कनेक्शन", "conection", "connecshun"],
+    "check": ["चेक", "chek", "chk"],
+    "status": ["स्टेटस"],
+    "speed": ["स्पीड"],
+    "test": ["टेस्ट"],
+    "google": ["गूगल"],
+    "search": ["सर्च"],
+    # Common Hindi words
+    "kya": ["क्या", "kyaa", "kia"],
+    "hai": ["है", "hei"],
+    "kaise": ["कैसे", "kese", "kaisay"],
+    "batao": ["बताओ", "bataao", "btao"],
+    "dekho": ["देखो", "dekhoo"],
+    "karo": ["करो", "kro"],
+    "yaad": ["याद", "yad"],
+    "khatam": ["खत्म", "ख़त्म", "khatm"],
+    "namaste": ["नमस्ते", "namastey", "namastay"],
+    "dhanyawad": ["धन्यवाद", "dhanyavad", "dhanyavaad"],
+    "om": ["ॐ"],
+    # Time and weather
+    "samay": ["समय"],
+    "mausam": ["मौसम", "mosam", "mausum"],
+    "tarikh": ["तारीख", "तारीख़", "tareekh", "tarik"],
+    "aaj": ["आज"],
+    "kal": ["कल"],
+    "parso": ["परसों", "parsoon"],
+    "subah": ["सुबह", "subha"],
+    "dopahar": ["दोपहर", "dopehar"],
+    "shaam": ["शाम"],
+    "raat": ["रात"],
+    "din": ["दिन"],
+    "baje": ["बजे", "bje"],
+    "baad": ["बाद"],
+    "mein": ["में"],
+}
+
+# URL-like tokens ("www.google.com") are matched whole and left alone;
+# otherwise words, including Devanagari vowel signs (which are not \w)
+WORD_PATTERN = re.compile(r'(?:[a-z]+://)?(?:[\w-]+\.)+[a-z]{2,}(?:/\S*)?|[\w\u0900-\u097F]+')
+
+# Letters stretched for emphasis ("hiii", "hellooo"); doubles are real spellings
+ELONGATION_PATTERN = re.compile(r'([a-z])\1{2,}')
+
+CANONICAL_CACHE_SIZE = 4096
+
+_VARIANTS = {variant: canonical for canonical, variants in CANONICAL_FORMS.items()
+             for variant in variants}
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonical_word(word: str) -> str:
+    """Canonical spelling of one lowercased word; URL-like tokens are kept as is"""
+    if "." in word:
+        return word
+    canonical = _VARIANTS.get(word)
+    if canonical:
+        return canonical
+    collapsed = ELONGATION_PATTERN.sub(r'\1', word)
+    return _VARIANTS.get(collapsed, collapsed)
+
+
+def _replace(match) -> str:
+    return canonical_word(match.group())
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonicalize(text: str) -> str:
+    """
+    Rewrite every word of a lowercased text to its canonical spelling
+
+    Spacing and punctuation are kept, so multi-word keyword phrases still
+    match as substrings.
+
+    Args:
+        text (str): Lowercased text
+
+    Returns:
+        str: Text with canonical spellings
+    """
+    return WORD_PATTERN.sub(_replace, text)
+
+
+def get_cache_info() -> Dict:
+    """Hit/miss counters of the word and text caches"""
+    return {"words": canonical_word.cache_info()._asdict(),
+            "texts": canonicalize.cache_info()._asdict()}
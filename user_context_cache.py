@@ -0,0 +1,145 @@
+"""
+User Context Cache for OM AI
+Keeps each active user's memory-system reads (context, pending reminders,
+memory stats) in process, so repeat lookups skip plugin storage
+
+Users are evicted least recently used first once either the user count or
+the approximate byte size is over its bound. Writes through handle_command
+(remember_this, schedule_from_conversation) invalidate the user's entry.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+MAX_CACHED_USERS = 1000
+MAX_CACHE_BYTES = 16 * 1024 * 1024
+
+# Bookkeeping per cached value on top of its serialized size
+ENTRY_OVERHEAD_BYTES = 200
+
+# Seconds a value stays valid without a write; pending reminders become
+# due as time passes, so they cannot wait for an invalidation
+CONTEXT_TTLS = {"reminders": 60.0}
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory of a cached value: its UTF-8 JSON size plus overhead"""
+    try:
+        serialized = json.dumps(value, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        serialized = repr(value)
+    return len(serialized.encode("utf-8")) + ENTRY_OVERHEAD_BYTES
+
+
+class UserContextCache:
+    """LRU of per-user context values, bounded by users and bytes"""
+
+    def __init__(self, max_users: int = MAX_CACHED_USERS, max_bytes: int = MAX_CACHE_BYTES,
+                 ttls: Dict[str, float] = None):
+        """
+        Args:
+            max_users (int): Users kept before the least recently used is evicted
+            max_bytes (int): Approximate total size kept
+            ttls (Dict[str, float]): Seconds each kind of value stays valid
+                (default: CONTEXT_TTLS; kinds not listed never expire)
+        """
+        self.max_users = max_users
+        self.max_bytes = max_bytes
+        self.ttls = CONTEXT_TTLS if ttls is None else ttls
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes = 0
+        # user_id -> {kind: (value, size, stored_at)}
+        self._users = OrderedDict()
+        # Bumped by every invalidation; a load that overlapped one is not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, kind: str, loader: Callable[[], Any]) -> Any:
+        """
+        Cached value of one kind for a user, loading it on a miss
+
+        Args:
+            user_id (str): User the value belongs to
+            kind (str): Value kind, e.g. "context" or "reminders"
+            loader (Callable): Reads the value from storage; exceptions
+                propagate and nothing is cached
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        now = time.monotonic()
+        with self._lock:
+            values = self._users.get(user_id)
+            cached = values.get(kind) if values else None
+            if cached is not None:
+                value, size, stored_at = cached
+                ttl = self.ttls.get(kind)
+                if ttl is None or now - stored_at < ttl:
+                    self._users.move_to_end(user_id)
+                    self.hits += 1
+                    return value
+                del values[kind]
+                self.bytes -= size
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+        size = estimate_size(value)
+        with self._lock:
+            if generation == self._generation and size <= self.max_bytes:
+                self._store(user_id, kind, value, size, now)
+        return value
+
+    def _store(self, user_id: str, kind: str, value: Any, size: int, stored_at: float):
+        values = self._users.setdefault(user_id, {})
+        previous = values.get(kind)
+        if previous is not None:
+            self.bytes -= previous[1]
+        values[kind] = (value, size, stored_at)
+        self.bytes += size
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users or self.bytes > self.max_bytes:
+            _, evicted = self._users.popitem(last=False)
+            self.bytes -= sum(size for _, size, _ in evicted.values())
+            self.evictions += 1
+
+    def invalidate(self, user_id: str):
+        """Drop everything cached for a user after a write"""
+        with self._lock:
+            values = self._users.pop(user_id, None)
+            if values:
+                self.bytes -= sum(size for _, size, _ in values.values())
+            self._generation += 1
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+            self.bytes = 0
+            self._generation += 1
+
+    def get_stats(self) -> Dict:
+        """Hit rate, evictions and approximate memory use"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "users": len(self._users),
+                "max_users": self.max_users,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+# Create global instance
+user_context_cache = UserContextCache()
@@ -0,0 +1,86 @@
+"""
+Utterance for OM AI
+One user turn, built once and passed to language detection, routing and
+prompt selection, so each normalization step runs once per request
+"""
+
+import re
+from functools import cached_property
+from typing import Dict, FrozenSet, List
+
+from .slot_extractor import TOKEN_PATTERN
+from .transliteration import canonicalize
+
+DEVANAGARI_PATTERN = re.compile(r'[\u0900-\u097F]')
+LATIN_PATTERN = re.compile(r'[a-zA-Z]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+TRAILING_PUNCTUATION_PATTERN = re.compile(r'[.!?]+$')
+
+
+class Utterance(str):
+    """
+    Immutable user utterance with lazily cached derived forms
+
+    It is a ``str`` holding the raw text, so code that expects a plain
+    string keeps working; components that know about Utterance read the
+    cached forms instead of recomputing them.
+    """
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Utterance is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Utterance is immutable")
+
+    @property
+    def text(self) -> str:
+        """The raw text as a plain str"""
+        return str(self)
+
+    @cached_property
+    def lowered(self) -> str:
+        """Lowercased and stripped, as process_command matches on"""
+        return self.lower().strip()
+
+    @cached_property
+    def normalized(self) -> str:
+        """Lowercased, single-spaced, without trailing punctuation"""
+        text = WHITESPACE_PATTERN.sub(' ', self.lowered)
+        return TRAILING_PUNCTUATION_PATTERN.sub('', text)
+
+    @cached_property
+    def canonical(self) -> str:
+        """``lowered`` with Devanagari and variant spellings in canonical Romanized form"""
+        return canonicalize(self.lowered)
+
+    @cached_property
+    def tokens(self) -> List[tuple]:
+        """(token, start, end) over ``lowered``, as SlotExtractor uses them"""
+        return [(m.group(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(self.lowered)]
+
+    @cached_property
+    def token_set(self) -> FrozenSet[str]:
+        return frozenset(token for token, _, _ in self.tokens)
+
+    @cached_property
+    def script_counts(self) -> Dict[str, int]:
+        """Number of Devanagari and Latin letters"""
+        return {
+            "devanagari": len(DEVANAGARI_PATTERN.findall(self)),
+            "latin": len(LATIN_PATTERN.findall(self))
+        }
+
+    @cached_property
+    def language(self) -> str:
+        """'hindi', 'english' or 'hinglish', from the shared LanguageHandler"""
+        from .language_handler import language_handler
+        return language_handler.detect_language(self)
+
+    def __reduce__(self):
+        # Pickle as the raw text; cached forms are rebuilt on demand
+        return (Utterance, (str(self),))
+
+
+def as_utterance(text) -> Utterance:
+    """Return ``text`` as an Utterance, reusing it if it already is one"""
+    return text if isinstance(text, Utterance) else Utterance(text or "")
@@ -0,0 +1,136 @@
+"""
+Routing Warm-up for OM AI
+Builds every compiled routing structure once, before worker processes fork,
+and freezes it out of the garbage collector so the pages stay shared
+copy-on-write instead of being duplicated in each worker
+"""
+
+import gc
+import os
+import time
+from typing import Dict, List, Optional
+
+# Utterances routed during warm-up so lazily built state (the re module
+# cache, slot and time-phrase tables) exists before forking
+WARMUP_QUERIES = [
+    "hello", "what time is it", "aaj ki tarikh", "weather in Delhi",
+    "google search python", "check internet status", "add task buy milk",
+    "snooze task 2 for 10 minutes", "light off, fan on aur weather batao",
+    "kya hai machine learning", "open whatsapp app", "remember this",
+    "search images of cats", "ping google.com", "इंटरनेट चेक करो",
+    "schedule this \"call mom\" kal subah 7 baje", "add expense ₹250 for lunch"
+]
+
+WARMUP_TIME_PHRASES = ["kal subah 7 baje", "in 15 minutes", "next monday at 5 pm", "tonight"]
+
+_warm = False
+
+
+def is_warm() -> bool:
+    """True once warmup() has run in this process or in the parent it forked from"""
+    return _warm
+
+
+def warmup(freeze: bool = True) -> Dict:
+    """
+    Build and exercise every routing structure once
+
+    Call this in the parent process before forking workers. With
+    ``freeze=True`` everything allocated so far is moved to the permanent
+    GC generation (gc.freeze), so collections in the workers never write
+    to those objects and their pages stay shared.
+
+    Args:
+        freeze (bool): Freeze the GC generation after warming
+
+    Returns:
+        Dict: Warm-up time, frozen object count and current memory usage
+    """
+    global _warm
+
+    start = time.perf_counter()
+    if not _warm:
+        from .command_handler import handle_command  # noqa: F401 (imports plugins)
+        from .intent_router import intent_router
+        from .language_handler import language_handler
+        from .nlp_processor import process_command, process_compound_command
+        from .nlp_processor_fixed import nlp_processor
+        from .om_prompts import om_prompts
+        from .routing_profile import get_routing_profile
+        from .time_parser import parse_time_phrase
+        from .utterance import Utterance
+
+        # Warm-up queries are not traffic; keep them out of the routing profile
+        with get_routing_profile().paused():
+            for text in WARMUP_QUERIES:
+                query = Utterance(text)
+                process_compound_command(query)
+                process_command(query)
+                intent_router.route(query)
+                nlp_processor.process_text(query)
+                nlp_processor.suggest_alternatives(query)
+                language_handler.detect_language(query)
+                om_prompts.get_context_aware_prompt(query)
+        for phrase in WARMUP_TIME_PHRASES:
+            parse_time_phrase(phrase)
+        _warm = True
+
+    frozen = 0
+    if freeze and hasattr(gc, "freeze"):
+        gc.collect()
+        gc.freeze()
+        frozen = gc.get_freeze_count()
+
+    return {
+        "seconds": round(time.perf_counter() - start, 4),
+        "frozen_objects": frozen,
+        "memory": get_memory_usage()
+    }
+
+
+def get_memory_usage(pid: int = None) -> Optional[Dict[str, int]]:
+    """
+    Resident memory of a process split into shared and private pages
+
+    Args:
+        pid (int): Process id (default: this process)
+
+    Returns:
+        Optional[Dict]: rss/pss/shared/private sizes in kB, or None when
+        /proc/<pid>/smaps_rollup is unavailable (non-Linux)
+    """
+    path = f"/proc/{pid or os.getpid()}/smaps_rollup"
+    fields = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        return None
+
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "shared_kb": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    }
+
+
+def report_shared_memory(pids: List[int]) -> Dict:
+    """
+    Resident memory each worker shares with its parent instead of duplicating
+
+    Args:
+        pids (List[int]): Worker process ids
+
+    Returns:
+        Dict: Per-worker usage and the average kB saved per worker
+    """
+    workers = {pid: get_memory_usage(pid) for pid in pids}
+    shared = [usage["shared_kb"] for usage in workers.values() if usage]
+    return {
+        "workers": workers,
+        "saved_kb_per_worker": round(sum(shared) / len(shared)) if shared else None
+    }
@@ -0,0 +1,303 @@
+"""
+Worker Server for OM AI
+Runs the NLP + dispatch pipeline in a pre-forked pool of worker processes,
+served over a Unix socket or stdin/stdout with one JSON object per line
+
+Request:  {"id": 1, "user_id": "u42", "text": "light off aur weather batao"}
+Response: {"id": 1, "user_id": "u42", "intent": "...", "params": {...}, "language": "...",
+           "response": "...", "worker": 3}
+
+A compound utterance runs every command it contains (handle_commands);
+"intent" and "params" are then the first command's, "commands" lists
+each command's intent, params and response, and "response" joins the
+responses. Responses to one user come back in request order.
+
+Run this module with ``python -m`` from the parent package, e.g.
+``--socket /tmp/om.sock --workers 4`` or ``--stdio``. In stdio mode the
+plugin import messages printed by the package itself may precede the first
+response; clients should skip lines that are not JSON objects.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socketserver
+import sys
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .utterance import Utterance
+from .warmup import report_shared_memory, warmup
+
+
+def _load_pipeline():
+    """Import the routing and dispatch modules (chatty on first import)"""
+    from .command_handler import handle_commands
+    from .intent_router import route_command
+    from .nlp_processor import process_compound_command
+    return partial(process_compound_command, route=route_command), handle_commands
+
+
+def _handle_request(request, pipeline):
+    route_commands, handle_commands = pipeline
+    # Normalized once; routing and language detection share its cached forms
+    utterance = Utterance(request.get("text", ""))
+    user_id = request.get("user_id")
+
+    commands = route_commands(utterance)
+    for _, params in commands:
+        if user_id is not None:
+            # Anonymous requests get no buffered turns rather than a shared session
+            params.setdefault("user_id", user_id)
+        # handle_command records the turn under the user's own words
+        params.setdefault("utterance", utterance.text)
+        params.update(request.get("params", {}))
+    intent, params = commands[0]
+    response = {"intent": intent, "params": params, "language": utterance.language}
+    if len(commands) > 1:
+        response["commands"] = [{"intent": intent, "params": params} for intent, params in commands]
+    if not request.get("route_only"):
+        results = handle_commands(commands)
+        response["response"] = "\n\n".join(str(result) for result in results)
+        if len(commands) > 1:
+            for command, result in zip(response["commands"], results):
+                command["response"] = result
+    return response
+
+
+def _worker_main(index, conn):
+    """Worker loop: warm up, report ready, then serve requests from the parent"""
+    try:
+        # No-op when forked from a parent that already ran warmup()
+        warmup(freeze=False)
+        pipeline = _load_pipeline()
+        conn.send({"ready": True, "pid": os.getpid()})
+    except Exception as e:
+        conn.send({"ready": False, "error": str(e)})
+        return
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if request is None:
+            break
+        try:
+            response = _handle_request(request, pipeline)
+        except Exception as e:
+            response = {"error": f"❌ Error processing request: {e}"}
+        response["worker"] = index
+        conn.send(response)
+
+
+class WorkerPool:
+    """Pre-forked worker processes with sticky routing per user_id"""
+
+    def __init__(self, num_workers=None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self._context = multiprocessing.get_context(
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+        self._workers = [None] * self.num_workers
+        self.pids = [None] * self.num_workers
+        self._locks = [threading.Lock() for _ in range(self.num_workers)]
+
+    def start(self):
+        """Fork every worker and wait until each has warmed up"""
+        for index in range(self.num_workers):
+            self._spawn(index)
+        for index in range(self.num_workers):
+            self._wait_ready(index)
+        print(f"✅ {self.num_workers} workers ready", file=sys.stderr)
+
+    def _spawn(self, index):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(index, child_conn), daemon=True,
+            name=f"om-worker-{index}")
+        process.start()
+        child_conn.close()
+        self._workers[index] = (process, parent_conn)
+
+    def _wait_ready(self, index):
+        status = self._workers[index][1].recv()
+        if not status.get("ready"):
+            raise RuntimeError(f"Worker {index} failed to start: {status.get('error')}")
+        self.pids[index] = status["pid"]
+
+    def memory_report(self):
+        """Resident memory each worker shares with the parent (Linux only)"""
+        return report_shared_memory([pid for pid in self.pids if pid])
+
+    def worker_for(self, user_id):
+        """Sticky worker index for a user"""
+        return zlib.crc32(str(user_id).encode("utf-8")) % self.num_workers
+
+    def submit(self, request):
+        """
+        Send one request to the user's worker and wait for its response
+
+        Args:
+            request (dict): {"user_id", "text", optional "params", "route_only", "id"}
+
+        Returns:
+            dict: Worker response with "id" and "user_id" echoed
+        """
+        index = self.worker_for(request.get("user_id", "default_user"))
+        with self._locks[index]:
+            process, conn = self._workers[index]
+            try:
+                conn.send(request)
+                response = conn.recv()
+            except (EOFError, OSError, BrokenPipeError) as e:
+                print(f"⚠️ Worker {index} died ({e}), restarting", file=sys.stderr)
+                self._spawn(index)
+                self._wait_ready(index)
+                response = {"error": "❌ Worker restarted, please retry", "worker": index}
+
+        if "id" in request:
+            response["id"] = request["id"]
+        response.setdefault("user_id", request.get("user_id", "default_user"))
+        return response
+
+    def stop(self):
+        """Ask every worker to exit and reap it"""
+        for index, worker in enumerate(self._workers):
+            if worker is None:
+                continue
+            process, conn = worker
+            with self._locks[index]:
+                try:
+                    conn.send(None)
+                except (OSError, BrokenPipeError):
+                    pass
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+
+def _decode_request(line):
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        return request, None
+    except ValueError as e:
+        return None, {"error": f"❌ Invalid request: {e}"}
+
+
+def serve_unix_socket(pool, socket_path):
+    """Serve newline-delimited JSON requests on a Unix socket"""
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                request, error = _decode_request(line)
+                response = error or pool.submit(request)
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    with Server(socket_path, RequestHandler) as server:
+        print(f"🔌 Listening on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
+
+
+def serve_stdio(pool, output):
+    """
+    Serve newline-delimited JSON requests from stdin, responses to ``output``
+
+    Different users are served in parallel, so their responses interleave
+    (each carries the request's "id"); one user's requests run one at a
+    time, in the order they were read.
+    """
+    write_lock = threading.Lock()
+    # user_id -> requests waiting behind the one being served
+    waiting = {}
+    waiting_lock = threading.Lock()
+
+    def respond(response):
+        with write_lock:
+            output.write(json.dumps(response, ensure_ascii=False) + "\n")
+            output.flush()
+
+    def serve_user(user_id):
+        while True:
+            with waiting_lock:
+                requests = waiting[user_id]
+                if not requests:
+                    del waiting[user_id]
+                    return
+                request = requests.popleft()
+            respond(pool.submit(request))
+
+    with ThreadPoolExecutor(max_workers=pool.num_workers) as executor:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            request, error = _decode_request(line)
+            if error:
+                respond(error)
+                continue
+            user_id = request.get("user_id", "default_user")
+            with waiting_lock:
+                if user_id in waiting:
+                    waiting[user_id].append(request)
+                    continue
+                waiting[user_id] = deque([request])
+            executor.submit(serve_user, user_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OM AI multi-process worker server")
+    transport = parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument("--socket", help="Unix socket path to listen on")
+    transport.add_argument("--stdio", action="store_true",
+                           help="Read requests from stdin, write responses to stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Number of worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    # Plugin import messages must not mix with the stdout protocol
+    protocol_output = sys.stdout
+    if args.stdio:
+        sys.stdout = sys.stderr
+
+    # Build routing tables once here so forked workers share them copy-on-write
+    report = warmup(freeze=True)
+    print(f"🔥 Routing warmed in {report['seconds']}s, "
+          f"{report['frozen_objects']} objects frozen", file=sys.stderr)
+
+    pool = WorkerPool(args.workers)
+    pool.start()
+    memory = pool.memory_report()
+    if memory["saved_kb_per_worker"] is not None:
+        print(f"📊 ~{memory['saved_kb_per_worker']} kB resident memory shared per worker",
+              file=sys.stderr)
+    try:
+        if args.stdio:
+            serve_stdio(pool, protocol_output)
+        else:
+            serve_unix_socket(pool, args.socket)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()